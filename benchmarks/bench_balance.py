@@ -0,0 +1,69 @@
+"""
+Benchmark de saldos históricos: balance_at (índice de saldos) x soma de
+get_transactions(end_date=data), e saldos mensais com balance_series.
+
+Uso:
+    python -m benchmarks.bench_balance [número de transações] [consultas]
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+
+from finances.ledger import ColumnarLedger
+from finances.models import Account
+
+from .common import measure
+
+CATEGORIES = ["Food", "Transport", "Salary", "Health", "Leisure", "Bills"]
+
+
+def build_account(size: int) -> Account:
+    rng = random.Random(3)
+    start = datetime(2015, 1, 1)
+    account = Account("Benchmark", ColumnarLedger())
+    account.add_transactions(
+        (-(i % 500) / 10, CATEGORIES[i % len(CATEGORIES)], "", start + timedelta(minutes=10 * i + rng.randrange(10)))
+        for i in range(size)
+    )
+    return account
+
+
+def main(size: int, queries: int) -> None:
+    account = build_account(size)
+    first, last = account.transactions[0].date, account.transactions[len(account.transactions) - 1].date
+    rng = random.Random(5)
+    dates = [first + (last - first) * rng.random() for _ in range(queries)]
+    print(f"Transações: {size}, consultas: {queries}")
+
+    build = measure(lambda: (setattr(account, "_balance_index", None), account.balance_at(first)), repeat=1)
+    indexed = measure(lambda: [account.balance_at(date) for date in dates])
+    resum_count = max(1, queries // 2000)
+    resum = measure(
+        lambda: [sum(t.amount for t in account.get_transactions(end_date=date)) for date in dates[:resum_count]],
+        repeat=1
+    ) * queries / resum_count
+    print(f"{'construção do índice (s)':<34}{build:>12.4f}")
+    print(f"{'balance_at (s)':<34}{indexed:>12.4f}  ({indexed / queries * 1e6:.2f} µs/consulta)")
+    print(f"{'soma de get_transactions (s, est.)':<34}{resum:>12.4f}  ({resum / indexed:.0f}x mais lento)")
+
+    months = (last.year - first.year) * 12 + last.month - first.month
+    series = measure(lambda: list(account.balance_series(first, last, step=1)))
+    print(f"{'balance_series mensal (s)':<34}{series:>12.4f}  ({months} meses)")
+
+    # Alterações no meio do histórico descartam as somas a partir do ponto alterado
+    transactions = [account.transactions[i] for i in rng.sample(range(size), 100)]
+
+    def update_and_query() -> None:
+        for transaction in transactions:
+            transaction.update(amount=transaction.amount + 1)
+            account.balance_at(last)
+
+    print(f"{'100 alterações + consultas (s)':<34}{measure(update_and_query, repeat=1):>12.4f}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    )
@@ -0,0 +1,58 @@
+"""
+Benchmark de geração de relatórios em lote: serial x pool de processos.
+
+Uso:
+    python -m benchmarks.bench_batch [número de clientes] [transações por cliente]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from finances.batch import generate_reports, render_client_report
+from finances.models import Client, Investment
+
+CATEGORIES = ["Food", "Transport", "Salary", "Health", "Leisure", "Bills"]
+
+
+def build_clients(count: int, size: int):
+    start = datetime(2020, 1, 1)
+    clients = []
+    for k in range(count):
+        client = Client(f"Cliente {k}")
+        client.add_account("Conta").add_transactions([
+            (-(i % 500) / 10, CATEGORIES[i % len(CATEGORIES)], f"Compra {i}", start + timedelta(hours=i))
+            for i in range(size)
+        ])
+        client.add_investment(Investment("Ações", 1000.0 + k, 0.01))
+        clients.append(client)
+    return clients
+
+
+def main(count: int, size: int) -> None:
+    clients = build_clients(count, size)
+    future_date = datetime.now() + timedelta(days=365)
+    print(f"Clientes: {count} ({size} transações cada), CPUs: {os.cpu_count()}")
+
+    start = time.perf_counter()
+    for client in clients:
+        render_client_report(client, future_date)
+    serial = time.perf_counter() - start
+    print(f"serial:        {serial:.3f} s")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        for _ in generate_reports(clients, future_date=future_date, workers=workers, chunk_size=32):
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>2} processos:  {elapsed:.3f} s ({serial / elapsed:.2f}x)")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    )
@@ -0,0 +1,54 @@
+"""
+Benchmark de vazão de inclusões concorrentes por número de threads.
+
+Compara threads que incluem transações em contas próprias (locks diferentes) com
+threads que disputam a mesma conta.
+
+Uso:
+    python -m benchmarks.bench_concurrency [transações por thread]
+"""
+
+import sys
+import threading
+import time
+
+from finances.models import Client
+
+
+def run(threads: int, size: int, shared: bool) -> float:
+    client = Client("Benchmark", concurrent=True)
+    accounts = [client.add_account(f"Conta {i}") for i in range(1 if shared else threads)]
+
+    def work(worker: int) -> None:
+        account = accounts[0 if shared else worker]
+        for i in range(size):
+            account.add_transaction(-(i % 500) / 10, "Food", "Compra")
+            if i % 1000 == 0:
+                client.get_net_worth()
+
+    workers = [threading.Thread(target=work, args=(worker,)) for worker in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    assert sum(len(account.transactions) for account in accounts) == threads * size
+    return threads * size / elapsed
+
+
+def main(size: int) -> None:
+    client = Client("Benchmark")
+    account = client.add_account("Conta")
+    start = time.perf_counter()
+    for i in range(size):
+        account.add_transaction(-(i % 500) / 10, "Food", "Compra")
+    print(f"sem locks (1 thread): {size / (time.perf_counter() - start):>12,.0f} transações/s")
+    for threads in (1, 2, 4, 8):
+        sharded = run(threads, size, shared=False)
+        contended = run(threads, size, shared=True)
+        print(f"{threads} threads: contas próprias {sharded:>12,.0f} transações/s | conta compartilhada {contended:>12,.0f} transações/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,78 @@
+"""
+Benchmark de avaliações repetidas de investimentos com aportes mensais: consulta ao
+cronograma de rendimento (busca binária) contra o recálculo de todos os fluxos.
+
+Uso:
+    python -m benchmarks.bench_daycount [número de investimentos] [datas consultadas]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from finances.daycount import ContributionSchedule
+from finances.models import Investment
+
+from .common import measure
+
+CONVENTIONS = ["30d", "30/360", "actual/365", "business/252"]
+
+
+def build_investments(size: int, day_count: str) -> List[Investment]:
+    rng = random.Random(11)
+    start = datetime(2015, 1, 1)
+    investments = []
+    for _ in range(size):
+        investment = Investment("Previdência", 1000.0, 0.005 + rng.random() / 100, day_count=day_count,
+                                contributions=[ContributionSchedule(200.0)])
+        investment.date_purchased = start + timedelta(days=rng.randrange(3650))
+        investments.append(investment)
+    return investments
+
+
+def recompute(investment: Investment, now: datetime) -> float:
+    convention = investment.day_count
+    base = 1 + investment.rate_of_return
+    value = investment.initial_amount * base ** convention.periods(investment.date_purchased, now)
+    for schedule in investment.contributions:
+        for moment in schedule.dates(investment.date_purchased, now):
+            value += schedule.amount * base ** convention.periods(moment, now)
+    return value
+
+
+def lookups(investments: List[Investment], dates: List[datetime]) -> None:
+    for investment in investments:
+        for now in dates:
+            investment._valuation = None
+            investment.calculate_value(now)
+
+
+def recomputations(investments: List[Investment], dates: List[datetime]) -> None:
+    for investment in investments:
+        for now in dates:
+            recompute(investment, now)
+
+
+def main(size: int, count: int) -> None:
+    rng = random.Random(5)
+    dates = [datetime(2025, 1, 1) + timedelta(hours=rng.randrange(24 * 365 * 5)) for _ in range(count)]
+    print(f"Investimentos: {size}, datas por investimento: {count} (aportes mensais desde a compra)")
+    print(f"{'convenção':<15}{'cronogramas (s)':>17}{'consultas (s)':>15}{'recálculo (s)':>15}{'ganho':>8}")
+    for day_count in CONVENTIONS:
+        investments = build_investments(size, day_count)
+        started = time.perf_counter()
+        for investment in investments:
+            investment.calculate_value(max(dates))
+        build = time.perf_counter() - started
+        lookup = measure(lambda: lookups(investments, dates))
+        baseline = measure(lambda: recomputations(investments, dates), repeat=1)
+        print(f"{day_count:<15}{build:>17.3f}{lookup:>15.3f}{baseline:>15.3f}{baseline / lookup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    )
@@ -0,0 +1,77 @@
+"""
+Benchmark dos fatores de crescimento: potência direta x tabela pré-calculada por taxa.
+
+Mede a alternativa de guardar, para cada taxa distinta, uma tabela com
+(1 + taxa) ** meses e consultá-la em vez de calcular a potência. A tabela não foi
+adotada no pacote. Isolada, a consulta a uma tabela já montada é de 1,2x a 2x
+mais rápida que a potência (que custa cerca de 100 ns no CPython), mas montar a
+tabela a cada avaliação anula o ganho. Mantê-la entre avaliações exige um cache
+compartilhado (limite de taxas, contadores, lock), cujo custo anulou o ganho nos
+caminhos completos (calculate_value ficou mais lento). O ganho também valeria
+apenas para a implementação em Python puro: com o NumPy, a potência vetorizada é
+mais rápida que qualquer consulta elemento a elemento. Por isso as avaliações
+continuam calculando a potência diretamente.
+
+Uso:
+    python -m benchmarks.bench_growth [número de investimentos]
+"""
+
+import random
+import sys
+
+from finances.valuation import np
+
+from .common import measure
+
+RATES = [round(0.002 * k, 3) for k in range(1, 21)]
+MAX_MONTHS = 240
+
+
+def build_columns(size: int):
+    """
+    Cria colunas sintéticas de taxas e meses decorridos.
+
+    Args:
+        size (int): Número de investimentos.
+
+    Returns:
+        Tuple[List[float], List[int]]: Taxa e meses de cada investimento.
+    """
+    rng = random.Random(7)
+    rates = [rng.choice(RATES) for _ in range(size)]
+    months = [rng.randrange(MAX_MONTHS) for _ in range(size)]
+    return rates, months
+
+
+def direct(rates, months):
+    return [(1 + rate) ** m for rate, m in zip(rates, months)]
+
+
+def build_tables(rates):
+    return {rate: [(1 + rate) ** m for m in range(MAX_MONTHS)] for rate in set(rates)}
+
+
+def lookup(tables, rates, months):
+    return [tables[rate][m] for rate, m in zip(rates, months)]
+
+
+def main(size: int) -> None:
+    rates, months = build_columns(size)
+    tables = build_tables(rates)
+    assert lookup(tables, rates, months) == direct(rates, months)
+    print(f"Investimentos: {size} ({len(RATES)} taxas distintas, até {MAX_MONTHS} meses)")
+    direct_time = measure(lambda: direct(rates, months))
+    table_time = measure(lambda: lookup(build_tables(rates), rates, months))
+    ready_time = measure(lambda: lookup(tables, rates, months))
+    print(f"potência direta:              {direct_time:.3f} s")
+    print(f"tabela (com montagem):        {table_time:.3f} s ({direct_time / table_time:.2f}x)")
+    print(f"tabela (já montada):          {ready_time:.3f} s ({direct_time / ready_time:.2f}x)")
+    if np is not None:
+        rate_column = np.array(rates, dtype=np.float64)
+        month_column = np.array(months, dtype=np.float64)
+        vector_time = measure(lambda: np.power(1 + rate_column, month_column))
+        print(f"potência vetorizada (NumPy):  {vector_time:.3f} s ({direct_time / vector_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,72 @@
+"""
+Benchmark do importador de CSV com um arquivo sintético de milhões de linhas.
+
+Uso:
+    python -m benchmarks.bench_import [número de linhas]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from finances.importers import CategoryRules, import_csv, read_csv
+from finances.ledger import ColumnarLedger
+from finances.models import Account
+
+DESCRIPTIONS = ["Supermercado", "Uber", "Farmácia", "Restaurante", "Salário", "Conta de luz"]
+
+
+def write_fixture(path: str, size: int) -> None:
+    """
+    Gera um arquivo CSV sintético.
+
+    Args:
+        path (str): Caminho do arquivo.
+        size (int): Número de linhas.
+    """
+    start = datetime(2015, 1, 1)
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write("date,amount,description,category\n")
+        for i in range(size):
+            date = (start + timedelta(minutes=17 * i)).strftime("%Y-%m-%d")
+            file.write(f"{date},{-(i % 5000) / 100:.2f},{DESCRIPTIONS[i % len(DESCRIPTIONS)]} {i % 997},\n")
+
+
+def main(size: int) -> None:
+    rules = CategoryRules({"supermercado|restaurante": "Food", "uber": "Transport", "salário": "Salary"})
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "extrato.csv")
+        write_fixture(path, size)
+        print(f"Linhas: {size} ({os.path.getsize(path) / 2 ** 20:.1f} MB)")
+
+        start = time.perf_counter()
+        with open(path, encoding="utf-8", newline="") as file:
+            for _ in read_csv(file):
+                pass
+        parse_time = time.perf_counter() - start
+
+        tracemalloc.start()
+        with open(path, encoding="utf-8", newline="") as file:
+            for _ in read_csv(file):
+                pass
+        _, parse_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"leitura:    {size / parse_time:>12,.0f} linhas/s  pico {parse_peak / 2 ** 20:.1f} MB")
+
+        account = Account("Benchmark", ColumnarLedger())
+        start = time.perf_counter()
+        result = import_csv(account, path, rules=rules, dedupe=False)
+        import_time = time.perf_counter() - start
+        print(f"importação: {result.imported / import_time:>12,.0f} linhas/s (sem deduplicação)")
+
+        start = time.perf_counter()
+        result = import_csv(account, path, rules=rules)
+        dedupe_time = time.perf_counter() - start
+        print(f"reimportação: {result.rows / dedupe_time:>10,.0f} linhas/s ({result.duplicates} duplicadas)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
@@ -0,0 +1,64 @@
+"""
+Benchmark de inclusão de transações: add_transaction (linha a linha) x add_transactions (em lote).
+
+Em lote, as linhas são validadas coluna a coluna e gravadas diretamente no ledger:
+o ledger colunar não cria nenhum objeto Transaction, e o ledger de lista cria apenas
+os objetos que guarda.
+
+Uso:
+    python -m benchmarks.bench_ingest [número de linhas]
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+from finances.ledger import ColumnarLedger, ListLedger
+from finances.models import Account
+
+from .common import measure
+
+CATEGORIES = ["Food", "Transport", "Salary", "Health", "Leisure", "Bills"]
+
+
+def build_rows(size: int):
+    """
+    Gera linhas sintéticas (valor, categoria, descrição, data) em ordem cronológica.
+
+    Args:
+        size (int): Número de linhas.
+
+    Returns:
+        List[tuple]: As linhas geradas.
+    """
+    start = datetime(2020, 1, 1)
+    return [
+        (-(i % 500) / 10, CATEGORIES[i % len(CATEGORIES)], f"Compra {i % 1000}", start + timedelta(minutes=i))
+        for i in range(size)
+    ]
+
+
+def per_row(rows, ledger) -> Account:
+    account = Account("Benchmark", ledger)
+    for amount, category, description, date in rows:
+        account.add_transaction(amount, category, description, date)
+    return account
+
+
+def bulk(rows, ledger) -> Account:
+    account = Account("Benchmark", ledger)
+    account.add_transactions(rows)
+    return account
+
+
+def main(size: int) -> None:
+    rows = build_rows(size)
+    print(f"Linhas: {size}")
+    print(f"{'ledger':<10}{'linha a linha (linhas/s)':>26}{'em lote (linhas/s)':>22}{'ganho':>9}")
+    for name, factory in (("list", ListLedger), ("columnar", ColumnarLedger)):
+        per_row_time = measure(lambda: per_row(rows, factory()), repeat=5)
+        bulk_time = measure(lambda: bulk(rows, factory()), repeat=5)
+        print(f"{name:<10}{size / per_row_time:>26,.0f}{size / bulk_time:>22,.0f}{per_row_time / bulk_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
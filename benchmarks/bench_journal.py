@@ -0,0 +1,44 @@
+"""
+Benchmark de vazão do journal: fsync por alteração x group commit.
+
+Uso:
+    python -m benchmarks.bench_journal [número de alterações]
+"""
+
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from finances.journal import Journal
+from finances.models import Client
+
+CATEGORIES = ["Food", "Transport", "Salary", "Health", "Leisure", "Bills"]
+
+
+def mutate(client: Client, size: int) -> None:
+    account = client.accounts[0]
+    start = datetime(2020, 1, 1)
+    for i in range(size):
+        account.add_transaction(-(i % 500) / 10, CATEGORIES[i % len(CATEGORIES)], f"Compra {i}", start + timedelta(minutes=i))
+
+
+def run(size: int, **options) -> float:
+    client = Client("Benchmark")
+    client.add_account("Conta")
+    with tempfile.TemporaryDirectory() as directory:
+        journal = Journal(directory, client, compact_every=None, **options)
+        start = time.perf_counter()
+        mutate(client, size)
+        journal.close()
+        return size / (time.perf_counter() - start)
+
+
+def main(size: int) -> None:
+    print(f"Alterações: {size}")
+    print(f"fsync por alteração: {run(size, max_batch=1, sync=True):>12,.0f} alterações/s")
+    print(f"group commit:        {run(size):>12,.0f} alterações/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
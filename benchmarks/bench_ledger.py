@@ -0,0 +1,50 @@
+"""
+Benchmark de memória e desempenho: ListLedger x ColumnarLedger.
+
+Uso:
+    python -m benchmarks.bench_ledger [número de transações]
+"""
+
+import sys
+
+from finances.ledger import ColumnarLedger, ListLedger
+from finances.models import Account
+
+from .common import measure, peak_memory
+
+CATEGORIES = ["Food", "Transport", "Salary", "Health", "Leisure", "Bills"]
+
+
+def build_account(size: int, ledger) -> Account:
+    """
+    Cria uma conta com transações sintéticas.
+
+    Args:
+        size (int): Número de transações.
+        ledger: Ledger a ser usado pela conta.
+
+    Returns:
+        Account: A conta preenchida.
+    """
+    account = Account("Benchmark", ledger)
+    for i in range(size):
+        account.add_transaction(-(i % 500) / 10, CATEGORIES[i % len(CATEGORIES)], f"Compra {i % 1000}")
+    return account
+
+
+def main(size: int) -> None:
+    print(f"Transações: {size}")
+    print(f"{'ledger':<10}{'memória (MB)':>14}{'bytes/tx':>10}{'inserção (s)':>14}{'iteração (s)':>14}{'categoria (s)':>15}")
+    for name, factory in (("list", ListLedger), ("columnar", ColumnarLedger)):
+        account, peak = peak_memory(lambda: build_account(size, factory()))
+        insert_time = measure(lambda: build_account(size, factory()), repeat=1)
+        iterate_time = measure(lambda: sum(t.amount for t in account.transactions))
+        category_time = measure(lambda: account.get_transactions(category="Health"))
+        print(
+            f"{name:<10}{peak / 2 ** 20:>14.1f}{peak / size:>10.0f}"
+            f"{insert_time:>14.3f}{iterate_time:>14.3f}{category_time:>15.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
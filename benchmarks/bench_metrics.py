@@ -0,0 +1,59 @@
+"""
+Benchmark do custo da instrumentação (finances.metrics): caminhos críticos sem
+instrumentação, com a instrumentação desativada após uso e com ela ativa.
+
+Uso:
+    python -m benchmarks.bench_metrics [número de transações]
+"""
+
+import sys
+from datetime import datetime
+
+from finances import clock, metrics
+from finances.metrics import MetricsRegistry
+from finances.utils import generate_report
+
+from .common import CATEGORIES, make_client, measure
+
+AS_OF = datetime(2025, 1, 1)
+
+
+def main(size: int) -> None:
+    client = make_client(transactions=size, investments=max(1, size // 100))
+    # As inclusões vão para outro cliente, para não alterar o relatório medido
+    account = make_client(accounts=1, transactions=0, investments=0).accounts[0]
+    client.get_net_worth(AS_OF)
+    count = 20_000
+
+    def add() -> None:
+        for i in range(count):
+            account.add_transaction(-1.0, CATEGORIES[i % len(CATEGORIES)], "Benchmark", AS_OF)
+
+    def net_worth() -> None:
+        for _ in range(count):
+            client.get_net_worth(AS_OF)
+
+    cases = [
+        ("add_transaction", add, count),
+        ("get_net_worth (cache)", net_worth, count),
+        ("generate_report", lambda: generate_report(client), 1),
+    ]
+    print(f"Transações: {size}")
+    print(f"{'caso':<24}{'sem (µs)':>12}{'desativada (µs)':>17}{'ativa (µs)':>12}{'custo':>9}")
+    with clock.frozen_clock(AS_OF):
+        for name, run, operations in cases:
+            plain = measure(run) / operations * 1e6
+            with metrics.instrumented(MetricsRegistry()):
+                active = measure(run) / operations * 1e6
+            disabled = measure(run) / operations * 1e6
+            print(f"{name:<24}{plain:>12.3f}{disabled:>17.3f}{active:>12.3f}{active / plain - 1:>8.1%}")
+
+        registry = MetricsRegistry()
+        with metrics.instrumented(registry):
+            generate_report(client)
+    print()
+    print(registry.export_prometheus())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,73 @@
+"""
+Benchmark de memória dos objetos Transaction e perfil de alocações de Account.add_transaction.
+
+Compara a transação com __slots__ a uma classe equivalente com __dict__ (o layout
+anterior), em bytes por transação.
+
+Uso:
+    python -m benchmarks.bench_objects [número de transações]
+"""
+
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+from finances.models import Account, FrozenTransaction, Transaction
+
+from .common import peak_memory
+
+CATEGORIES = ["Food", "Transport", "Salary", "Health", "Leisure", "Bills"]
+
+
+class DictTransaction:
+    """
+    Transação com __dict__, com os mesmos atributos de Transaction (layout anterior).
+    """
+
+    def __init__(self, amount, category, description="", date=None):
+        self.amount = amount
+        self.date = date if date is not None else datetime.now()
+        self.category = category
+        self.description = description
+        self._account = None
+        self._position = -1
+
+
+def build(factory, size: int) -> list:
+    start = datetime(2020, 1, 1)
+    return [
+        factory(-(i % 500) / 10, CATEGORIES[i % len(CATEGORIES)], "Compra", start + timedelta(seconds=i))
+        for i in range(size)
+    ]
+
+
+def allocation_profile(size: int, top: int = 8) -> None:
+    """
+    Mostra as linhas que mais alocam memória ao adicionar transações a uma conta.
+    """
+    account = Account("Benchmark")
+    start = datetime(2020, 1, 1)
+    tracemalloc.start()
+    for i in range(size):
+        account.add_transaction(-(i % 500) / 10, CATEGORIES[i % len(CATEGORIES)], "Compra", start + timedelta(seconds=i))
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    print(f"\nAlocações de Account.add_transaction ({size} transações):")
+    for statistic in snapshot.statistics("lineno")[:top]:
+        frame = statistic.traceback[0]
+        print(f"  {statistic.size / size:8.1f} bytes/tx  {statistic.count:>10} blocos  {frame.filename}:{frame.lineno}")
+
+
+def main(size: int) -> None:
+    print(f"Transações: {size}")
+    print(f"{'classe':<20}{'memória (MB)':>14}{'bytes/tx':>10}")
+    for factory in (DictTransaction, Transaction, FrozenTransaction):
+        records, peak = peak_memory(lambda: build(factory, size))
+        print(f"{factory.__name__:<20}{peak / 2 ** 20:>14.1f}{peak / size:>10.1f}")
+        del records
+    allocation_profile(min(size, 1_000_000))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
@@ -0,0 +1,43 @@
+"""
+Benchmark da primeira página de históricos longos: get_transactions_page (iteração
+sob demanda) x get_transactions fatiado, com e sem filtros, em cada ledger.
+
+Uso:
+    python -m benchmarks.bench_pagination [número de transações] [consultas]
+"""
+
+import sys
+from datetime import datetime
+
+from finances.ledger import ColumnarLedger
+
+from .common import make_client, measure
+
+PAGE = 20
+
+QUERIES = {
+    "sem filtros": {},
+    "categoria": {"category": "Food"},
+    "período (1 ano)": {"start_date": datetime(2020, 1, 1), "end_date": datetime(2020, 12, 31)},
+    "período + categoria": {"start_date": datetime(2020, 1, 1), "end_date": datetime(2020, 12, 31), "category": "Food"},
+}
+
+
+def main(size: int, count: int) -> None:
+    print(f"Transações: {size}, consultas: {count}, página: {PAGE}")
+    print(f"{'ledger':<10}{'consulta':<22}{'lista (ms)':>12}{'página (ms)':>13}{'ganho':>9}")
+    for name, factory in (("lista", None), ("colunar", ColumnarLedger)):
+        account = make_client(1, size, 0, ledger_factory=factory).accounts[0]
+        account.get_transactions(datetime(2020, 1, 1))  # constrói os índices fora da medição
+        account.get_transactions(category="Food")
+        for label, query in QUERIES.items():
+            full = measure(lambda: [account.get_transactions(**query)[:PAGE] for _ in range(count)])
+            paged = measure(lambda: [account.get_transactions_page(**query, limit=PAGE) for _ in range(count)])
+            print(f"{name:<10}{label:<22}{full / count * 1e3:>12.3f}{paged / count * 1e3:>13.3f}{full / paged:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    )
@@ -0,0 +1,57 @@
+"""
+Benchmark de partida a frio: carregar um cliente do formato binário x reimportar as transações.
+
+Uso:
+    python -m benchmarks.bench_persistence [número de transações]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from finances.ledger import ColumnarLedger
+from finances.models import Client
+from finances.persistence import load_client, save_client
+
+CATEGORIES = ["Food", "Transport", "Salary", "Health", "Leisure", "Bills"]
+
+
+def build_rows(size: int):
+    start = datetime(2015, 1, 1)
+    return [
+        (-(i % 500) / 10, CATEGORIES[i % len(CATEGORIES)], f"Compra {i % 5000}", start + timedelta(minutes=i))
+        for i in range(size)
+    ]
+
+
+def main(size: int) -> None:
+    rows = build_rows(size)
+    client = Client("Benchmark")
+    client.add_account("Conta", ColumnarLedger()).add_transactions(rows)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cliente.ngfs")
+        start = time.perf_counter()
+        save_client(client, path)
+        save_time = time.perf_counter() - start
+        print(f"Transações: {size} ({os.path.getsize(path) / 2 ** 20:.1f} MB, gravação em {save_time:.3f} s)")
+
+        start = time.perf_counter()
+        rebuilt = Client("Benchmark")
+        rebuilt.add_account("Conta", ColumnarLedger()).add_transactions(rows)
+        print(f"reimportação:             {time.perf_counter() - start:.4f} s")
+
+        for use_mmap in (False, True):
+            start = time.perf_counter()
+            loaded = load_client(path, use_mmap=use_mmap)
+            load_time = time.perf_counter() - start
+            start = time.perf_counter()
+            loaded.accounts[0].transactions[size // 2]
+            first_read = time.perf_counter() - start
+            label = "carga (mmap)" if use_mmap else "carga (leitura)"
+            print(f"{label:<25} {load_time:.4f} s (primeira leitura em {first_read * 1e6:.0f} µs)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
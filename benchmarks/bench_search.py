@@ -0,0 +1,56 @@
+"""
+Benchmark da busca por descrição em todas as contas de um cliente: Client.search
+(índice invertido) x percorrer todas as transações de todas as contas.
+
+Uso:
+    python -m benchmarks.bench_search [número de transações] [buscas]
+"""
+
+import sys
+from datetime import datetime
+
+from finances.indexes import tokenize
+from finances.models import Client
+
+from .common import make_client, measure
+
+
+def scan(client: Client, text: str, start_date: datetime) -> list:
+    tokens = set(tokenize(text))
+    found = [
+        t for account in client.accounts for t in account.transactions
+        if t.date >= start_date and tokens <= set(tokenize(t.description))
+    ]
+    found.sort(key=lambda t: t.date)
+    return found
+
+
+def main(size: int, count: int) -> None:
+    client = make_client(accounts=8, transactions=size, investments=0)
+    # Descrições únicas em algumas transações, para buscas seletivas
+    for i, account in enumerate(client.accounts):
+        for k in range(0, len(account.transactions), 997):
+            account.transactions[k].update(description=f"Cinema sessão {i}-{k}")
+    start = datetime(2020, 1, 1)
+    # As descrições de make_client são "Compra <0-999>": cada busca encontra ~0,1% das transações
+    queries = [f"compra {i * 37 % 1000}" for i in range(count)]
+    print(f"Transações: {size}, contas: {len(client.accounts)}, buscas: {count}")
+
+    build = measure(lambda: [setattr(a, "_text_index", None) or a.search("x") for a in client.accounts], repeat=1)
+    indexed = measure(lambda: [client.search(query, start_date=start) for query in queries])
+    scan_count = max(1, count // 100)
+    scanned = measure(lambda: [scan(client, query, start) for query in queries[:scan_count]], repeat=1) * count / scan_count
+    print(f"{'construção dos índices (s)':<32}{build:>12.4f}")
+    print(f"{'Client.search (s)':<32}{indexed:>12.4f}  ({indexed / count * 1e6:.1f} µs/busca)")
+    print(f"{'varredura (s, est.)':<32}{scanned:>12.4f}  ({scanned / indexed:.0f}x mais lento)")
+    rare = measure(lambda: [client.search("cinema sessão", limit=20) for _ in range(count)])
+    print(f"{'busca seletiva, limit=20 (s)':<32}{rare:>12.4f}  ({rare / count * 1e6:.1f} µs/busca)")
+    broad = measure(lambda: client.search("compra", start_date=start), repeat=1)
+    print(f"{'busca ampla, uma (s)':<32}{broad:>12.4f}  (todas as transações desde {start:%Y})")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    )
@@ -0,0 +1,83 @@
+"""
+Teste de carga local do serviço de consultas: latências p50/p99 com e sem agrupamento.
+
+Simula rajadas de consultas idênticas (relatório, transações e patrimônio) de
+vários usuários ao mesmo tempo.
+
+Uso:
+    python -m benchmarks.bench_service [número de consultas] [transações por cliente]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from finances.models import Client, Investment
+from finances.service import QueryService
+
+from .common import percentile
+
+CATEGORIES = ["Food", "Transport", "Salary", "Health", "Leisure", "Bills"]
+
+
+def build_clients(count: int, size: int):
+    start = datetime(2020, 1, 1)
+    clients = {}
+    for k in range(count):
+        client = Client(f"Cliente {k}", concurrent=True)
+        client.add_account("Conta").add_transactions([
+            (-(i % 500) / 10, CATEGORIES[i % len(CATEGORIES)], f"Compra {i}", start + timedelta(hours=i))
+            for i in range(size)
+        ])
+        client.add_investment(Investment("Ações", 1000.0 + k, 0.01))
+        clients[client.name] = client
+    return clients
+
+
+async def load_test(query: QueryService, requests: int, burst: int) -> list:
+    """
+    Dispara as consultas em rajadas e retorna a latência de cada uma, em segundos.
+    """
+    names = list(query.clients)
+    rng = random.Random(42)
+    latencies = []
+
+    async def request(kind: int, name: str) -> None:
+        start = time.perf_counter()
+        if kind == 0:
+            await query.generate_report(name, transaction_limit=500)
+        elif kind == 1:
+            await query.get_transactions(name, "Conta", category="Food")
+        else:
+            await query.get_net_worth(name)
+        latencies.append(time.perf_counter() - start)
+
+    for _ in range(requests // burst):
+        kind, name = rng.randrange(3), rng.choice(names)
+        await asyncio.gather(*(request(kind, name) for _ in range(burst)))
+    return latencies
+
+
+def main(requests: int, size: int) -> None:
+    clients = build_clients(20, size)
+    print(f"Consultas: {requests} (rajadas de 50 idênticas), {size} transações por cliente")
+    for coalesce in (False, True):
+        query = QueryService(clients, coalesce=coalesce)
+        start = time.perf_counter()
+        latencies = asyncio.run(load_test(query, requests, burst=50))
+        elapsed = time.perf_counter() - start
+        query.close()
+        label = "com agrupamento" if coalesce else "sem agrupamento"
+        print(
+            f"{label}: {len(latencies) / elapsed:>9,.0f} consultas/s | "
+            f"p50 {percentile(latencies, 0.5) * 1000:8.2f} ms | p99 {percentile(latencies, 0.99) * 1000:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    )
@@ -0,0 +1,54 @@
+"""
+Benchmark do SQLiteLedger contra os ledgers em memória.
+
+Uso:
+    python -m benchmarks.bench_sqlstore [número de transações]
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from finances.ledger import ColumnarLedger, ListLedger
+from finances.models import Account, Client
+from finances.sqlstore import SQLiteStore
+
+from .common import measure
+
+CATEGORIES = ["Food", "Transport", "Salary", "Health", "Leisure", "Bills"]
+START = datetime(2015, 1, 1)
+
+
+def build_rows(size: int):
+    return [
+        (-(i % 500) / 10, CATEGORIES[i % len(CATEGORIES)], f"Compra {i % 5000}", START + timedelta(minutes=i))
+        for i in range(size)
+    ]
+
+
+def main(size: int) -> None:
+    rows = build_rows(size)
+    window = (START + timedelta(minutes=size // 2), START + timedelta(minutes=size // 2 + 1440 * 30))
+    print(f"Transações: {size}")
+    print(f"{'backend':<10}{'inserção (s)':>14}{'mês (s)':>10}{'categoria (s)':>15}{'totais (s)':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteStore(os.path.join(directory, "bench.db"), batch_size=10_000)
+        client_id = store.save_client(Client("Benchmark"))
+        backends = {
+            "list": lambda: Account("Benchmark", ListLedger()),
+            "columnar": lambda: Account("Benchmark", ColumnarLedger()),
+            "sqlite": lambda: store.create_account(client_id, "Benchmark"),
+        }
+        for name, factory in backends.items():
+            account = factory()
+            insert_time = measure(lambda: (account.add_transactions(rows), account.transactions.flush() if name == "sqlite" else None), repeat=1)
+            month_time = measure(lambda: account.get_transactions(start_date=window[0], end_date=window[1]))
+            category_time = measure(lambda: account.get_transactions(category="Health"), repeat=1)
+            totals_time = measure(lambda: account.get_category_totals())
+            print(f"{name:<10}{insert_time:>14.3f}{month_time:>10.4f}{category_time:>15.3f}{totals_time:>12.4f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,51 @@
+"""
+Benchmark da avaliação de investimentos: um a um x em lote (InvestmentBatch).
+
+Uso:
+    python -m benchmarks.bench_valuation [número de investimentos]
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+from finances import valuation
+from finances.models import Investment
+from finances.valuation import InvestmentBatch
+
+from .common import measure
+
+
+def build_investments(size: int):
+    """
+    Cria investimentos sintéticos com taxas e datas de compra variadas.
+
+    Args:
+        size (int): Número de investimentos.
+
+    Returns:
+        List[Investment]: Os investimentos criados.
+    """
+    investments = []
+    for i in range(size):
+        investment = Investment(f"Fundo {i % 50}", 1000.0 + i % 100, 0.005 + (i % 20) / 1000)
+        investment.date_purchased -= timedelta(days=i % 3650)
+        investments.append(investment)
+    return investments
+
+
+def main(size: int) -> None:
+    investments = build_investments(size)
+    now = datetime.now()
+    backend = "numpy" if valuation.np is not None else "python"
+    print(f"Investimentos: {size} (backend: {backend})")
+    loop_time = measure(lambda: [i.initial_amount * (1 + i.rate_of_return) ** ((now - i.date_purchased).days // 30) for i in investments])
+    batch_time = measure(lambda: InvestmentBatch(investments).values_at(now))
+    batch = InvestmentBatch(investments)
+    values_time = measure(lambda: batch.values_at(now))
+    print(f"um a um:                  {loop_time:.3f} s")
+    print(f"em lote (com montagem):   {batch_time:.3f} s")
+    print(f"em lote (colunas prontas): {values_time:.3f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,125 @@
+"""
+Funções auxiliares compartilhadas pelos benchmarks do pacote NG Finances.
+"""
+
+import math
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+from finances.models import Client, Investment
+
+CATEGORIES = ["Food", "Transport", "Salary", "Health", "Leisure", "Bills"]
+INVESTMENT_TYPES = ["Ações", "CDB", "Tesouro", "Fundo Imobiliário"]
+
+
+def measure(function: Callable[[], Any], repeat: int = 3) -> float:
+    """
+    Mede o menor tempo de execução de uma função.
+
+    Args:
+        function (Callable): Função sem argumentos a ser medida.
+        repeat (int, optional): Número de repetições. Padrão é 3.
+
+    Returns:
+        float: Menor tempo observado, em segundos.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(function: Callable[[], Any]) -> Tuple[Any, int]:
+    """
+    Executa uma função medindo o pico de memória alocada.
+
+    Args:
+        function (Callable): Função sem argumentos a ser executada.
+
+    Returns:
+        Tuple[Any, int]: O retorno da função e o pico de memória, em bytes.
+    """
+    tracemalloc.start()
+    try:
+        result = function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """
+    Retorna o percentil de uma amostra (pelo método do valor mais próximo).
+
+    Args:
+        values (Sequence[float]): Amostra.
+        fraction (float): Percentil desejado, entre 0 e 1 (por exemplo, 0.99).
+
+    Returns:
+        float: O valor do percentil.
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def make_client(
+    accounts: int = 4,
+    transactions: int = 10_000,
+    investments: int = 100,
+    seed: int = 0,
+    start: datetime = datetime(2015, 1, 1),
+    years: int = 10,
+    ledger_factory: Optional[Callable[[], Any]] = None,
+    name: str = "Benchmark"
+) -> Client:
+    """
+    Cria um cliente sintético e reproduzível.
+
+    As transações são distribuídas entre as contas, em ordem cronológica (com
+    variação aleatória de horário) ao longo do período; os investimentos têm taxas
+    e datas de compra aleatórias no mesmo período.
+
+    Args:
+        accounts (int, optional): Número de contas (N). Padrão é 4.
+        transactions (int, optional): Total de transações (M), somando todas as contas. Padrão é 10.000.
+        investments (int, optional): Número de investimentos (K). Padrão é 100.
+        seed (int, optional): Semente do gerador aleatório. Padrão é 0.
+        start (datetime, optional): Início do período. Padrão é 01/01/2015.
+        years (int, optional): Duração do período, em anos. Padrão é 10.
+        ledger_factory (Callable, optional): Cria o ledger de cada conta. Padrão é o ledger padrão.
+        name (str, optional): Nome do cliente. Padrão é "Benchmark".
+
+    Returns:
+        Client: O cliente preenchido.
+    """
+    rng = random.Random(seed)
+    client = Client(name)
+    period = timedelta(days=365 * years)
+    interval = period / max(transactions, 1)
+    for a in range(accounts):
+        count = transactions // accounts + (1 if a < transactions % accounts else 0)
+        account = client.add_account(f"Conta {a}", ledger_factory() if ledger_factory is not None else None)
+        account.add_transactions(
+            (
+                round(rng.uniform(-500.0, 300.0), 2),
+                CATEGORIES[rng.randrange(len(CATEGORIES))],
+                f"Compra {rng.randrange(1000)}",
+                start + interval * (i * accounts + a) + timedelta(seconds=rng.randrange(3600))
+            )
+            for i in range(count)
+        )
+    for _ in range(investments):
+        investment = Investment(
+            INVESTMENT_TYPES[rng.randrange(len(INVESTMENT_TYPES))],
+            round(rng.uniform(100.0, 10_000.0), 2),
+            round(rng.uniform(0.001, 0.02), 4)
+        )
+        investment.date_purchased = start + period * rng.random()
+        client.add_investment(investment)
+    return client
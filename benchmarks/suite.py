@@ -0,0 +1,304 @@
+"""
+Suíte de benchmarks dos caminhos críticos do pacote, com curvas de escala, pico de
+memória e resultados em JSON para comparação com uma referência (baseline).
+
+Para cada tamanho (total de transações M), é gerado um cliente sintético com N
+contas, M transações e K investimentos (make_client), e cada caso é medido: tempo
+(melhor de várias repetições), tempo por operação e pico de memória alocada durante
+o caso. Entre tamanhos consecutivos é mostrado o expoente de escala estimado e:
+o tempo por operação cresce como M ** e (0,0: constante; 1,0: linear).
+
+Uso:
+    python -m benchmarks.suite                                  # tamanhos padrão
+    python -m benchmarks.suite --sizes 1000,10000 --save baseline.json
+    python -m benchmarks.suite --compare baseline.json          # falha (código 1) se houver regressão
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from finances import clock, valuation
+from finances.models import Client
+from finances.utils import future_value_report, generate_report
+
+from .common import CATEGORIES, make_client, measure, peak_memory
+
+# Data de referência das avaliações, relatórios e inclusões (relógio parado)
+AS_OF = datetime(2025, 1, 1)
+
+# Um caso prepara o cliente e retorna a função medida e o número de operações que ela executa
+Case = Callable[[Client], Tuple[Callable[[], Any], int]]
+
+
+def case_add_transaction(client: Client) -> Tuple[Callable[[], Any], int]:
+    account = client.accounts[0]
+    count = 1000
+
+    def run() -> None:
+        for i in range(count):
+            account.add_transaction(-1.0, CATEGORIES[i % len(CATEGORIES)], "Benchmark", AS_OF)
+
+    return run, count
+
+
+def case_get_transactions_range(client: Client) -> Tuple[Callable[[], Any], int]:
+    account = client.accounts[0]
+    account.get_transactions(AS_OF, AS_OF)  # constrói o índice por data fora da medição
+    starts = [datetime(2015, 1, 1) + timedelta(days=36 * k) for k in range(100)]
+
+    def run() -> None:
+        for start in starts:
+            account.get_transactions(start, start + timedelta(days=30))
+
+    return run, len(starts)
+
+
+def case_get_transactions_category(client: Client) -> Tuple[Callable[[], Any], int]:
+    account = client.accounts[0]
+    account.get_category_total("Food")  # constrói o índice por categoria fora da medição
+
+    def run() -> None:
+        for category in CATEGORIES:
+            account.get_transactions(category=category)
+
+    return run, len(CATEGORIES)
+
+
+def case_transactions_page(client: Client) -> Tuple[Callable[[], Any], int]:
+    account = client.accounts[0]
+    account.get_transactions_page(start_date=AS_OF, category="Food")  # constrói os índices fora da medição
+    count = 100
+
+    def run() -> None:
+        for i in range(count):
+            account.get_transactions_page(category=CATEGORIES[i % len(CATEGORIES)], limit=20)
+
+    return run, count
+
+
+def case_net_worth_cold(client: Client) -> Tuple[Callable[[], Any], int]:
+    # Cada data completa um novo mês para todos os investimentos: todos são reavaliados
+    dates = [AS_OF + timedelta(days=31 * k) for k in range(1, 21)]
+
+    def run() -> None:
+        for date in dates:
+            client.get_net_worth(date)
+
+    return run, len(dates)
+
+
+def case_net_worth_warm(client: Client) -> Tuple[Callable[[], Any], int]:
+    client.get_net_worth(AS_OF)
+    count = 10_000
+
+    def run() -> None:
+        for _ in range(count):
+            client.get_net_worth(AS_OF)
+
+    return run, count
+
+
+def case_generate_report(client: Client) -> Tuple[Callable[[], Any], int]:
+    return (lambda: generate_report(client)), 1
+
+
+def case_future_value_report(client: Client) -> Tuple[Callable[[], Any], int]:
+    return (lambda: future_value_report(client, AS_OF + timedelta(days=3650))), 1
+
+
+CASES: Dict[str, Case] = {
+    "add_transaction": case_add_transaction,
+    "get_transactions_range": case_get_transactions_range,
+    "get_transactions_category": case_get_transactions_category,
+    "transactions_page": case_transactions_page,
+    "net_worth_cold": case_net_worth_cold,
+    "net_worth_warm": case_net_worth_warm,
+    "generate_report": case_generate_report,
+    "future_value_report": case_future_value_report,
+}
+
+
+def run_suite(
+    sizes: List[int],
+    accounts: int = 4,
+    investments_per_1000: int = 10,
+    repeat: int = 3,
+    cases: Optional[List[str]] = None,
+    memory: bool = True
+) -> Dict[str, Any]:
+    """
+    Executa os casos da suíte em cada tamanho.
+
+    Args:
+        sizes (List[int]): Totais de transações (M) de cada cliente.
+        accounts (int, optional): Contas por cliente (N). Padrão é 4.
+        investments_per_1000 (int, optional): Investimentos (K) a cada 1000 transações. Padrão é 10.
+        repeat (int, optional): Repetições de cada medição. Padrão é 3.
+        cases (List[str], optional): Casos a executar. Padrão é todos.
+        memory (bool, optional): Se o pico de memória é medido. Padrão é True.
+
+    Returns:
+        Dict[str, Any]: Metadados do ambiente e a lista de resultados.
+    """
+    results = []
+    with clock.frozen_clock(AS_OF):
+        for size in sizes:
+            investments = max(1, size * investments_per_1000 // 1000)
+            build = lambda: make_client(accounts, size, investments)
+            client, build_peak = peak_memory(build) if memory else (build(), None)
+            results.append(_result("build_client", size, measure(build, repeat=1), 1, build_peak))
+            _print_result(results[-1])
+            for name in cases or CASES:
+                run, operations = CASES[name](client)
+                seconds = measure(run, repeat)
+                peak = peak_memory(run)[1] if memory else None
+                results.append(_result(name, size, seconds, operations, peak))
+                _print_result(results[-1])
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "numpy": valuation.np.__version__ if valuation.np is not None else None,
+            "accounts": accounts,
+            "investments_per_1000": investments_per_1000,
+            "sizes": sizes,
+        },
+        "results": results,
+    }
+
+
+def _result(case: str, size: int, seconds: float, operations: int, peak: Optional[int]) -> Dict[str, Any]:
+    return {
+        "case": case,
+        "size": size,
+        "seconds": seconds,
+        "operations": operations,
+        "per_op_us": seconds / operations * 1e6,
+        "peak_bytes": peak,
+    }
+
+
+def _print_result(result: Dict[str, Any]) -> None:
+    peak = result["peak_bytes"]
+    memory = f"{peak / 2 ** 20:>10.2f}" if peak is not None else f"{'-':>10}"
+    print(f"{result['case']:<28}{result['size']:>10}{result['seconds']:>12.4f}{result['per_op_us']:>14.2f}{memory}")
+
+
+def scaling(results: List[Dict[str, Any]]) -> Dict[str, List[Tuple[int, int, float]]]:
+    """
+    Estima o expoente de escala de cada caso entre tamanhos consecutivos.
+
+    Args:
+        results (List[Dict]): Resultados de run_suite.
+
+    Returns:
+        Dict[str, List[Tuple[int, int, float]]]: Para cada caso, (tamanho anterior,
+        tamanho, expoente), em que tempo ~ tamanho ** expoente.
+    """
+    curves: Dict[str, List[Tuple[int, float]]] = {}
+    for result in results:
+        curves.setdefault(result["case"], []).append((result["size"], result["per_op_us"]))
+    exponents = {}
+    for case, points in curves.items():
+        points.sort()
+        exponents[case] = [
+            (n1, n2, math.log(t2 / t1) / math.log(n2 / n1))
+            for (n1, t1), (n2, t2) in zip(points, points[1:])
+            if n2 > n1 and t1 > 0 and t2 > 0
+        ]
+    return exponents
+
+
+def compare(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    threshold: float = 1.25,
+    min_seconds: float = 0.001,
+    min_bytes: int = 65_536
+) -> List[str]:
+    """
+    Compara resultados com uma referência e lista as regressões.
+
+    Um caso regrediu se o tempo (ou o pico de memória) passou de threshold vezes o
+    da referência. Diferenças de tempo abaixo de min_seconds e de memória abaixo de
+    min_bytes são ignoradas (ruído).
+
+    Args:
+        results (List[Dict]): Resultados atuais.
+        baseline (List[Dict]): Resultados de referência.
+        threshold (float, optional): Razão máxima aceita. Padrão é 1,25.
+        min_seconds (float, optional): Diferença mínima de tempo considerada. Padrão é 1 ms.
+        min_bytes (int, optional): Diferença mínima de memória considerada. Padrão é 64 KiB.
+
+    Returns:
+        List[str]: Descrição de cada regressão (vazia se não houver).
+    """
+    reference = {(result["case"], result["size"]): result for result in baseline}
+    regressions = []
+    print(f"\n{'caso':<28}{'tamanho':>10}{'tempo':>10}{'memória':>10}")
+    for result in results:
+        base = reference.get((result["case"], result["size"]))
+        if base is None:
+            continue
+        time_ratio = result["seconds"] / base["seconds"] if base["seconds"] else 1.0
+        measured = result["peak_bytes"] is not None and base.get("peak_bytes")
+        memory_ratio = result["peak_bytes"] / base["peak_bytes"] if measured else 1.0
+        print(f"{result['case']:<28}{result['size']:>10}{time_ratio:>9.2f}x{memory_ratio:>9.2f}x")
+        if time_ratio > threshold and result["seconds"] - base["seconds"] > min_seconds:
+            regressions.append(f"{result['case']} (M={result['size']}): tempo {time_ratio:.2f}x a referência")
+        if memory_ratio > threshold and result["peak_bytes"] - base["peak_bytes"] > min_bytes:
+            regressions.append(f"{result['case']} (M={result['size']}): memória {memory_ratio:.2f}x a referência")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do NG Finances.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Totais de transações, separados por vírgula.")
+    parser.add_argument("--accounts", type=int, default=4, help="Contas por cliente.")
+    parser.add_argument("--investments-per-1000", type=int, default=10, help="Investimentos a cada 1000 transações.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições de cada medição.")
+    parser.add_argument("--cases", default=None, help="Casos a executar, separados por vírgula.")
+    parser.add_argument("--no-memory", action="store_true", help="Não mede o pico de memória (mais rápido).")
+    parser.add_argument("--save", default=None, help="Grava os resultados em JSON.")
+    parser.add_argument("--compare", default=None, help="Compara com resultados gravados por --save.")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Razão máxima aceita na comparação.")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    cases = args.cases.split(",") if args.cases else None
+    unknown = [case for case in cases or () if case not in CASES]
+    if unknown:
+        parser.error(f"casos desconhecidos: {', '.join(unknown)} (disponíveis: {', '.join(CASES)})")
+    print(f"{'caso':<28}{'tamanho':>10}{'tempo (s)':>12}{'µs/operação':>14}{'pico (MB)':>10}")
+    report = run_suite(sizes, args.accounts, args.investments_per_1000, args.repeat, cases, not args.no_memory)
+
+    print(f"\n{'caso':<28}expoente de escala (tempo por operação)")
+    for case, exponents in scaling(report["results"]).items():
+        print(f"{case:<28}" + "  ".join(f"{n1}->{n2}: {exponent:+.2f}" for n1, n2, exponent in exponents))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nResultados gravados em {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(report["results"], baseline["results"], args.threshold)
+        if regressions:
+            print("\nRegressões:")
+            for regression in regressions:
+                print(f"- {regression}")
+            return 1
+        print("\nNenhuma regressão encontrada.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,22 +5,93 @@ Este pacote fornece ferramentas para gerenciamento de finanças pessoais, inclui
 transações, contas bancárias, investimentos e relatórios financeiros.
 
 Componentes principais:
-- Transaction: Representa uma transação financeira.
+- Transaction / FrozenTransaction: Representam uma transação financeira (alterável ou imutável).
 - Account: Representa uma conta bancária e gerencia transações.
-- Investment: Representa um investimento financeiro.
+- TransactionPage: Página de transações de uma consulta paginada por cursor.
+- Investment / FrozenInvestment: Representam um investimento financeiro (alterável ou imutável).
 - Client: Representa um cliente e gerencia suas contas e investimentos.
+- Clock / FrozenClock / use_clock / frozen_clock: Relógio usado para obter a data atual.
+- DayCount / ContributionSchedule / AccrualSchedule: Convenções de contagem de dias, aportes
+  periódicos e cronogramas de rendimento de investimentos.
+- ListLedger / ColumnarLedger: Armazenamentos de transações das contas.
+- InvestmentBatch / value_investments / project_investments: Avaliação de investimentos em lote.
+- Projection / project_client: Projeções de patrimônio em séries temporais.
+- import_csv / import_ofx / CategoryRules: Importação de extratos bancários.
+- save_client / load_client: Persistência de clientes em formato binário compacto.
+- SQLiteStore / SQLiteLedger: Armazenamento de clientes e transações em SQLite.
+- Journal / recover: Journal (log de escrita antecipada) das alterações de um cliente.
 - generate_report: Gera um relatório financeiro detalhado para um cliente.
 - future_value_report: Gera projeções financeiras futuras para um cliente.
+- iter_report_lines / write_report: Geram o relatório financeiro sob demanda, linha a linha.
+- render_projection: Gera o texto de uma data de uma projeção.
+- generate_reports / ReportBatch: Geram relatórios de muitos clientes em paralelo.
+- QueryService: Consultas assíncronas (asyncio) com agrupamento de consultas idênticas.
+- metrics / MetricsRegistry: Instrumentação opcional (contagem e tempo) dos caminhos críticos.
 """
 
-from .models import Transaction, Account, Investment, Client
-from .utils import generate_report, future_value_report
+from .models import Transaction, FrozenTransaction, Account, TransactionPage, Investment, FrozenInvestment, Client
+from .clock import Clock, FrozenClock, use_clock, frozen_clock, set_clock
+from .daycount import DayCount, ContributionSchedule, AccrualSchedule, get_convention
+from .ledger import ListLedger, ColumnarLedger, StringTable
+from .valuation import InvestmentBatch, value_investments, project_investments
+from .projection import Projection, project_client, monthly_dates
+from .importers import CategoryRules, ImportResult, import_csv, import_ofx
+from .persistence import MappedLedger, save_client, load_client, dumps_client, loads_client
+from .sqlstore import SQLiteStore, SQLiteLedger
+from .journal import Journal, recover
+from .utils import generate_report, future_value_report, render_projection, iter_report_lines, write_report
+from .batch import ReportBatch, generate_reports
+from .service import QueryService
+from . import metrics
+from .metrics import MetricsRegistry
 
 __all__ = [
     "Transaction",
+    "FrozenTransaction",
     "Account",
+    "TransactionPage",
     "Investment",
+    "FrozenInvestment",
     "Client",
+    "Clock",
+    "FrozenClock",
+    "use_clock",
+    "frozen_clock",
+    "set_clock",
+    "DayCount",
+    "ContributionSchedule",
+    "AccrualSchedule",
+    "get_convention",
+    "ListLedger",
+    "ColumnarLedger",
+    "StringTable",
+    "MappedLedger",
+    "InvestmentBatch",
+    "value_investments",
+    "project_investments",
+    "Projection",
+    "project_client",
+    "monthly_dates",
+    "CategoryRules",
+    "ImportResult",
+    "import_csv",
+    "import_ofx",
+    "save_client",
+    "load_client",
+    "dumps_client",
+    "loads_client",
+    "SQLiteStore",
+    "SQLiteLedger",
+    "Journal",
+    "recover",
     "generate_report",
-    "future_value_report"
+    "future_value_report",
+    "render_projection",
+    "iter_report_lines",
+    "write_report",
+    "ReportBatch",
+    "generate_reports",
+    "QueryService",
+    "metrics",
+    "MetricsRegistry"
 ]
\ No newline at end of file
@@ -0,0 +1,228 @@
+"""
+Geração de relatórios de muitos clientes em paralelo, com um pool de processos.
+
+Os clientes são enviados aos processos no formato binário de persistence (um bloco
+de bytes por cliente), sem serializar cada objeto Transaction, e agrupados em lotes
+para reduzir o custo de comunicação entre processos.
+"""
+
+import itertools
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Deque, Iterable, Iterator, List, Optional, Set, Tuple
+
+from . import clock
+from .models import Client
+from .persistence import dumps_client, loads_client
+from .utils import future_value_report, iter_report_lines
+
+
+def render_client_report(
+    client: Client,
+    future_date: Optional[datetime] = None,
+    transaction_limit: Optional[int] = None
+) -> str:
+    """
+    Gera o relatório de um cliente, seguido da projeção para uma data futura, se informada.
+
+    Args:
+        client (Client): O cliente para o qual o relatório será gerado.
+        future_date (datetime, optional): Data da projeção (future_value_report). Padrão é None.
+        transaction_limit (int, optional): Máximo de transações listadas por conta. Padrão é None.
+
+    Returns:
+        str: O relatório formatado.
+    """
+    report = "\n".join(iter_report_lines(client, transaction_limit))
+    if future_date is not None:
+        report += "\n\n" + future_value_report(client, future_date)
+    return report
+
+
+def _render_chunk(
+    first: int,
+    payloads: List[bytes],
+    future_date: Optional[datetime],
+    transaction_limit: Optional[int],
+    as_of: datetime
+) -> List[Tuple[int, str]]:
+    """
+    Gera, em um processo do pool, os relatórios de um lote de clientes serializados.
+
+    O relógio fica parado na data do lote, para que todos os relatórios usem a mesma data.
+    """
+    with clock.frozen_clock(as_of):
+        return [
+            (index, render_client_report(loads_client(payload), future_date, transaction_limit))
+            for index, payload in enumerate(payloads, first)
+        ]
+
+
+class ReportBatch:
+    """
+    Geração em lote dos relatórios de vários clientes.
+
+    Iterar sobre o lote retorna pares (índice do cliente, relatório). Os clientes são
+    lidos e serializados sob demanda, de modo que apenas alguns lotes ficam pendentes
+    de cada vez. Todos os relatórios do lote usam a mesma data de avaliação.
+
+    Atributos:
+        workers (int | None): Número de processos (None usa a quantidade de CPUs; 0
+            gera os relatórios no próprio processo).
+        chunk_size (int): Clientes enviados por tarefa.
+        ordered (bool): Se os relatórios são retornados na ordem dos clientes ou
+            assim que ficam prontos.
+        as_of (datetime | None): Data de avaliação dos relatórios (None: o momento em
+            que a iteração começa).
+        cancelled (bool): Se o lote foi cancelado.
+    """
+
+    def __init__(
+        self,
+        clients: Iterable[Client],
+        future_date: Optional[datetime] = None,
+        transaction_limit: Optional[int] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = 64,
+        ordered: bool = True,
+        max_pending: Optional[int] = None,
+        as_of: Optional[datetime] = None
+    ) -> None:
+        """
+        Prepara a geração dos relatórios.
+
+        Args:
+            clients (Iterable[Client]): Clientes (pode ser um gerador).
+            future_date (datetime, optional): Data da projeção incluída em cada relatório. Padrão é None.
+            transaction_limit (int, optional): Máximo de transações listadas por conta. Padrão é None.
+            workers (int, optional): Número de processos. Padrão é a quantidade de CPUs.
+            chunk_size (int, optional): Clientes enviados por tarefa. Padrão é 64.
+            ordered (bool, optional): Se os relatórios seguem a ordem dos clientes. Padrão é True.
+            max_pending (int, optional): Máximo de lotes pendentes. Padrão é o dobro do número de processos.
+            as_of (datetime, optional): Data de avaliação dos relatórios. Padrão é o momento
+                em que a iteração começa (clock.now()).
+
+        Raises:
+            ValueError: Se chunk_size não for positivo.
+        """
+        if chunk_size < 1:
+            raise ValueError("O tamanho do lote deve ser positivo.")
+        self._clients = iter(clients)
+        self.future_date: Optional[datetime] = future_date
+        self.transaction_limit: Optional[int] = transaction_limit
+        self.workers: Optional[int] = workers
+        self.chunk_size: int = chunk_size
+        self.ordered: bool = ordered
+        self.max_pending: Optional[int] = max_pending
+        self.as_of: Optional[datetime] = as_of
+        self.cancelled: bool = False
+        self._executor: Optional[Executor] = None
+        self._pending: Set[Future] = set()
+
+    def _chunks(self) -> Iterator[Tuple[int, List[bytes]]]:
+        """
+        Serializa os clientes em lotes de chunk_size, sob demanda.
+        """
+        first = 0
+        while True:
+            payloads = [dumps_client(client) for client in itertools.islice(self._clients, self.chunk_size)]
+            if not payloads:
+                return
+            yield first, payloads
+            first += len(payloads)
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        """
+        Gera os relatórios, retornando pares (índice do cliente, relatório).
+
+        Interromper a iteração (por exemplo, com break) cancela os lotes pendentes.
+        """
+        as_of = self.as_of if self.as_of is not None else clock.now()
+        if self.workers == 0:
+            for first, payloads in self._chunks():
+                for result in _render_chunk(first, payloads, self.future_date, self.transaction_limit, as_of):
+                    if self.cancelled:
+                        return
+                    yield result
+            return
+        workers = self.workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        max_pending = self.max_pending or 2 * workers
+        chunks = self._chunks()
+        queue: Deque[Future] = deque()
+        try:
+            while not self.cancelled:
+                for first, payloads in itertools.islice(chunks, max_pending - len(self._pending)):
+                    future = self._executor.submit(
+                        _render_chunk, first, payloads, self.future_date, self.transaction_limit, as_of
+                    )
+                    self._pending.add(future)
+                    if self.ordered:
+                        queue.append(future)
+                if not self._pending:
+                    break
+                if self.ordered:
+                    done = [queue.popleft()]
+                else:
+                    done, _ = wait(self._pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._pending.discard(future)
+                    for result in future.result():
+                        if self.cancelled:
+                            return
+                        yield result
+        finally:
+            self.cancel()
+
+    def cancel(self) -> None:
+        """
+        Cancela os lotes ainda não iniciados e encerra o pool de processos.
+
+        Lotes em execução terminam, mas seus relatórios são descartados.
+        """
+        self.cancelled = True
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> "ReportBatch":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.cancel()
+
+
+def generate_reports(
+    clients: Iterable[Client],
+    future_date: Optional[datetime] = None,
+    transaction_limit: Optional[int] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    ordered: bool = True,
+    as_of: Optional[datetime] = None
+) -> ReportBatch:
+    """
+    Gera os relatórios de vários clientes em paralelo, em um pool de processos.
+
+    Exemplo:
+        for index, report in generate_reports(clients, future_date=datetime(2030, 1, 1)):
+            ...
+
+    Args:
+        clients (Iterable[Client]): Clientes (pode ser um gerador).
+        future_date (datetime, optional): Data da projeção incluída em cada relatório. Padrão é None.
+        transaction_limit (int, optional): Máximo de transações listadas por conta. Padrão é None.
+        workers (int, optional): Número de processos. Padrão é a quantidade de CPUs.
+        chunk_size (int, optional): Clientes enviados por tarefa. Padrão é 64.
+        ordered (bool, optional): Se os relatórios seguem a ordem dos clientes. Padrão é True.
+        as_of (datetime, optional): Data de avaliação dos relatórios. Padrão é o momento atual.
+
+    Returns:
+        ReportBatch: Lote iterável de pares (índice do cliente, relatório); use cancel() para interrompê-lo.
+    """
+    return ReportBatch(clients, future_date, transaction_limit, workers, chunk_size, ordered, as_of=as_of)
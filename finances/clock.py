@@ -0,0 +1,138 @@
+"""
+Relógio usado pelo pacote para obter a data atual.
+
+Todas as consultas da data atual (datas padrão de transações e investimentos,
+avaliações, relatórios e projeções) passam por now(). O relógio pode ser trocado
+para um bloco de código (use_clock) ou para todo o programa (set_clock), e um
+relógio parado (FrozenClock) torna os resultados reproduzíveis: um relatório ou
+lote captura a data uma única vez e todas as avaliações usam a mesma data.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+
+class Clock:
+    """
+    Relógio do sistema.
+    """
+
+    def now(self) -> datetime:
+        """
+        Retorna a data e hora atuais.
+
+        Returns:
+            datetime: A data atual (sem fuso horário).
+        """
+        return datetime.now()
+
+
+class FrozenClock(Clock):
+    """
+    Relógio parado em uma data, que só avança quando solicitado.
+
+    Atributos:
+        moment (datetime): Data retornada por now().
+    """
+
+    def __init__(self, moment: Optional[datetime] = None) -> None:
+        """
+        Inicializa o relógio.
+
+        Args:
+            moment (datetime, optional): Data do relógio. Padrão é a data atual do relógio em uso.
+        """
+        self.moment: datetime = moment if moment is not None else now()
+
+    def now(self) -> datetime:
+        return self.moment
+
+    def advance(self, delta: timedelta) -> datetime:
+        """
+        Avança o relógio.
+
+        Args:
+            delta (timedelta): Intervalo a avançar.
+
+        Returns:
+            datetime: A nova data do relógio.
+        """
+        self.moment += delta
+        return self.moment
+
+
+_default: Clock = Clock()
+_current: ContextVar[Optional[Clock]] = ContextVar("finances_clock", default=None)
+
+
+def get_clock() -> Clock:
+    """
+    Retorna o relógio em uso no contexto atual.
+
+    Returns:
+        Clock: O relógio em uso.
+    """
+    return _current.get() or _default
+
+
+def now() -> datetime:
+    """
+    Retorna a data atual segundo o relógio em uso.
+
+    Returns:
+        datetime: A data atual.
+    """
+    clock = _current.get()
+    return clock.now() if clock is not None else _default.now()
+
+
+def set_clock(clock: Optional[Clock]) -> Clock:
+    """
+    Define o relógio padrão de todo o programa.
+
+    Args:
+        clock (Clock | None): O novo relógio padrão; None volta ao relógio do sistema.
+
+    Returns:
+        Clock: O relógio padrão anterior.
+    """
+    global _default
+    previous, _default = _default, clock if clock is not None else Clock()
+    return previous
+
+
+@contextmanager
+def use_clock(clock: Clock) -> Iterator[Clock]:
+    """
+    Usa um relógio dentro de um bloco with (apenas na thread ou tarefa atual).
+
+    Args:
+        clock (Clock): O relógio a ser usado.
+
+    Returns:
+        Iterator[Clock]: O próprio relógio.
+    """
+    token = _current.set(clock)
+    try:
+        yield clock
+    finally:
+        _current.reset(token)
+
+
+def frozen_clock(moment: Optional[datetime] = None):
+    """
+    Para o relógio em uma data dentro de um bloco with.
+
+    Exemplo:
+        with frozen_clock(datetime(2030, 1, 1)):
+            report = generate_report(client)
+
+    Args:
+        moment (datetime, optional): Data do relógio. Padrão é a data atual.
+
+    Returns:
+        ContextManager[FrozenClock]: Gerenciador de contexto que retorna o relógio parado.
+    """
+    return use_clock(FrozenClock(moment))
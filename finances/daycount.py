@@ -0,0 +1,521 @@
+"""
+Convenções de contagem de dias e cronogramas de rendimento de investimentos.
+
+Uma convenção define quantos meses de rendimento há entre duas datas:
+
+- "30d": meses de 30 dias completos (a convenção original de Investment).
+- "30/360": meses completos no calendário 30E/360 (todo mês tem 30 dias).
+- "actual/365": dias corridos, capitalizados diariamente (dias * 12 / 365 meses).
+- "business/252": dias úteis, capitalizados diariamente (dias úteis * 12 / 252 meses),
+  com uma lista opcional de feriados.
+
+Um AccrualSchedule é calculado uma única vez por investimento (aplicação inicial e
+aportes periódicos) e indexado por data: a avaliação em uma data é uma busca
+binária nas datas do cronograma, seguida de no máximo uma potência.
+"""
+
+import bisect
+import calendar
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .ledger import from_micros, to_micros
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    """
+    Soma meses de calendário a uma data, mantendo o dia (limitado ao fim do mês).
+
+    Args:
+        moment (datetime): Data inicial.
+        months (int): Número de meses (pode ser negativo).
+
+    Returns:
+        datetime: A data no mesmo dia do mês de destino.
+    """
+    year, month = divmod(moment.month - 1 + months, 12)
+    year += moment.year
+    day = min(moment.day, calendar.monthrange(year, month + 1)[1])
+    return moment.replace(year=year, month=month + 1, day=day)
+
+
+def _midnight(moment: datetime) -> datetime:
+    """
+    Retorna o início do dia de uma data.
+    """
+    return datetime.combine(moment.date(), time(), moment.tzinfo)
+
+
+class DayCount:
+    """
+    Convenção de contagem de dias.
+
+    Convenções discretas rendem por meses completos: cada data tem uma posição
+    (position()) em uma escala em que todo mês tem span unidades, e os meses entre
+    duas datas são a diferença das posições dividida por span, arredondada para
+    baixo. As demais convenções rendem por dia, proporcionalmente a ordinal().
+
+    Atributos:
+        name (str): Nome da convenção.
+        discrete (bool): Se o rendimento é por meses completos.
+        span (int): Unidades de posição por mês (convenções discretas).
+        unit (float): Meses de rendimento por dia contado (convenções diárias).
+    """
+
+    name: str = ""
+    discrete: bool = True
+    span: int = 0
+    unit: float = 0.0
+
+    def periods(self, start: datetime, end: datetime) -> float:
+        """
+        Calcula os meses de rendimento entre duas datas.
+
+        Args:
+            start (datetime): Data inicial.
+            end (datetime): Data final.
+
+        Returns:
+            float: Meses de rendimento (inteiro nas convenções discretas).
+        """
+        if self.discrete:
+            return (self.position(end) - self.position(start)) // self.span
+        return (self.ordinal(end) - self.ordinal(start)) * self.unit
+
+    def position(self, moment: datetime) -> int:
+        """
+        Retorna a posição de uma data na escala da convenção (convenções discretas).
+
+        Args:
+            moment (datetime): A data.
+
+        Returns:
+            int: A posição da data.
+        """
+        raise NotImplementedError
+
+    def moment(self, position: int) -> datetime:
+        """
+        Retorna a primeira data com posição maior ou igual à informada (convenções discretas).
+
+        Args:
+            position (int): A posição.
+
+        Returns:
+            datetime: A data.
+        """
+        raise NotImplementedError
+
+    def boundary(self, position: int) -> int:
+        """
+        Retorna moment(position) em microssegundos desde a época (convenções discretas).
+
+        Args:
+            position (int): A posição.
+
+        Returns:
+            int: A data, em microssegundos.
+        """
+        return to_micros(self.moment(position))
+
+    def step(self, start: datetime, months: int) -> datetime:
+        """
+        Retorna a data em que se completam months meses desde start (convenções discretas).
+
+        Args:
+            start (datetime): Data inicial.
+            months (int): Número de meses.
+
+        Returns:
+            datetime: A primeira data com periods(start, data) >= months.
+        """
+        return self.moment(self.position(start) + months * self.span)
+
+    def ordinal(self, moment: datetime) -> int:
+        """
+        Retorna o número do dia de uma data na contagem da convenção (convenções diárias).
+
+        Args:
+            moment (datetime): A data.
+
+        Returns:
+            int: Dias contados até a data, inclusive.
+        """
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+    def __reduce_ex__(self, protocol: int):
+        # Cópias (pickle, copy) das convenções predefinidas voltam a ser a mesma instância
+        if CONVENTIONS.get(self.name) is self:
+            return get_convention, (self.name,)
+        return super().__reduce_ex__(protocol)
+
+
+class ThirtyDayMonths(DayCount):
+    """
+    Meses de 30 dias completos desde a compra (convenção "30d").
+    """
+
+    name = "30d"
+    span = 30 * 86_400_000_000
+
+    def position(self, moment: datetime) -> int:
+        return to_micros(moment)
+
+    def moment(self, position: int) -> datetime:
+        return from_micros(position)
+
+    def boundary(self, position: int) -> int:
+        return position
+
+
+class Thirty360(DayCount):
+    """
+    Meses completos no calendário 30E/360 (convenção "30/360").
+
+    Os dias 31 contam como dia 30, e cada mês tem 30 dias; o mês se completa à
+    meia-noite do dia correspondente ao da compra.
+    """
+
+    name = "30/360"
+    span = 30
+
+    def position(self, moment: datetime) -> int:
+        # Dias no calendário 30/360 desde 01/01/0000
+        return 360 * moment.year + 30 * (moment.month - 1) + min(moment.day, 30) - 1
+
+    def moment(self, position: int) -> datetime:
+        year, rest = divmod(position, 360)
+        month, day = divmod(rest, 30)
+        if day >= calendar.monthrange(year, month + 1)[1]:
+            # O dia não existe no mês (por exemplo, 30 de fevereiro): a posição é alcançada no dia 1º seguinte
+            return add_months(datetime(year, month + 1, 1), 1)
+        return datetime(year, month + 1, day + 1)
+
+
+class Actual365(DayCount):
+    """
+    Dias corridos, com capitalização diária (convenção "actual/365").
+    """
+
+    name = "actual/365"
+    discrete = False
+    unit = 12 / 365
+
+    def ordinal(self, moment: datetime) -> int:
+        return moment.toordinal()
+
+
+class Business252(DayCount):
+    """
+    Dias úteis (segunda a sexta, exceto feriados), com capitalização diária
+    (convenção "business/252").
+
+    Atributos:
+        holidays (Tuple[date, ...]): Feriados, em ordem crescente.
+    """
+
+    name = "business/252"
+    discrete = False
+    unit = 12 / 252
+
+    def __init__(self, holidays: Iterable[Union[date, datetime]] = ()) -> None:
+        """
+        Inicializa a convenção.
+
+        Args:
+            holidays (Iterable[date], optional): Feriados. Padrão é nenhum.
+        """
+        days = {day.date() if isinstance(day, datetime) else day for day in holidays}
+        self.holidays: Tuple[date, ...] = tuple(sorted(days))
+        self._holidays: List[int] = [day.toordinal() for day in self.holidays if day.weekday() < 5]
+
+    def ordinal(self, moment: datetime) -> int:
+        # O dia 1 (01/01/0001) é uma segunda-feira: conta os dias úteis de [1, moment]
+        weeks, rest = divmod(moment.toordinal(), 7)
+        return weeks * 5 + min(rest, 5) - bisect.bisect_right(self._holidays, moment.toordinal())
+
+
+CONVENTIONS: Dict[str, DayCount] = {
+    convention.name: convention
+    for convention in (ThirtyDayMonths(), Thirty360(), Actual365(), Business252())
+}
+
+# Convenção original de Investment.calculate_value
+DEFAULT_CONVENTION: DayCount = CONVENTIONS["30d"]
+
+
+def get_convention(convention: Union[str, DayCount]) -> DayCount:
+    """
+    Retorna a convenção de contagem de dias com o nome informado.
+
+    Args:
+        convention (str | DayCount): Nome da convenção ("30d", "30/360",
+            "actual/365" ou "business/252") ou a própria convenção.
+
+    Returns:
+        DayCount: A convenção.
+
+    Raises:
+        ValueError: Se a convenção for desconhecida.
+    """
+    if isinstance(convention, DayCount):
+        return convention
+    try:
+        return CONVENTIONS[convention]
+    except KeyError:
+        raise ValueError(f"Convenção de contagem de dias desconhecida: {convention!r}") from None
+
+
+class ContributionSchedule:
+    """
+    Aportes periódicos de um valor fixo em um investimento.
+
+    Atributos:
+        amount (float): Valor de cada aporte.
+        every_months (int): Intervalo, em meses de calendário, entre os aportes.
+        start (datetime | None): Data do primeiro aporte (None: every_months meses após a compra).
+        count (int | None): Número de aportes (None: sem limite).
+        end (datetime | None): Data limite dos aportes, inclusive (None: sem limite).
+    """
+
+    def __init__(
+        self,
+        amount: float,
+        every_months: int = 1,
+        start: Optional[datetime] = None,
+        count: Optional[int] = None,
+        end: Optional[datetime] = None
+    ) -> None:
+        """
+        Inicializa o cronograma de aportes.
+
+        Args:
+            amount (float): Valor de cada aporte.
+            every_months (int, optional): Meses entre os aportes. Padrão é 1.
+            start (datetime, optional): Data do primeiro aporte. Padrão é every_months meses após a compra.
+            count (int, optional): Número de aportes. Padrão é sem limite.
+            end (datetime, optional): Data limite dos aportes. Padrão é sem limite.
+
+        Raises:
+            ValueError: Se o intervalo não for positivo ou o número de aportes for negativo.
+        """
+        if every_months < 1:
+            raise ValueError("O intervalo entre os aportes deve ser positivo.")
+        if count is not None and count < 0:
+            raise ValueError("O número de aportes não pode ser negativo.")
+        self.amount: float = amount
+        self.every_months: int = every_months
+        self.start: Optional[datetime] = start
+        self.count: Optional[int] = count
+        self.end: Optional[datetime] = end
+
+    def dates(self, purchased: datetime, until: datetime) -> List[datetime]:
+        """
+        Retorna as datas dos aportes até uma data.
+
+        Args:
+            purchased (datetime): Data da compra do investimento.
+            until (datetime): Data limite, inclusive.
+
+        Returns:
+            List[datetime]: Datas dos aportes, em ordem crescente.
+        """
+        first = self.start if self.start is not None else add_months(purchased, self.every_months)
+        until = min(until, self.end) if self.end is not None else until
+        dates = []
+        while self.count is None or len(dates) < self.count:
+            moment = add_months(first, len(dates) * self.every_months)
+            if moment > until:
+                break
+            dates.append(moment)
+        return dates
+
+    def __repr__(self) -> str:
+        return (
+            f"ContributionSchedule({self.amount!r}, every_months={self.every_months!r}, "
+            f"start={self.start!r}, count={self.count!r}, end={self.end!r})"
+        )
+
+
+class AccrualSchedule:
+    """
+    Cronograma de rendimento de um investimento, indexado por data.
+
+    Nas convenções diárias, o valor em t é (1 + taxa) ** P(t) vezes a soma acumulada
+    dos fluxos (aplicação e aportes até t) descontados até a compra, de modo que a
+    avaliação é uma busca binária nas datas dos fluxos e uma potência. Nas
+    convenções discretas, o valor só muda quando um fluxo completa um mês: o
+    cronograma guarda as datas de mudança e o valor a partir de cada uma, até um
+    horizonte que é estendido quando necessário, e a avaliação é só a busca binária.
+    Os aportes também são incluídos até o horizonte.
+
+    O cronograma reflete o investimento no momento em que foi criado; o investimento
+    cria um novo cronograma quando é alterado.
+
+    Atributos:
+        convention (DayCount): Convenção de contagem de dias.
+        rate (float): Taxa mensal de retorno.
+        amount (float): Valor inicial investido.
+        purchased (datetime): Data da compra.
+        contributions (Tuple[ContributionSchedule, ...]): Aportes periódicos.
+    """
+
+    # Anos cobertos pelo primeiro cronograma (aportes e meses completados) além da data
+    # consultada; consultas posteriores ao horizonte refazem o cronograma, com o dobro do período
+    HORIZON_YEARS = 1
+
+    def __init__(
+        self,
+        convention: DayCount,
+        rate: float,
+        amount: float,
+        purchased: datetime,
+        contributions: Sequence[ContributionSchedule] = ()
+    ) -> None:
+        """
+        Inicializa o cronograma. As tabelas são calculadas na primeira avaliação.
+
+        Args:
+            convention (DayCount): Convenção de contagem de dias.
+            rate (float): Taxa mensal de retorno.
+            amount (float): Valor inicial investido.
+            purchased (datetime): Data da compra.
+            contributions (Sequence[ContributionSchedule], optional): Aportes periódicos. Padrão é nenhum.
+        """
+        self.convention: DayCount = convention
+        self.rate: float = rate
+        self.amount: float = amount
+        self.purchased: datetime = purchased
+        self.contributions: Tuple[ContributionSchedule, ...] = tuple(contributions)
+        # (horizonte, datas em microssegundos, valores ou somas acumuladas)
+        self._table: Optional[Tuple[datetime, List[int], List[float]]] = None
+
+    def _flows(self, until: datetime) -> List[Tuple[datetime, float]]:
+        """
+        Retorna a aplicação inicial e os aportes até uma data, em ordem cronológica.
+        """
+        flows = [(self.purchased, self.amount)]
+        for schedule in self.contributions:
+            flows.extend((moment, schedule.amount) for moment in schedule.dates(self.purchased, until))
+        flows.sort(key=lambda flow: flow[0])
+        return flows
+
+    def _build(self, horizon: datetime) -> Tuple[datetime, List[int], List[float]]:
+        """
+        Calcula as tabelas do cronograma até um horizonte.
+        """
+        flows = self._flows(horizon)
+        if not self.convention.discrete:
+            # Somas acumuladas dos fluxos descontados até a data da compra
+            base = 1 + self.rate
+            origin = self.convention.ordinal(self.purchased)
+            unit = self.convention.unit
+            sums, total = [], 0.0
+            for moment, amount in flows:
+                total += amount * base ** (-unit * (self.convention.ordinal(moment) - origin))
+                sums.append(total)
+            return horizon, [to_micros(moment) for moment, _ in flows], sums
+        # Fluxos com a mesma posição dentro do mês (posição % span) completam meses
+        # nas mesmas datas: cada grupo rende junto, e o cronograma percorre, em ordem,
+        # as entradas de fluxos e as datas em que cada grupo completa um mês.
+        convention, span = self.convention, self.convention.span
+        last = convention.position(horizon)
+        events = []
+        first: Dict[int, int] = {}
+        for moment, amount in flows:
+            position = convention.position(moment)
+            first.setdefault(position % span, position)
+            # Na mesma data, o mês completado vem antes da entrada do fluxo (ordem 0 < 1)
+            events.append((to_micros(moment), 1, position % span, amount))
+        for group, position in first.items():
+            events.extend(
+                (convention.boundary(boundary), 0, group, 0.0) for boundary in range(position + span, last + 1, span)
+            )
+        events.sort()
+        base = 1 + self.rate
+        groups = dict.fromkeys(first, 0.0)
+        micros, values, total = [], [], 0.0
+        for at, kind, group, amount in events:
+            if kind:
+                groups[group] += amount
+                total += amount
+            else:
+                total += groups[group] * self.rate
+                groups[group] *= base
+            if micros and micros[-1] == at:
+                values[-1] = total
+            else:
+                micros.append(at)
+                values.append(total)
+        return horizon, micros, values
+
+    def _table_for(self, now: datetime) -> Tuple[datetime, List[int], List[float]]:
+        """
+        Retorna as tabelas do cronograma, estendendo o horizonte se ele não cobrir a data.
+        """
+        table = self._table
+        if table is None or now > table[0]:
+            start = max(now, self.purchased)
+            horizon = add_months(start, 12 * self.HORIZON_YEARS)
+            if table is not None:
+                horizon = max(horizon, table[0] + (table[0] - self.purchased))
+            # A publicação da tupla é atômica: threads concorrentes calculam tabelas iguais
+            table = self._table = self._build(horizon)
+        return table
+
+    def valuation(self, now: datetime) -> Tuple[float, datetime, datetime]:
+        """
+        Retorna o valor em uma data e o período [início, fim) em que ele é válido.
+
+        Antes da compra, o valor é o valor inicial investido.
+
+        Args:
+            now (datetime): Data da avaliação.
+
+        Returns:
+            Tuple[float, datetime, datetime]: Valor, início e fim do período de validade.
+        """
+        horizon, micros, values = self._table_for(now)
+        index = bisect.bisect_right(micros, to_micros(now))
+        if index == 0:
+            return self.amount, datetime.min, from_micros(micros[0])
+        start = from_micros(micros[index - 1])
+        if index < len(micros):
+            end = from_micros(micros[index])
+        else:
+            # Mudanças após o horizonte ainda não foram calculadas
+            end = horizon + timedelta(microseconds=1)
+        if self.convention.discrete:
+            return values[index - 1], start, end
+        elapsed = self.convention.ordinal(now) - self.convention.ordinal(self.purchased)
+        value = values[index - 1] * (1 + self.rate) ** (self.convention.unit * elapsed)
+        # O valor muda a cada dia
+        day = _midnight(now)
+        return value, max(start, day), min(end, day + timedelta(days=1))
+
+    def value_at(self, now: datetime) -> float:
+        """
+        Retorna o valor em uma data.
+
+        Args:
+            now (datetime): Data da avaliação.
+
+        Returns:
+            float: Valor do investimento na data.
+        """
+        return self.valuation(now)[0]
+
+    def values_over(self, dates: Iterable[datetime]) -> List[float]:
+        """
+        Retorna o valor em várias datas.
+
+        Args:
+            dates (Iterable[datetime]): Datas da avaliação.
+
+        Returns:
+            List[float]: Valor em cada data.
+        """
+        return [self.valuation(now)[0] for now in dates]
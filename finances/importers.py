@@ -0,0 +1,429 @@
+"""
+Importação de extratos bancários (CSV e OFX) para contas e clientes.
+
+Os arquivos são lidos de forma incremental e as transações são gravadas em
+blocos com Account.add_transactions, de modo que a memória usada na leitura não
+depende do tamanho do arquivo. Categorias podem ser atribuídas por regras sobre a
+descrição, e transações já existentes na conta são ignoradas (deduplicação). A
+deduplicação consulta a conta apenas nas datas presentes no arquivo e guarda uma
+contagem por data, para no máximo DEDUPE_DATES datas ao mesmo tempo: em extratos
+ordenados por data, a memória não depende do tamanho do arquivo nem do histórico
+da conta.
+"""
+
+import csv
+import re
+from collections import Counter
+from datetime import datetime, timezone
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Pattern, Tuple, Union
+
+from .ledger import to_micros
+from .models import Account, Client
+
+Row = Tuple[Optional[str], float, str, str, datetime]
+
+# Máximo de datas com contagens de deduplicação em memória (as mais antigas são descartadas)
+DEDUPE_DATES = 1024
+
+DEFAULT_COLUMNS = {
+    "date": "date",
+    "amount": "amount",
+    "description": "description",
+    "category": "category",
+}
+
+
+class CategoryRules:
+    """
+    Regras para atribuir categorias às transações a partir da descrição.
+
+    Cada regra associa um padrão (expressão regular, sem diferenciar maiúsculas
+    de minúsculas) a uma categoria. A primeira regra que casar com a descrição
+    define a categoria.
+
+    Atributos:
+        rules (List[Tuple[Pattern, str]]): Padrões compilados e suas categorias.
+        default (str): Categoria usada quando nenhuma regra casa.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, str]] = None, default: str = "Uncategorized") -> None:
+        """
+        Inicializa as regras de categorização.
+
+        Args:
+            rules (Dict[str, str], optional): Padrões e categorias, na ordem de prioridade. Padrão é None.
+            default (str, optional): Categoria padrão. Padrão é "Uncategorized".
+        """
+        self.rules: List[Tuple[Pattern, str]] = [
+            (re.compile(pattern, re.IGNORECASE), category) for pattern, category in (rules or {}).items()
+        ]
+        self.default: str = default
+
+    def categorize(self, description: str, category: Optional[str] = None) -> str:
+        """
+        Retorna a categoria de uma transação.
+
+        Args:
+            description (str): Descrição da transação.
+            category (str, optional): Categoria informada no arquivo, usada se nenhuma regra casar.
+
+        Returns:
+            str: A categoria escolhida.
+        """
+        for pattern, rule_category in self.rules:
+            if pattern.search(description):
+                return rule_category
+        return category or self.default
+
+
+class ImportResult:
+    """
+    Resultado de uma importação.
+
+    Atributos:
+        rows (int): Linhas lidas do arquivo.
+        imported (int): Transações adicionadas.
+        duplicates (int): Linhas ignoradas por já existirem na conta.
+    """
+
+    def __init__(self) -> None:
+        """
+        Inicializa um resultado vazio.
+        """
+        self.rows: int = 0
+        self.imported: int = 0
+        self.duplicates: int = 0
+
+    def __str__(self) -> str:
+        """
+        Retorna uma representação textual do resultado.
+
+        Returns:
+            str: Resumo da importação.
+        """
+        return f"Importação: {self.rows} linhas, {self.imported} importadas, {self.duplicates} duplicadas"
+
+
+def parse_amount(text: str, decimal: str = ".") -> float:
+    """
+    Converte um valor textual em número.
+
+    Args:
+        text (str): Valor, por exemplo "1234.56", "-1.234,56" ou "R$ 10,00".
+        decimal (str, optional): Separador decimal. Padrão é ".".
+
+    Returns:
+        float: O valor convertido.
+
+    Raises:
+        ValueError: Se o texto não for um valor válido.
+    """
+    text = text.strip().replace("R$", "").replace(" ", "")
+    if decimal == ",":
+        text = text.replace(".", "").replace(",", ".")
+    else:
+        text = text.replace(",", "")
+    return float(text)
+
+
+ISO_FORMATS = {"%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S"}
+
+
+def _date_parser(date_format: str):
+    """
+    Retorna uma função que converte textos no formato informado em datas.
+
+    Formatos ISO usam datetime.fromisoformat, bem mais rápido que strptime. Como
+    linhas consecutivas de um extrato costumam ter a mesma data, a última
+    conversão é reaproveitada. Datas com fuso horário (aceitas por fromisoformat
+    ou por %z) são convertidas para UTC sem fuso, como as demais datas do pacote.
+    """
+    convert = datetime.fromisoformat if date_format in ISO_FORMATS else (
+        lambda text: datetime.strptime(text, date_format)
+    )
+    last: List = [None, None]
+
+    def parse(text: str) -> datetime:
+        if text != last[0]:
+            date = convert(text)
+            if date.tzinfo is not None:
+                date = date.astimezone(timezone.utc).replace(tzinfo=None)
+            last[0], last[1] = text, date
+        return last[1]
+
+    return parse
+
+
+def read_csv(
+    stream: IO[str],
+    columns: Optional[Dict[str, str]] = None,
+    date_format: str = "%Y-%m-%d",
+    decimal: str = ".",
+    delimiter: str = ","
+) -> Iterator[Row]:
+    """
+    Lê um extrato CSV linha a linha.
+
+    Args:
+        stream (IO[str]): Arquivo CSV aberto em modo texto, com cabeçalho.
+        columns (Dict[str, str], optional): Nome da coluna do arquivo para cada campo
+            ("date", "amount", "description", "category" e, opcionalmente, "account").
+            Padrão é DEFAULT_COLUMNS.
+        date_format (str, optional): Formato das datas. Padrão é "%Y-%m-%d".
+        decimal (str, optional): Separador decimal dos valores. Padrão é ".".
+        delimiter (str, optional): Separador de colunas. Padrão é ",".
+
+    Returns:
+        Iterator[Row]: Tuplas (conta, valor, categoria, descrição, data).
+    """
+    columns = {**DEFAULT_COLUMNS, **(columns or {})}
+    reader = csv.reader(stream, delimiter=delimiter)
+    header = next(reader, None)
+    if header is None:
+        return
+    positions = {name: i for i, name in enumerate(header)}
+    try:
+        date_at = positions[columns["date"]]
+        amount_at = positions[columns["amount"]]
+    except KeyError as error:
+        raise ValueError(f"Coluna obrigatória ausente no CSV: {error.args[0]}") from None
+    description_at = positions.get(columns["description"])
+    category_at = positions.get(columns["category"])
+    account_at = positions.get(columns["account"]) if "account" in columns else None
+    parse_date = _date_parser(date_format)
+    for line in reader:
+        if not line:
+            continue
+        yield (
+            line[account_at] if account_at is not None else None,
+            parse_amount(line[amount_at], decimal),
+            line[category_at] if category_at is not None else "",
+            line[description_at] if description_at is not None else "",
+            parse_date(line[date_at])
+        )
+
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def parse_ofx_date(text: str) -> datetime:
+    """
+    Converte uma data no formato OFX (AAAAMMDD[HHMMSS[.XXX]][[fuso]]) em datetime.
+
+    Args:
+        text (str): Data no formato OFX.
+
+    Returns:
+        datetime: A data convertida (sem fuso horário).
+    """
+    digits = text.strip().split("[")[0].split(".")[0]
+    return datetime.strptime(digits[:14], "%Y%m%d%H%M%S" if len(digits) >= 14 else "%Y%m%d")
+
+
+def read_ofx(stream: IO[str]) -> Iterator[Row]:
+    """
+    Lê as transações (blocos STMTTRN) de um extrato OFX, nos formatos SGML ou XML.
+
+    São usados os campos DTPOSTED, TRNAMT, NAME e MEMO; os demais são ignorados.
+
+    Args:
+        stream (IO[str]): Arquivo OFX aberto em modo texto.
+
+    Returns:
+        Iterator[Row]: Tuplas (conta, valor, categoria, descrição, data).
+    """
+    fields: Optional[Dict[str, str]] = None
+    for line in stream:
+        for closing, tag, value in _OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if not closing:
+                    fields = {}
+                elif fields is not None:
+                    description = fields.get("NAME") or fields.get("MEMO", "")
+                    memo = fields.get("MEMO")
+                    if memo and fields.get("NAME") and memo != fields["NAME"]:
+                        description = f"{description} {memo}"
+                    yield (
+                        None,
+                        parse_amount(fields["TRNAMT"], "," if "," in fields["TRNAMT"] else "."),
+                        "",
+                        description,
+                        parse_ofx_date(fields["DTPOSTED"])
+                    )
+                    fields = None
+            elif fields is not None and not closing and value.strip():
+                fields[tag] = value.strip()
+
+
+def _dedupe_key(amount: float, description: str, date: datetime) -> Tuple[int, int, str]:
+    """
+    Chave usada para identificar transações repetidas.
+    """
+    return (to_micros(date), round(amount * 100), description)
+
+
+def import_rows(
+    target: Union[Account, Client],
+    rows: Iterable[Row],
+    rules: Optional[CategoryRules] = None,
+    account_name: Optional[str] = None,
+    dedupe: bool = True,
+    chunk_size: int = 10_000
+) -> ImportResult:
+    """
+    Grava linhas lidas de um extrato em uma conta ou cliente, em blocos.
+
+    Cada bloco é gravado de forma atômica com add_transactions. Com deduplicação,
+    uma linha é ignorada se a conta já tiver uma transação com a mesma data, valor
+    e descrição (linhas iguais no arquivo só são ignoradas até o número de cópias
+    já existentes, então reimportar o mesmo arquivo não duplica nada). As
+    transações existentes são consultadas por data (get_transactions, com o índice
+    por data da conta), na primeira linha de cada data do arquivo.
+
+    As contagens ficam em memória para no máximo DEDUPE_DATES datas; a mais antiga
+    é descartada quando uma nova data aparece. Em extratos ordenados por data, uma
+    data descartada não volta a aparecer. Em extratos fora de ordem, uma data
+    descartada é consultada de novo, ignorando as transações gravadas pela própria
+    importação; apenas cópias repetidas da mesma linha, separadas por mais de
+    DEDUPE_DATES datas, podem então ser comparadas outra vez com a mesma
+    transação existente.
+
+    Args:
+        target (Account | Client): Conta ou cliente de destino.
+        rows (Iterable[Row]): Linhas (conta, valor, categoria, descrição, data).
+        rules (CategoryRules, optional): Regras de categorização. Padrão é None.
+        account_name (str, optional): Conta do cliente usada para linhas sem conta. Padrão é None.
+        dedupe (bool, optional): Se deve ignorar transações já existentes. Padrão é True.
+        chunk_size (int, optional): Linhas gravadas por bloco. Padrão é 10.000.
+
+    Returns:
+        ImportResult: Contagem de linhas lidas, importadas e duplicadas.
+
+    Raises:
+        ValueError: Se o destino for um cliente e uma linha não indicar a conta.
+    """
+    rules = rules or CategoryRules()
+    result = ImportResult()
+    # Contagem das transações existentes, por conta e data do arquivo (da mais antiga à mais recente)
+    existing: Dict[Tuple[Optional[str], datetime], Counter] = {}
+    # Transações de cada conta antes da importação; as seguintes foram gravadas por ela
+    known: Dict[Optional[str], int] = {}
+    chunk: Dict[Optional[str], List[tuple]] = {}
+    pending = 0
+
+    def seen(name: Optional[str], date: datetime) -> Counter:
+        counter = existing.get((name, date))
+        if counter is None:
+            account = target if isinstance(target, Account) else target.get_account(name)
+            count = known.setdefault(name, len(account.transactions) if account is not None else 0)
+            matches = account.get_transactions(start_date=date, end_date=date) if account is not None else ()
+            counter = Counter(_dedupe_key(t.amount, t.description, t.date) for t in matches if t._position < count)
+            if len(existing) >= DEDUPE_DATES:
+                del existing[next(iter(existing))]
+            existing[name, date] = counter
+        return counter
+
+    def flush() -> None:
+        if isinstance(target, Account):
+            target.add_transactions(chunk.pop(None, []))
+        else:
+            target.add_transactions(chunk)
+        chunk.clear()
+
+    for name, amount, category, description, date in rows:
+        result.rows += 1
+        if isinstance(target, Client):
+            name = name or account_name
+            if name is None:
+                raise ValueError("Informe account_name ou a coluna 'account' para importar em um cliente.")
+        else:
+            name = None
+        if dedupe:
+            counter = seen(name, date)
+            key = _dedupe_key(amount, description, date)
+            if counter[key] > 0:
+                counter[key] -= 1
+                result.duplicates += 1
+                continue
+        chunk.setdefault(name, []).append((amount, rules.categorize(description, category), description, date))
+        result.imported += 1
+        pending += 1
+        if pending >= chunk_size:
+            flush()
+            pending = 0
+    if pending:
+        flush()
+    return result
+
+
+def import_csv(
+    target: Union[Account, Client],
+    source: Union[str, IO[str]],
+    columns: Optional[Dict[str, str]] = None,
+    rules: Optional[CategoryRules] = None,
+    account_name: Optional[str] = None,
+    date_format: str = "%Y-%m-%d",
+    decimal: str = ".",
+    delimiter: str = ",",
+    encoding: str = "utf-8-sig",
+    dedupe: bool = True,
+    chunk_size: int = 10_000
+) -> ImportResult:
+    """
+    Importa um extrato CSV para uma conta ou cliente.
+
+    Args:
+        target (Account | Client): Conta ou cliente de destino.
+        source (str | IO[str]): Caminho do arquivo ou arquivo aberto em modo texto.
+        columns (Dict[str, str], optional): Mapeamento de campos para colunas (veja read_csv).
+        rules (CategoryRules, optional): Regras de categorização. Padrão é None.
+        account_name (str, optional): Conta do cliente usada para linhas sem conta. Padrão é None.
+        date_format (str, optional): Formato das datas. Padrão é "%Y-%m-%d".
+        decimal (str, optional): Separador decimal dos valores. Padrão é ".".
+        delimiter (str, optional): Separador de colunas. Padrão é ",".
+        encoding (str, optional): Codificação do arquivo. Padrão é "utf-8-sig" (UTF-8,
+            ignorando a marca de ordem de bytes que algumas planilhas gravam no início).
+        dedupe (bool, optional): Se deve ignorar transações já existentes. Padrão é True.
+        chunk_size (int, optional): Linhas gravadas por bloco. Padrão é 10.000.
+
+    Returns:
+        ImportResult: Contagem de linhas lidas, importadas e duplicadas.
+    """
+    if isinstance(source, str):
+        with open(source, newline="", encoding=encoding) as stream:
+            return import_csv(
+                target, stream, columns, rules, account_name, date_format, decimal, delimiter, encoding, dedupe, chunk_size
+            )
+    rows = read_csv(source, columns, date_format, decimal, delimiter)
+    return import_rows(target, rows, rules, account_name, dedupe, chunk_size)
+
+
+def import_ofx(
+    target: Union[Account, Client],
+    source: Union[str, IO[str]],
+    rules: Optional[CategoryRules] = None,
+    account_name: Optional[str] = None,
+    encoding: str = "latin-1",
+    dedupe: bool = True,
+    chunk_size: int = 10_000
+) -> ImportResult:
+    """
+    Importa um extrato OFX para uma conta ou cliente.
+
+    Args:
+        target (Account | Client): Conta ou cliente de destino.
+        source (str | IO[str]): Caminho do arquivo ou arquivo aberto em modo texto.
+        rules (CategoryRules, optional): Regras de categorização. Padrão é None.
+        account_name (str, optional): Conta do cliente de destino. Padrão é None.
+        encoding (str, optional): Codificação do arquivo. Padrão é "latin-1".
+        dedupe (bool, optional): Se deve ignorar transações já existentes. Padrão é True.
+        chunk_size (int, optional): Linhas gravadas por bloco. Padrão é 10.000.
+
+    Returns:
+        ImportResult: Contagem de linhas lidas, importadas e duplicadas.
+    """
+    if isinstance(source, str):
+        with open(source, encoding=encoding) as stream:
+            return import_ofx(target, stream, rules, account_name, encoding, dedupe, chunk_size)
+    return import_rows(target, read_ofx(source), rules, account_name, dedupe, chunk_size)
@@ -0,0 +1,586 @@
+"""
+Índices mantidos pelas contas para acelerar consultas sobre as transações.
+
+- DateIndex: posições das transações ordenadas por data, para consultas por período.
+- BalanceIndex: DateIndex com os valores e as somas acumuladas, para saldos históricos.
+- CategoryIndex: posições, totais e contagens das transações por categoria.
+- TextIndex: índice invertido das palavras das descrições das transações.
+"""
+
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+_WORD = re.compile(r"\w+")
+
+
+class DateIndex:
+    """
+    Índice das transações de uma conta ordenado por data.
+
+    Mantém as datas (em microssegundos) em ordem crescente, com as posições das
+    transações no ledger em um array paralelo. Consultas por período usam busca
+    binária e custam O(log n + k).
+
+    Atributos:
+        timestamps (array): Datas das transações, em ordem crescente.
+        positions (array): Posições das transações no ledger, na mesma ordem.
+        ordered (bool): Se o ledger está em ordem cronológica (positions[i] == i). Nesse
+            caso, as posições de um intervalo [lo, hi) são range(lo, hi).
+    """
+
+    def __init__(self) -> None:
+        """
+        Inicializa um índice vazio.
+        """
+        self.timestamps: array = array("q")
+        self.positions: array = array("q")
+        self.ordered: bool = True
+
+    @classmethod
+    def build(cls, timestamps: Sequence[int]) -> "DateIndex":
+        """
+        Constrói o índice a partir das datas de todas as transações de um ledger.
+
+        Args:
+            timestamps (Sequence[int]): Datas em microssegundos, indexadas pela posição no ledger.
+
+        Returns:
+            DateIndex: O índice construído.
+        """
+        index = cls()
+        order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+        index.positions = array("q", order)
+        index.timestamps = array("q", (timestamps[p] for p in order))
+        index.ordered = order == list(range(len(order)))
+        return index
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def _locate(self, timestamp: int, position: int) -> int:
+        """
+        Retorna o índice onde o par (data, posição) está ou deveria estar.
+        """
+        lo = bisect_left(self.timestamps, timestamp)
+        hi = bisect_right(self.timestamps, timestamp, lo)
+        return bisect_left(self.positions, position, lo, hi)
+
+    def _appending(self, positions: Sequence[int]) -> None:
+        """
+        Atualiza ordered antes de anexar posições (em ordem crescente) ao índice.
+        """
+        first = len(self.positions)
+        self.ordered = self.ordered and positions[0] == first and positions[-1] == first + len(positions) - 1
+
+    def insert(self, timestamp: int, position: int) -> None:
+        """
+        Insere uma transação no índice.
+
+        Inserções em ordem cronológica são O(1) amortizado; inserções fora de ordem
+        deslocam os elementos posteriores.
+
+        Args:
+            timestamp (int): Data da transação, em microssegundos.
+            position (int): Posição da transação no ledger.
+        """
+        if not self.timestamps or timestamp > self.timestamps[-1]:
+            self._appending((position,))
+            self.timestamps.append(timestamp)
+            self.positions.append(position)
+            return
+        i = self._locate(timestamp, position)
+        self.timestamps.insert(i, timestamp)
+        self.positions.insert(i, position)
+        # Uma data igual à última também é anexada ao final
+        self.ordered = self.ordered and i == position == len(self.positions) - 1
+
+    def extend(self, timestamps: Sequence[int], positions: Sequence[int]) -> None:
+        """
+        Insere várias transações no índice de uma só vez.
+
+        Se as novas datas estiverem em ordem e forem posteriores às existentes, elas
+        são apenas anexadas; caso contrário, o índice é reordenado uma única vez.
+
+        Args:
+            timestamps (Sequence[int]): Datas das transações, em microssegundos.
+            positions (Sequence[int]): Posições das transações no ledger, em ordem crescente.
+        """
+        in_order = all(a <= b for a, b in zip(timestamps, timestamps[1:]))
+        if in_order and (not self.timestamps or not timestamps or timestamps[0] > self.timestamps[-1]):
+            if timestamps:
+                self._appending(positions)
+            self.timestamps.extend(timestamps)
+            self.positions.extend(positions)
+            return
+        merged = sorted(zip(list(self.timestamps) + list(timestamps), list(self.positions) + list(positions)))
+        self.timestamps = array("q", (timestamp for timestamp, _ in merged))
+        self.positions = array("q", (position for _, position in merged))
+        self.ordered = self.positions == array("q", range(len(self.positions)))
+
+    def remove(self, timestamp: int, position: int) -> None:
+        """
+        Remove uma transação do índice.
+
+        Args:
+            timestamp (int): Data da transação registrada no índice, em microssegundos.
+            position (int): Posição da transação no ledger.
+
+        Raises:
+            KeyError: Se a transação não estiver no índice.
+        """
+        i = self._locate(timestamp, position)
+        if i == len(self.positions) or self.positions[i] != position or self.timestamps[i] != timestamp:
+            raise KeyError((timestamp, position))
+        # Remover a última transação mantém a ordem; as demais deixam uma posição vaga
+        self.ordered = self.ordered and i == len(self.positions) - 1
+        del self.timestamps[i]
+        del self.positions[i]
+
+    def span(self, start: Optional[int] = None, end: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Retorna o intervalo [lo, hi) do índice com datas entre start e end (inclusive).
+
+        Args:
+            start (int, optional): Data inicial, em microssegundos. Padrão é None.
+            end (int, optional): Data final, em microssegundos. Padrão é None.
+
+        Returns:
+            Tuple[int, int]: Limites do intervalo em timestamps/positions.
+        """
+        lo = 0 if start is None else bisect_left(self.timestamps, start)
+        hi = len(self.timestamps) if end is None else bisect_right(self.timestamps, end)
+        return lo, max(lo, hi)
+
+
+class BalanceIndex(DateIndex):
+    """
+    Índice de saldos: as transações ordenadas por data, com seus valores e as somas
+    acumuladas (somas prefixadas) desses valores.
+
+    A soma das transações até uma data é uma busca binária. As somas acumuladas são
+    calculadas sob demanda: inclusões em ordem cronológica apenas as estendem, e
+    inclusões ou remoções no meio do índice descartam as somas a partir do ponto
+    alterado, que são refeitas (em uma única passada) na consulta seguinte que
+    precisar delas. Alterações de valor ficam pendentes, somadas às consultas, até
+    que haja mais de MAX_PENDING delas.
+
+    Atributos:
+        timestamps (array): Datas das transações, em ordem crescente.
+        positions (array): Posições das transações no ledger, na mesma ordem.
+        amounts (array): Valores das transações, na mesma ordem.
+    """
+
+    # Máximo de alterações de valor pendentes antes de as somas serem refeitas
+    MAX_PENDING = 64
+
+    def __init__(self) -> None:
+        """
+        Inicializa um índice vazio.
+        """
+        super().__init__()
+        self.amounts: array = array("d")
+        # _sums[i] é a soma de amounts[0..i], sem as alterações pendentes; vale para as
+        # primeiras len(_sums) posições
+        self._sums: array = array("d")
+        # Alterações de valor (índice, diferença) ainda não incluídas em _sums
+        self._pending: List[Tuple[int, float]] = []
+
+    @classmethod
+    def build(cls, timestamps: Sequence[int], amounts: Sequence[float] = ()) -> "BalanceIndex":
+        """
+        Constrói o índice a partir das datas e valores de todas as transações de um ledger.
+
+        Args:
+            timestamps (Sequence[int]): Datas em microssegundos, indexadas pela posição no ledger.
+            amounts (Sequence[float]): Valores, indexados pela posição no ledger.
+
+        Returns:
+            BalanceIndex: O índice construído.
+        """
+        index = super().build(timestamps)
+        index.amounts = array("d", (amounts[p] for p in index.positions))
+        return index
+
+    def _discard_sums(self, i: int) -> None:
+        """
+        Descarta as somas acumuladas a partir do índice i.
+        """
+        if i < len(self._sums):
+            del self._sums[i:]
+            self._pending = [(j, delta) for j, delta in self._pending if j < i]
+
+    def insert(self, timestamp: int, position: int, amount: float = 0.0) -> None:
+        """
+        Insere uma transação no índice.
+
+        Args:
+            timestamp (int): Data da transação, em microssegundos.
+            position (int): Posição da transação no ledger.
+            amount (float, optional): Valor da transação. Padrão é 0.0.
+        """
+        if not self.timestamps or timestamp > self.timestamps[-1]:
+            self._appending((position,))
+            if len(self._sums) == len(self.amounts):
+                self._sums.append((self._sums[-1] if self._sums else 0.0) + amount)
+            self.timestamps.append(timestamp)
+            self.positions.append(position)
+            self.amounts.append(amount)
+            return
+        i = self._locate(timestamp, position)
+        self.timestamps.insert(i, timestamp)
+        self.positions.insert(i, position)
+        # Uma data igual à última também é anexada ao final
+        self.ordered = self.ordered and i == position == len(self.positions) - 1
+        self.amounts.insert(i, amount)
+        self._discard_sums(i)
+
+    def extend(self, timestamps: Sequence[int], positions: Sequence[int], amounts: Sequence[float] = ()) -> None:
+        """
+        Insere várias transações no índice de uma só vez.
+
+        Args:
+            timestamps (Sequence[int]): Datas das transações, em microssegundos.
+            positions (Sequence[int]): Posições das transações no ledger, em ordem crescente.
+            amounts (Sequence[float]): Valores das transações.
+        """
+        in_order = all(a <= b for a, b in zip(timestamps, timestamps[1:]))
+        if in_order and (not self.timestamps or not timestamps or timestamps[0] > self.timestamps[-1]):
+            if timestamps:
+                self._appending(positions)
+            self.timestamps.extend(timestamps)
+            self.positions.extend(positions)
+            self.amounts.extend(amounts)
+            return
+        merged = sorted(zip(
+            list(self.timestamps) + list(timestamps),
+            list(self.positions) + list(positions),
+            list(self.amounts) + list(amounts)
+        ))
+        self.timestamps = array("q", (timestamp for timestamp, _, _ in merged))
+        self.positions = array("q", (position for _, position, _ in merged))
+        self.amounts = array("d", (amount for _, _, amount in merged))
+        self.ordered = self.positions == array("q", range(len(self.positions)))
+        self._discard_sums(0)
+
+    def remove(self, timestamp: int, position: int) -> None:
+        """
+        Remove uma transação do índice.
+
+        Args:
+            timestamp (int): Data da transação registrada no índice, em microssegundos.
+            position (int): Posição da transação no ledger.
+
+        Raises:
+            KeyError: Se a transação não estiver no índice.
+        """
+        i = self._locate(timestamp, position)
+        super().remove(timestamp, position)
+        del self.amounts[i]
+        self._discard_sums(i)
+
+    def adjust(self, timestamp: int, position: int, delta: float) -> None:
+        """
+        Ajusta o valor de uma transação do índice.
+
+        Args:
+            timestamp (int): Data da transação registrada no índice, em microssegundos.
+            position (int): Posição da transação no ledger.
+            delta (float): Diferença entre o novo e o antigo valor.
+
+        Raises:
+            KeyError: Se a transação não estiver no índice.
+        """
+        i = self._locate(timestamp, position)
+        if i == len(self.positions) or self.positions[i] != position or self.timestamps[i] != timestamp:
+            raise KeyError((timestamp, position))
+        self.amounts[i] += delta
+        if i < len(self._sums):
+            self._pending.append((i, delta))
+            if len(self._pending) > self.MAX_PENDING:
+                self._discard_sums(min(j for j, _ in self._pending))
+
+    def _sum(self, count: int) -> float:
+        """
+        Retorna a soma dos count primeiros valores, estendendo as somas acumuladas se necessário.
+        """
+        if count <= 0:
+            return 0.0
+        sums = self._sums
+        if len(sums) < count:
+            total = sums[-1] if sums else 0.0
+            sums.extend(islice(accumulate(self.amounts[len(sums):count], initial=total), 1, None))
+        total = sums[count - 1]
+        for i, delta in self._pending:
+            if i < count:
+                total += delta
+        return total
+
+    def total(self) -> float:
+        """
+        Retorna a soma dos valores de todas as transações do índice.
+
+        Returns:
+            float: A soma dos valores.
+        """
+        return self._sum(len(self.amounts))
+
+    def total_until(self, timestamp: int) -> float:
+        """
+        Retorna a soma dos valores das transações até uma data (inclusive).
+
+        Args:
+            timestamp (int): Data limite, em microssegundos.
+
+        Returns:
+            float: A soma dos valores.
+        """
+        return self._sum(bisect_right(self.timestamps, timestamp))
+
+    def totals_until(self, timestamps: Iterable[int]) -> Iterator[float]:
+        """
+        Percorre as somas até várias datas em ordem crescente, avançando pelo índice
+        sem recomeçar a busca a cada data.
+
+        O índice não deve ser alterado enquanto o iterador é consumido.
+
+        Args:
+            timestamps (Iterable[int]): Datas limite, em microssegundos, em ordem crescente.
+
+        Returns:
+            Iterator[float]: A soma dos valores até cada data.
+        """
+        lo = 0
+        for timestamp in timestamps:
+            lo = bisect_right(self.timestamps, timestamp, lo)
+            yield self._sum(lo)
+
+
+class CategoryIndex:
+    """
+    Índice secundário das transações de uma conta por categoria.
+
+    Para cada categoria guarda as posições das transações no ledger (em ordem
+    crescente), além do total e da quantidade de transações, atualizados a cada
+    alteração para que os resumos por categoria custem O(1).
+
+    Atributos:
+        positions (Dict[str, array]): Posições das transações por categoria.
+        totals (Dict[str, float]): Soma dos valores por categoria.
+        counts (Dict[str, int]): Quantidade de transações por categoria.
+    """
+
+    def __init__(self) -> None:
+        """
+        Inicializa um índice vazio.
+        """
+        self.positions: Dict[str, array] = {}
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    @classmethod
+    def build(cls, entries: Iterable[Tuple[str, float]]) -> "CategoryIndex":
+        """
+        Constrói o índice a partir das transações de um ledger.
+
+        Args:
+            entries (Iterable[Tuple[str, float]]): Pares (categoria, valor), na ordem do ledger.
+
+        Returns:
+            CategoryIndex: O índice construído.
+        """
+        index = cls()
+        for position, (category, amount) in enumerate(entries):
+            index.add(category, amount, position)
+        return index
+
+    def add(self, category: str, amount: float, position: int) -> None:
+        """
+        Adiciona uma transação ao índice.
+
+        Args:
+            category (str): Categoria da transação.
+            amount (float): Valor da transação.
+            position (int): Posição da transação no ledger.
+        """
+        positions = self.positions.get(category)
+        if positions is None:
+            positions = self.positions[category] = array("q")
+            self.totals[category] = 0.0
+            self.counts[category] = 0
+        if not positions or position > positions[-1]:
+            positions.append(position)
+        else:
+            positions.insert(bisect_left(positions, position), position)
+        self.totals[category] += amount
+        self.counts[category] += 1
+
+    def remove(self, category: str, amount: float, position: int) -> None:
+        """
+        Remove uma transação do índice.
+
+        Args:
+            category (str): Categoria registrada para a transação.
+            amount (float): Valor registrado para a transação.
+            position (int): Posição da transação no ledger.
+
+        Raises:
+            KeyError: Se a transação não estiver no índice.
+        """
+        positions = self.positions.get(category)
+        i = bisect_left(positions, position) if positions is not None else 0
+        if positions is None or i == len(positions) or positions[i] != position:
+            raise KeyError((category, position))
+        del positions[i]
+        self.counts[category] -= 1
+        if self.counts[category]:
+            self.totals[category] -= amount
+        else:
+            del self.positions[category]
+            del self.totals[category]
+            del self.counts[category]
+
+    def adjust(self, category: str, delta: float) -> None:
+        """
+        Ajusta o total de uma categoria após a alteração do valor de uma transação.
+
+        Args:
+            category (str): Categoria da transação.
+            delta (float): Diferença entre o novo e o antigo valor.
+        """
+        self.totals[category] += delta
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Separa um texto em palavras normalizadas (minúsculas e sem acentos).
+
+    Exemplo:
+        tokenize("Supermercado São João") == ["supermercado", "sao", "joao"]
+
+    Args:
+        text (str): Texto a ser separado.
+
+    Returns:
+        List[str]: As palavras, na ordem do texto.
+    """
+    normalized = unicodedata.normalize("NFKD", text.casefold())
+    return _WORD.findall("".join(c for c in normalized if not unicodedata.combining(c)))
+
+
+class TextIndex:
+    """
+    Índice invertido das descrições das transações de uma conta.
+
+    Para cada palavra normalizada (ver tokenize) guarda as posições, em ordem
+    crescente, das transações cuja descrição a contém. Uma busca percorre apenas
+    as posições da palavra menos frequente e custa O(k log n).
+
+    Atributos:
+        positions (Dict[str, array]): Posições das transações por palavra.
+    """
+
+    def __init__(self) -> None:
+        """
+        Inicializa um índice vazio.
+        """
+        self.positions: Dict[str, array] = {}
+
+    @classmethod
+    def build(cls, descriptions: Iterable[str]) -> "TextIndex":
+        """
+        Constrói o índice a partir das descrições das transações de um ledger.
+
+        Args:
+            descriptions (Iterable[str]): Descrições, na ordem do ledger.
+
+        Returns:
+            TextIndex: O índice construído.
+        """
+        index = cls()
+        positions = index.positions
+        # Descrições repetidas (comuns em extratos) são separadas em palavras uma única vez
+        words: Dict[str, Tuple[str, ...]] = {}
+        for position, description in enumerate(descriptions):
+            tokens = words.get(description)
+            if tokens is None:
+                tokens = words[description] = tuple(dict.fromkeys(tokenize(description)))
+            for token in tokens:
+                token_positions = positions.get(token)
+                if token_positions is None:
+                    token_positions = positions[token] = array("q")
+                token_positions.append(position)
+        return index
+
+    def add(self, description: str, position: int) -> None:
+        """
+        Adiciona a descrição de uma transação ao índice.
+
+        Args:
+            description (str): Descrição da transação.
+            position (int): Posição da transação no ledger.
+        """
+        for token in dict.fromkeys(tokenize(description)):
+            positions = self.positions.get(token)
+            if positions is None:
+                positions = self.positions[token] = array("q")
+            if not positions or position > positions[-1]:
+                positions.append(position)
+            else:
+                positions.insert(bisect_left(positions, position), position)
+
+    def remove(self, description: str, position: int) -> None:
+        """
+        Remove a descrição de uma transação do índice.
+
+        Args:
+            description (str): Descrição registrada para a transação.
+            position (int): Posição da transação no ledger.
+
+        Raises:
+            KeyError: Se a transação não estiver no índice.
+        """
+        for token in dict.fromkeys(tokenize(description)):
+            positions = self.positions.get(token)
+            i = bisect_left(positions, position) if positions is not None else 0
+            if positions is None or i == len(positions) or positions[i] != position:
+                raise KeyError((token, position))
+            del positions[i]
+            if not positions:
+                del self.positions[token]
+
+    def lookup(self, tokens: Iterable[str], within: Optional[Sequence[int]] = None) -> List[int]:
+        """
+        Retorna as posições das transações cujas descrições contêm todas as palavras.
+
+        Args:
+            tokens (Iterable[str]): Palavras normalizadas (ver tokenize).
+            within (Sequence[int], optional): Posições, em ordem crescente, às quais o
+                resultado é restrito (por exemplo, as de uma categoria). Padrão é None.
+
+        Returns:
+            List[int]: Posições das transações, em ordem crescente.
+        """
+        postings = [self.positions.get(token) for token in set(tokens)]
+        if within is not None:
+            postings.append(within)
+        if not postings or None in postings:
+            return []
+        postings.sort(key=len)
+        matches = list(postings[0])
+        for positions in postings[1:]:
+            matches = [p for p in matches if _contains(positions, p)]
+            if not matches:
+                break
+        return matches
+
+
+def _contains(positions: Sequence[int], position: int) -> bool:
+    """
+    Indica se uma posição está em um array ordenado de posições.
+    """
+    i = bisect_left(positions, position)
+    return i < len(positions) and positions[i] == position
@@ -0,0 +1,456 @@
+"""
+Journal (log de escrita antecipada) das alterações de um cliente.
+
+Cada alteração do cliente (contas e investimentos adicionados, transações
+adicionadas ou alteradas, saldos definidos diretamente, investimentos alterados e
+vendidos) é acrescentada a um arquivo de log antes de ser considerada durável. As escritas são agrupadas: uma thread de
+fundo grava e sincroniza (fsync) o arquivo periodicamente, de modo que várias
+alterações compartilham um único fsync (group commit).
+
+O diretório do journal guarda pares de arquivos por geração:
+- snapshot-<geração>.ngfs: o cliente no início da geração (formato de persistence).
+- journal-<geração>.log: as alterações feitas depois desse snapshot, uma por linha (JSON).
+
+Na compactação, um novo snapshot é gravado e uma nova geração é iniciada; os
+arquivos das gerações anteriores só são removidos depois que o novo snapshot e o
+novo arquivo de log estão gravados e sincronizados. Ao recuperar, o snapshot mais
+recente é carregado e seu journal é reaplicado.
+"""
+
+import json
+import os
+import re
+import threading
+from contextlib import ExitStack
+from typing import Any, List, Optional, Sequence
+
+from .daycount import ContributionSchedule
+from .ledger import from_micros, to_micros
+from .models import Account, Client, Investment
+from .persistence import _fsync_directory, load_client, save_client
+
+_FILE = re.compile(r"snapshot-(\d{8})\.ngfs$")
+
+
+def _snapshot_path(directory: str, generation: int) -> str:
+    return os.path.join(directory, f"snapshot-{generation:08d}.ngfs")
+
+
+def _journal_path(directory: str, generation: int) -> str:
+    return os.path.join(directory, f"journal-{generation:08d}.log")
+
+
+def _encode_contributions(contributions: Sequence[ContributionSchedule]) -> List[list]:
+    """
+    Converte aportes periódicos em listas JSON (datas em microssegundos).
+    """
+    return [
+        [
+            c.amount, c.every_months, to_micros(c.start) if c.start is not None else None,
+            c.count, to_micros(c.end) if c.end is not None else None
+        ]
+        for c in contributions
+    ]
+
+
+def _decode_contributions(values: List[list]) -> List[ContributionSchedule]:
+    """
+    Reconstrói aportes periódicos gravados por _encode_contributions.
+    """
+    return [
+        ContributionSchedule(
+            amount, every_months,
+            start=from_micros(start) if start is not None else None,
+            count=count,
+            end=from_micros(end) if end is not None else None
+        )
+        for amount, every_months, start, count, end in values
+    ]
+
+
+def _encode_field(field: str, value: Any) -> Any:
+    """
+    Converte o valor de um atributo de investimento para JSON.
+    """
+    if field == "date_purchased":
+        return to_micros(value)
+    if field == "day_count":
+        return value.name
+    if field == "contributions":
+        return _encode_contributions(value)
+    return value
+
+
+def _decode_field(field: str, value: Any) -> Any:
+    """
+    Reconstrói o valor de um atributo de investimento gravado por _encode_field.
+    """
+    if field == "date_purchased":
+        return from_micros(value)
+    if field == "contributions":
+        return _decode_contributions(value)
+    return value
+
+
+def _latest_generation(directory: str) -> int:
+    """
+    Retorna a geração do snapshot mais recente do diretório (0 se não houver).
+    """
+    generations = [int(match.group(1)) for match in map(_FILE.match, os.listdir(directory)) if match]
+    return max(generations, default=0)
+
+
+class Journal:
+    """
+    Journal com group commit das alterações de um cliente.
+
+    Atributos:
+        directory (str): Diretório com os snapshots e arquivos de log.
+        client (Client): Cliente cujas alterações são registradas.
+        generation (int): Geração atual (snapshot e arquivo de log em uso).
+        sync (bool): Se cada alteração aguarda o fsync do seu lote antes de retornar.
+        commit_interval (float): Intervalo máximo, em segundos, entre dois fsyncs.
+        max_batch (int): Registros acumulados que disparam um fsync imediato.
+        compact_every (int | None): Registros após os quais o journal é compactado.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        client: Client,
+        sync: bool = False,
+        commit_interval: float = 0.005,
+        max_batch: int = 10_000,
+        compact_every: Optional[int] = 1_000_000
+    ) -> None:
+        """
+        Inicia o registro das alterações de um cliente.
+
+        Um snapshot do estado atual do cliente é gravado como uma nova geração.
+
+        Args:
+            directory (str): Diretório do journal (criado se não existir).
+            client (Client): Cliente cujas alterações serão registradas.
+            sync (bool, optional): Se cada alteração aguarda seu fsync. Padrão é False
+                (as alterações ficam duráveis em até commit_interval segundos).
+            commit_interval (float, optional): Intervalo máximo entre fsyncs. Padrão é 0,005 s.
+            max_batch (int, optional): Registros que disparam um fsync imediato. Padrão é 10.000.
+            compact_every (int, optional): Registros após os quais o journal é compactado.
+                Padrão é 1.000.000; None desativa a compactação automática.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory: str = directory
+        self.client: Client = client
+        self.sync: bool = sync
+        self.commit_interval: float = commit_interval
+        self.max_batch: int = max_batch
+        self.compact_every: Optional[int] = compact_every
+        self.generation: int = _latest_generation(directory)
+        self._condition = threading.Condition()
+        self._buffer: List[str] = []
+        self._recorded = 0
+        self._durable = 0
+        self._since_compaction = 0
+        self._compact_due = False
+        self._account_ids = {id(account): i for i, account in enumerate(client.accounts)}
+        self._investment_ids = {id(investment): i for i, investment in enumerate(client.investments)}
+        self._file = None
+        self._closed = False
+        self._start_generation()
+        self._flusher = threading.Thread(target=self._flush_loop, name="finances-journal", daemon=True)
+        self._flusher.start()
+        client.subscribe(self._on_event)
+
+    # Gerações e compactação
+
+    def _start_generation(self) -> None:
+        """
+        Grava o snapshot do cliente e abre o arquivo de log de uma nova geração.
+        """
+        generation = self.generation + 1
+        # save_client grava um arquivo temporário sincronizado e o renomeia no lugar do snapshot
+        save_client(self.client, _snapshot_path(self.directory, generation))
+        journal = open(_journal_path(self.directory, generation), "a", encoding="utf-8")
+        _fsync_directory(self.directory)
+        previous, self._file, self.generation = self._file, journal, generation
+        if previous is not None:
+            previous.close()
+        # Só agora a nova geração é recuperável: as anteriores podem ser removidas
+        for name in os.listdir(self.directory):
+            match = re.match(r"(?:snapshot|journal)-(\d{8})\.", name)
+            if match and int(match.group(1)) < generation:
+                os.remove(os.path.join(self.directory, name))
+        self._since_compaction = 0
+        self._compact_due = False
+
+    def compact(self) -> None:
+        """
+        Grava um snapshot do estado atual e inicia uma nova geração do journal.
+
+        Os registros pendentes são sincronizados antes; os arquivos da geração
+        anterior são removidos.
+
+        As alterações do cliente são registradas com o lock do cliente ou da conta
+        alterada adquirido; a compactação adquire todos esses locks, de modo que
+        nenhuma alteração já aplicada fica fora do log anterior (e, portanto,
+        registrada também na nova geração). Com um cliente concorrente, não deve ser
+        chamado por uma thread que já segure o lock de uma conta.
+
+        Raises:
+            RuntimeError: Se o journal já tiver sido fechado.
+        """
+        client = self.client
+        with ExitStack() as locks:
+            locks.enter_context(client._lock)
+            # Mesma ordem de Client.add_transactions, para evitar deadlocks
+            for account in sorted(client.accounts, key=id):
+                locks.enter_context(account._lock)
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("O journal está fechado.")
+                self._write_pending()
+                self._start_generation()
+
+    # Registro
+
+    def _on_event(self, event: str, *args) -> None:
+        """
+        Converte um evento do cliente em um registro do journal.
+        """
+        if event == "add":
+            account, transactions = args
+            record = {
+                "e": "add",
+                "a": self._account_index(account),
+                "t": [[t.amount, to_micros(t.date), t.category, t.description] for t in transactions],
+            }
+        elif event == "update":
+            account, transaction, previous = args
+            changes = {key: getattr(transaction, key) for key in previous}
+            if "date" in changes:
+                changes["date"] = to_micros(changes["date"])
+            record = {"e": "update", "a": self._account_index(account), "p": transaction._position, "c": changes}
+        elif event == "account":
+            account, = args
+            self._account_ids[id(account)] = len(self.client.accounts) - 1
+            record = {"e": "account", "n": account.name}
+        elif event == "investment":
+            investment, = args
+            self._investment_ids[id(investment)] = len(self.client.investments) - 1
+            record = {
+                "e": "investment",
+                "type": investment.type,
+                "amount": investment.initial_amount,
+                "rate": investment.rate_of_return,
+                "date": to_micros(investment.date_purchased),
+                "dc": investment.day_count.name,
+                "k": _encode_contributions(investment.contributions),
+            }
+        elif event == "investment_update":
+            investment, field = args
+            record = {
+                "e": "investment_update",
+                "i": self._investment_index(investment),
+                "f": field,
+                "v": _encode_field(field, getattr(investment, field)),
+            }
+        elif event == "balance":
+            account, = args
+            record = {"e": "balance", "a": self._account_index(account), "v": account.balance}
+        elif event == "sell":
+            investment, account = args
+            record = {"e": "sell", "i": self._investment_index(investment), "a": self._account_index(account)}
+        else:
+            return
+        self.record(json.dumps(record, ensure_ascii=False))
+
+    def _account_index(self, account: Account) -> int:
+        index = self._account_ids.get(id(account))
+        if index is None or index >= len(self.client.accounts) or self.client.accounts[index] is not account:
+            index = self._account_ids[id(account)] = self.client.accounts.index(account)
+        return index
+
+    def _investment_index(self, investment: Investment) -> int:
+        index = self._investment_ids.get(id(investment))
+        investments = self.client.investments
+        if index is None or index >= len(investments) or investments[index] is not investment:
+            index = self._investment_ids[id(investment)] = investments.index(investment)
+        return index
+
+    def record(self, entry: str) -> None:
+        """
+        Acrescenta um registro ao journal.
+
+        Args:
+            entry (str): Registro serializado (uma linha JSON, sem quebra de linha).
+
+        Raises:
+            RuntimeError: Se o journal já tiver sido fechado.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("O journal está fechado.")
+            self._buffer.append(entry + "\n")
+            self._recorded += 1
+            self._since_compaction += 1
+            sequence = self._recorded
+            if len(self._buffer) >= self.max_batch:
+                self._condition.notify_all()
+            compact = self.compact_every is not None and self._since_compaction >= self.compact_every
+            if compact and self.client.concurrent:
+                # Esta thread pode segurar o lock de uma conta: a compactação, que
+                # adquire todos eles, fica com a thread de fundo.
+                self._compact_due = True
+                self._condition.notify_all()
+                compact = False
+        if compact:
+            self.compact()
+        elif self.sync:
+            self.wait(sequence)
+
+    def _write_pending(self) -> None:
+        """
+        Grava e sincroniza os registros acumulados. Deve ser chamado com o lock adquirido.
+        """
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer.clear()
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._durable = self._recorded
+        self._condition.notify_all()
+
+    def _flush_loop(self) -> None:
+        """
+        Laço da thread de fundo que grava os lotes de registros.
+        """
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+                if len(self._buffer) < self.max_batch and not self._compact_due:
+                    self._condition.wait(self.commit_interval)
+                if self._buffer:
+                    self._write_pending()
+                compact = self._compact_due and not self._closed
+            if compact:
+                try:
+                    self.compact()
+                except RuntimeError:
+                    return  # o journal foi fechado enquanto aguardava os locks
+
+    def wait(self, sequence: Optional[int] = None) -> None:
+        """
+        Aguarda até que os registros feitos até agora (ou até sequence) estejam duráveis.
+
+        Args:
+            sequence (int, optional): Número do registro a aguardar. Padrão é o último.
+        """
+        with self._condition:
+            target = self._recorded if sequence is None else sequence
+            while self._durable < target and not self._closed:
+                if self._compact_due:
+                    # A thread de fundo pode estar aguardando o lock de conta desta thread
+                    self._write_pending()
+                    break
+                self._condition.notify_all()
+                self._condition.wait(self.commit_interval)
+
+    def close(self) -> None:
+        """
+        Grava os registros pendentes, para a thread de fundo e fecha o arquivo de log.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self.client.unsubscribe(self._on_event)
+            self._write_pending()
+            self._closed = True
+            self._condition.notify_all()
+        self._flusher.join()
+        self._file.close()
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def replay(client: Client, lines) -> int:
+    """
+    Reaplica registros do journal a um cliente.
+
+    Um último registro incompleto (interrompido por uma queda) é ignorado.
+
+    Args:
+        client (Client): Cliente no estado do snapshot correspondente.
+        lines (Iterable[str]): Linhas do arquivo de log.
+
+    Returns:
+        int: Quantidade de registros reaplicados.
+
+    Raises:
+        ValueError: Se um registro for de um tipo desconhecido.
+    """
+    count = 0
+    for line in lines:
+        if not line.endswith("\n"):
+            break
+        record = json.loads(line)
+        event = record["e"]
+        if event == "add":
+            client.accounts[record["a"]].add_transactions(
+                [(amount, category, description, from_micros(date)) for amount, date, category, description in record["t"]]
+            )
+        elif event == "update":
+            changes = record["c"]
+            if "date" in changes:
+                changes["date"] = from_micros(changes["date"])
+            client.accounts[record["a"]].transactions[record["p"]].update(**changes)
+        elif event == "account":
+            client.add_account(record["n"])
+        elif event == "investment":
+            investment = Investment(
+                record["type"], record["amount"], record["rate"],
+                day_count=record.get("dc", "30d"), contributions=_decode_contributions(record.get("k", ()))
+            )
+            investment.date_purchased = from_micros(record["date"])
+            client.add_investment(investment)
+        elif event == "investment_update":
+            setattr(client.investments[record["i"]], record["f"], _decode_field(record["f"], record["v"]))
+        elif event == "balance":
+            client.accounts[record["a"]].balance = record["v"]
+        elif event == "sell":
+            # O valor da venda foi depositado pelo registro "add" que precede este, e a
+            # venda não altera o investimento: basta verificar que ele e a conta existem.
+            if not (0 <= record["i"] < len(client.investments) and 0 <= record["a"] < len(client.accounts)):
+                raise ValueError(f"Venda de investimento inexistente no journal: {record!r}")
+        else:
+            raise ValueError(f"Registro desconhecido no journal: {event!r}")
+        count += 1
+    return count
+
+
+def recover(directory: str) -> Client:
+    """
+    Reconstrói um cliente a partir do snapshot mais recente e do seu journal.
+
+    Args:
+        directory (str): Diretório do journal.
+
+    Returns:
+        Client: O cliente reconstruído.
+
+    Raises:
+        FileNotFoundError: Se o diretório não tiver nenhum snapshot.
+    """
+    generation = _latest_generation(directory)
+    if generation == 0:
+        raise FileNotFoundError(f"Nenhum snapshot encontrado em {directory}")
+    client = load_client(_snapshot_path(directory, generation), use_mmap=False)
+    path = _journal_path(directory, generation)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as file:
+            replay(client, file)
+    return client
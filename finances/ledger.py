@@ -0,0 +1,539 @@
+"""
+Armazenamento de transações das contas.
+
+Este módulo define os "ledgers" usados por Account para guardar suas transações:
+- ListLedger: lista de objetos Transaction (comportamento padrão).
+- ColumnarLedger: armazenamento colunar em arrays compactos, que cria objetos
+  Transaction apenas quando solicitados.
+
+Além das operações de lista (append, extend, índices), cada ledger implementa
+extend_rows, usado por Account.add_transactions para gravar linhas já validadas
+diretamente a partir de colunas.
+"""
+
+from array import array
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from . import models
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_micros(date: datetime) -> int:
+    """
+    Converte uma data em microssegundos desde 01/01/1970.
+
+    Args:
+        date (datetime): Data a ser convertida (sem fuso horário).
+
+    Returns:
+        int: Microssegundos desde a época.
+    """
+    delta = date - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_micros(micros: int) -> datetime:
+    """
+    Converte microssegundos desde 01/01/1970 em uma data.
+
+    Args:
+        micros (int): Microssegundos desde a época.
+
+    Returns:
+        datetime: A data correspondente.
+    """
+    return EPOCH + timedelta(microseconds=micros)
+
+
+class StringTable:
+    """
+    Tabela de strings internadas: cada string distinta é guardada uma única vez e
+    referenciada por um identificador inteiro.
+    """
+
+    def __init__(self) -> None:
+        """
+        Inicializa uma tabela vazia.
+        """
+        self._strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        """
+        Retorna o identificador de uma string, adicionando-a à tabela se necessário.
+
+        Args:
+            value (str): String a ser internada.
+
+        Returns:
+            int: Identificador da string.
+        """
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._ids[value] = string_id
+        return string_id
+
+    def lookup(self, value: str) -> Optional[int]:
+        """
+        Retorna o identificador de uma string, sem adicioná-la à tabela.
+
+        Args:
+            value (str): String procurada.
+
+        Returns:
+            int | None: Identificador da string, ou None se ela não estiver na tabela.
+        """
+        return self._ids.get(value)
+
+    def __getitem__(self, string_id: int) -> str:
+        return self._strings[string_id]
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+
+class LedgerRange(Sequence):
+    """
+    Transações de um intervalo de posições de um ledger, criadas apenas quando acessadas.
+
+    Atributos:
+        ledger (Sequence[Transaction]): Ledger das transações.
+        start (int): Primeira posição do intervalo.
+        stop (int): Posição seguinte à última do intervalo.
+    """
+
+    __slots__ = ("ledger", "start", "stop")
+
+    def __init__(self, ledger: Sequence["models.Transaction"], start: int, stop: int) -> None:
+        """
+        Inicializa o intervalo.
+
+        Args:
+            ledger (Sequence[Transaction]): Ledger das transações.
+            start (int): Primeira posição do intervalo.
+            stop (int): Posição seguinte à última do intervalo.
+        """
+        self.ledger = ledger
+        self.start: int = start
+        self.stop: int = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.ledger[self.start + i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("range index out of range")
+        return self.ledger[self.start + index]
+
+    def __iter__(self) -> Iterator["models.Transaction"]:
+        ledger = self.ledger
+        for position in range(self.start, self.stop):
+            yield ledger[position]
+
+    def __repr__(self) -> str:
+        return f"LedgerRange({self.start}, {self.stop})"
+
+
+class ListLedger(list):
+    """
+    Ledger padrão: uma lista de objetos Transaction.
+
+    Atributos:
+        account (Account): Conta dona do ledger.
+        indexed (bool): Se o próprio ledger resolve consultas (False: a conta usa seus índices).
+    """
+
+    account: Optional["models.Account"] = None
+    indexed: bool = False
+
+    def store(self, position: int, transaction: "models.Transaction") -> None:
+        """
+        Grava uma transação alterada na posição indicada.
+
+        Args:
+            position (int): Posição da transação no ledger.
+            transaction (Transaction): Transação com os novos valores.
+        """
+        self[position] = transaction
+
+    def extend_rows(self, rows: "models._StagedRows") -> List["models.Transaction"]:
+        """
+        Adiciona ao final do ledger linhas já validadas por Account.add_transactions.
+
+        Args:
+            rows (_StagedRows): Linhas validadas, em colunas.
+
+        Returns:
+            List[Transaction]: As transações adicionadas.
+        """
+        make = models.Transaction
+        added = list(map(make, rows.amounts, rows.categories, rows.descriptions, rows.dates))
+        for index, transaction in rows.transactions:
+            added[index] = transaction
+        account = self.account
+        for position, transaction in enumerate(added, len(self)):
+            transaction._account = account
+            transaction._position = position
+        self.extend(added)
+        return added
+
+    def date_micros(self) -> List[int]:
+        """
+        Retorna as datas das transações em microssegundos, na ordem do ledger.
+
+        Returns:
+            List[int]: Datas das transações.
+        """
+        return [to_micros(t.date) for t in self]
+
+    def category_amounts(self) -> Iterator[Tuple[str, float]]:
+        """
+        Percorre as categorias e valores das transações, na ordem do ledger.
+
+        Returns:
+            Iterator[Tuple[str, float]]: Pares (categoria, valor).
+        """
+        return ((t.category, t.amount) for t in self)
+
+    def description_texts(self) -> Iterator[str]:
+        """
+        Percorre as descrições das transações, na ordem do ledger.
+
+        Returns:
+            Iterator[str]: Descrição de cada transação.
+        """
+        return (t.description for t in self)
+
+    def describe(self, limit: Optional[int] = None) -> Iterator[str]:
+        """
+        Percorre as representações textuais das transações, na ordem do ledger.
+
+        Args:
+            limit (int, optional): Máximo de transações. Padrão é None (todas).
+
+        Returns:
+            Iterator[str]: O texto de cada transação (str(transação)).
+        """
+        return map(str, islice(self, limit))
+
+    def take(self, positions: Iterable[int], category: Optional[str] = None) -> List["models.Transaction"]:
+        """
+        Retorna as transações nas posições indicadas, opcionalmente filtradas por categoria.
+
+        Args:
+            positions (Iterable[int]): Posições das transações no ledger.
+            category (str, optional): Categoria para filtrar. Padrão é None.
+
+        Returns:
+            List[Transaction]: Lista de transações.
+        """
+        if category:
+            return [t for t in map(self.__getitem__, positions) if t.category == category]
+        return [self[p] for p in positions]
+
+    def filter(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None
+    ) -> List["models.Transaction"]:
+        """
+        Retorna as transações filtradas por data e/ou categoria.
+
+        Args:
+            start_date (datetime, optional): Data inicial para filtro. Padrão é None.
+            end_date (datetime, optional): Data final para filtro. Padrão é None.
+            category (str, optional): Categoria para filtrar. Padrão é None.
+
+        Returns:
+            List[Transaction]: Lista de transações filtradas (sempre uma nova lista).
+        """
+        filtered = self
+        if start_date:
+            filtered = [t for t in filtered if t.date >= start_date]
+        if end_date:
+            filtered = [t for t in filtered if t.date <= end_date]
+        if category:
+            filtered = [t for t in filtered if t.category == category]
+        return filtered if filtered is not self else list(self)
+
+
+class ColumnarLedger(Sequence):
+    """
+    Ledger colunar, voltado para contas com muitas transações.
+
+    Valores, datas e categorias/descrições (internadas em uma tabela de strings)
+    ficam em arrays compactos. Objetos Transaction são criados apenas quando
+    acessados e, ao serem atualizados, gravam os novos valores de volta nas colunas.
+
+    Atributos:
+        account (Account): Conta dona do ledger.
+        indexed (bool): Se o próprio ledger resolve consultas (False: a conta usa seus índices).
+        strings (StringTable): Tabela de categorias e descrições.
+        amounts (array): Valores das transações.
+        timestamps (array): Datas das transações, em microssegundos desde a época.
+        categories (array): Identificadores das categorias na tabela de strings.
+        descriptions (array): Identificadores das descrições na tabela de strings.
+    """
+
+    def __init__(self, strings: Optional[StringTable] = None) -> None:
+        """
+        Inicializa um ledger colunar vazio.
+
+        Args:
+            strings (StringTable, optional): Tabela de strings, que pode ser compartilhada
+                entre ledgers. Padrão é uma tabela nova.
+        """
+        self.account: Optional["models.Account"] = None
+        self.indexed: bool = False
+        self.strings: StringTable = strings if strings is not None else StringTable()
+        self.amounts: array = array("d")
+        self.timestamps: array = array("q")
+        self.categories: array = array("I")
+        self.descriptions: array = array("I")
+
+    def intern(self, value: str) -> int:
+        """
+        Retorna o identificador de uma string na tabela, adicionando-a se necessário.
+
+        Args:
+            value (str): String a ser internada.
+
+        Returns:
+            int: Identificador da string.
+        """
+        return self.strings.intern(value)
+
+    def string(self, string_id: int) -> str:
+        """
+        Retorna a string associada a um identificador.
+
+        Args:
+            string_id (int): Identificador na tabela de strings.
+
+        Returns:
+            str: A string correspondente.
+        """
+        return self.strings[string_id]
+
+    def append(self, transaction: "models.Transaction") -> None:
+        """
+        Adiciona uma transação ao final do ledger.
+
+        Args:
+            transaction (Transaction): Transação a ser armazenada.
+        """
+        # Converte todos os valores antes de alterar as colunas
+        timestamp = to_micros(transaction.date)
+        category, description = self.intern(transaction.category), self.intern(transaction.description)
+        self.amounts.append(transaction.amount)
+        self.timestamps.append(timestamp)
+        self.categories.append(category)
+        self.descriptions.append(description)
+
+    def extend(self, transactions: Iterable["models.Transaction"]) -> None:
+        """
+        Adiciona várias transações ao final do ledger.
+
+        Args:
+            transactions (Iterable[Transaction]): Transações a serem armazenadas.
+        """
+        transactions = list(transactions)
+        intern = self.strings.intern
+        # Converte todos os valores antes de alterar as colunas
+        amounts = array("d", [t.amount for t in transactions])
+        timestamps = array("q", [to_micros(t.date) for t in transactions])
+        categories = array("I", [intern(t.category) for t in transactions])
+        descriptions = array("I", [intern(t.description) for t in transactions])
+        self.amounts.extend(amounts)
+        self.timestamps.extend(timestamps)
+        self.categories.extend(categories)
+        self.descriptions.extend(descriptions)
+
+    def extend_rows(self, rows: "models._StagedRows") -> LedgerRange:
+        """
+        Adiciona ao final do ledger linhas já validadas por Account.add_transactions.
+
+        As colunas são estendidas diretamente, sem criar objetos Transaction.
+
+        Args:
+            rows (_StagedRows): Linhas validadas, em colunas.
+
+        Returns:
+            LedgerRange: As transações adicionadas, criadas apenas quando acessadas.
+        """
+        first = len(self)
+        intern = self.strings.intern
+        # Converte todos os valores antes de alterar as colunas
+        amounts = array("d", rows.amounts)
+        timestamps = array("q", map(to_micros, rows.dates))
+        categories = array("I", map(intern, rows.categories))
+        descriptions = array("I", map(intern, rows.descriptions))
+        self.amounts.extend(amounts)
+        self.timestamps.extend(timestamps)
+        self.categories.extend(categories)
+        self.descriptions.extend(descriptions)
+        for index, transaction in rows.transactions:
+            transaction._account = self.account
+            transaction._position = first + index
+        return LedgerRange(self, first, len(self))
+
+    def store(self, position: int, transaction: "models.Transaction") -> None:
+        """
+        Grava uma transação alterada na posição indicada.
+
+        Args:
+            position (int): Posição da transação no ledger.
+            transaction (Transaction): Transação com os novos valores.
+        """
+        # Converte todos os valores antes de alterar as colunas
+        timestamp = to_micros(transaction.date)
+        category, description = self.intern(transaction.category), self.intern(transaction.description)
+        self.amounts[position] = transaction.amount
+        self.timestamps[position] = timestamp
+        self.categories[position] = category
+        self.descriptions[position] = description
+
+    def _view(self, position: int) -> "models.Transaction":
+        """
+        Cria o objeto Transaction correspondente a uma posição.
+        """
+        transaction = models.Transaction(
+            self.amounts[position],
+            self.strings[self.categories[position]],
+            self.strings[self.descriptions[position]],
+            date=from_micros(self.timestamps[position])
+        )
+        transaction._account = self.account
+        transaction._position = position
+        return transaction
+
+    def date_micros(self) -> Sequence[int]:
+        """
+        Retorna as datas das transações em microssegundos, na ordem do ledger.
+
+        Returns:
+            Sequence[int]: Datas das transações.
+        """
+        return self.timestamps
+
+    def category_amounts(self) -> Iterator[Tuple[str, float]]:
+        """
+        Percorre as categorias e valores das transações, na ordem do ledger.
+
+        Returns:
+            Iterator[Tuple[str, float]]: Pares (categoria, valor).
+        """
+        return zip(map(self.strings.__getitem__, self.categories), self.amounts)
+
+    def description_texts(self) -> Iterator[str]:
+        """
+        Percorre as descrições das transações, na ordem do ledger.
+
+        Returns:
+            Iterator[str]: Descrição de cada transação.
+        """
+        return map(self.strings.__getitem__, self.descriptions)
+
+    def describe(self, limit: Optional[int] = None) -> Iterator[str]:
+        """
+        Percorre as representações textuais das transações, na ordem do ledger.
+
+        O texto é montado diretamente a partir das colunas, sem criar objetos Transaction.
+
+        Args:
+            limit (int, optional): Máximo de transações. Padrão é None (todas).
+
+        Returns:
+            Iterator[str]: O texto de cada transação (str(transação)).
+        """
+        strings = self.strings
+        names: Dict[int, str] = {}
+        text = models.TRANSACTION_FORMAT.format
+        for amount, category, description in islice(zip(self.amounts, self.categories, self.descriptions), limit):
+            category = names.get(category) or names.setdefault(category, strings[category])
+            description = names.get(description) or names.setdefault(description, strings[description])
+            yield text(description, amount, category)
+
+    def take(self, positions: Iterable[int], category: Optional[str] = None) -> List["models.Transaction"]:
+        """
+        Retorna as transações nas posições indicadas, opcionalmente filtradas por categoria.
+
+        A categoria é comparada pelo identificador, antes de materializar as transações.
+
+        Args:
+            positions (Iterable[int]): Posições das transações no ledger.
+            category (str, optional): Categoria para filtrar. Padrão é None.
+
+        Returns:
+            List[Transaction]: Lista de transações.
+        """
+        if category:
+            category_id = self.strings.lookup(category)
+            if category_id is None:
+                return []
+            categories = self.categories
+            positions = [p for p in positions if categories[p] == category_id]
+        return [self._view(p) for p in positions]
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._view(position) for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ledger index out of range")
+        return self._view(index)
+
+    def __iter__(self) -> Iterator["models.Transaction"]:
+        for position in range(len(self)):
+            yield self._view(position)
+
+    def filter(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None
+    ) -> List["models.Transaction"]:
+        """
+        Retorna as transações filtradas por data e/ou categoria.
+
+        A filtragem é feita diretamente sobre as colunas; apenas as transações
+        selecionadas são materializadas.
+
+        Args:
+            start_date (datetime, optional): Data inicial para filtro. Padrão é None.
+            end_date (datetime, optional): Data final para filtro. Padrão é None.
+            category (str, optional): Categoria para filtrar. Padrão é None.
+
+        Returns:
+            List[Transaction]: Lista de transações filtradas.
+        """
+        positions = range(len(self))
+        if start_date:
+            start = to_micros(start_date)
+            timestamps = self.timestamps
+            positions = [p for p in positions if timestamps[p] >= start]
+        if end_date:
+            end = to_micros(end_date)
+            timestamps = self.timestamps
+            positions = [p for p in positions if timestamps[p] <= end]
+        if category:
+            category_id = self.strings.lookup(category)
+            if category_id is None:
+                return []
+            categories = self.categories
+            positions = [p for p in positions if categories[p] == category_id]
+        return [self._view(p) for p in positions]
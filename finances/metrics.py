@@ -0,0 +1,319 @@
+"""
+Instrumentação opcional dos caminhos críticos do pacote.
+
+Quando ativada (enable), conta as chamadas e mede o tempo gasto em:
+
+- add_transaction / add_transactions / get_transactions (Account);
+- calculate_value (Investment) e get_net_worth (Client);
+- relatórios do módulo utils: o relatório completo (report) e cada seção
+  (report_accounts, report_investments, report_net_worth), a avaliação dos
+  investimentos do relatório (value_investments) e, em future_value_report, o
+  cálculo (report_projection) e o texto (report_projection_format) da projeção.
+
+Os tempos são inclusivos: o tempo de report inclui o de suas seções, e o de
+report_net_worth inclui o de get_net_worth. Nas seções, geradas sob demanda,
+conta apenas o tempo gasto produzindo as linhas (não o do código que as consome).
+
+A instrumentação substitui os métodos e funções por versões medidas e os restaura
+em disable(), de modo que, desativada, não há custo algum. Os valores ficam em um
+MetricsRegistry, que pode ser exportado no formato de texto do Prometheus.
+
+As funções de utils são substituídas no próprio módulo: chamadas por nomes
+importados antes da ativação (from finances.utils import iter_report_lines) não
+são medidas diretamente, mas as seções e métodos que elas usam continuam sendo.
+"""
+
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from inspect import isgeneratorfunction
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from . import models, utils
+
+
+class Metric:
+    """
+    Estatísticas de uma operação instrumentada.
+
+    Atributos:
+        count (int): Número de chamadas.
+        total (float): Tempo total, em segundos.
+        max (float): Maior tempo de uma chamada, em segundos.
+    """
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """
+        float: Tempo médio por chamada, em segundos.
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def __repr__(self) -> str:
+        return f"Metric(count={self.count}, total={self.total:.6f}, max={self.max:.6f})"
+
+
+class MetricsRegistry:
+    """
+    Registro das métricas de operações (contagem e tempo de chamadas).
+
+    Pode ser usado por várias threads.
+
+    Atributos:
+        prefix (str): Prefixo dos nomes das métricas exportadas.
+    """
+
+    def __init__(self, prefix: str = "finances") -> None:
+        """
+        Inicializa um registro vazio.
+
+        Args:
+            prefix (str, optional): Prefixo dos nomes exportados. Padrão é "finances".
+        """
+        self.prefix: str = prefix
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+
+    def observe(self, operation: str, seconds: float) -> None:
+        """
+        Registra uma chamada de uma operação.
+
+        Args:
+            operation (str): Nome da operação.
+            seconds (float): Duração da chamada, em segundos.
+        """
+        with self._lock:
+            metric = self._metrics.get(operation)
+            if metric is None:
+                metric = self._metrics[operation] = Metric()
+            metric.count += 1
+            metric.total += seconds
+            if seconds > metric.max:
+                metric.max = seconds
+
+    @contextmanager
+    def time(self, operation: str) -> Iterator[None]:
+        """
+        Mede o tempo de um bloco with como uma chamada de uma operação.
+
+        Exemplo:
+            with registry.time("monthly_statement"):
+                ...
+
+        Args:
+            operation (str): Nome da operação.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(operation, perf_counter() - start)
+
+    def get(self, operation: str) -> Optional[Metric]:
+        """
+        Retorna uma cópia das estatísticas de uma operação.
+
+        Args:
+            operation (str): Nome da operação.
+
+        Returns:
+            Metric | None: As estatísticas, ou None se a operação não foi registrada.
+        """
+        with self._lock:
+            metric = self._metrics.get(operation)
+            if metric is None:
+                return None
+            copy = Metric()
+            copy.count, copy.total, copy.max = metric.count, metric.total, metric.max
+            return copy
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Retorna as estatísticas de todas as operações.
+
+        Returns:
+            Dict[str, Dict[str, float]]: count, total, mean e max de cada operação.
+        """
+        with self._lock:
+            return {
+                operation: {"count": metric.count, "total": metric.total, "mean": metric.mean, "max": metric.max}
+                for operation, metric in sorted(self._metrics.items())
+            }
+
+    def reset(self) -> None:
+        """
+        Descarta todas as estatísticas.
+        """
+        with self._lock:
+            self._metrics.clear()
+
+    def export_prometheus(self) -> str:
+        """
+        Exporta as estatísticas no formato de texto do Prometheus (versão 0.0.4).
+
+        Cada operação é um rótulo operation das métricas <prefix>_operation_seconds
+        (summary, com _count e _sum) e <prefix>_operation_seconds_max (gauge).
+
+        Returns:
+            str: O texto exportado.
+        """
+        name = f"{self.prefix}_operation_seconds"
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {name} Tempo gasto nas operações instrumentadas (inclusivo), em segundos.",
+            f"# TYPE {name} summary",
+        ]
+        for operation, values in snapshot.items():
+            label = _label(operation)
+            lines.append(f'{name}_count{{operation="{label}"}} {values["count"]}')
+            lines.append(f'{name}_sum{{operation="{label}"}} {values["total"]!r}')
+        lines.append(f"# HELP {name}_max Maior tempo de uma chamada, em segundos.")
+        lines.append(f"# TYPE {name}_max gauge")
+        for operation, values in snapshot.items():
+            lines.append(f'{name}_max{{operation="{_label(operation)}"}} {values["max"]!r}')
+        return "\n".join(lines) + "\n"
+
+
+def _label(value: str) -> str:
+    """
+    Escapa o valor de um rótulo do Prometheus.
+    """
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+# Registro usado pela instrumentação do pacote
+registry = MetricsRegistry()
+
+# (objeto, atributo, operação) de cada ponto instrumentado
+INSTRUMENTED: Tuple[Tuple[Any, str, str], ...] = (
+    (models.Account, "add_transaction", "add_transaction"),
+    (models.Account, "add_transactions", "add_transactions"),
+    (models.Account, "get_transactions", "get_transactions"),
+    (models.Investment, "calculate_value", "calculate_value"),
+    (models.Client, "get_net_worth", "get_net_worth"),
+    (utils, "iter_report_lines", "report"),
+    (utils, "_account_lines", "report_accounts"),
+    (utils, "_investment_lines", "report_investments"),
+    (utils, "_net_worth_lines", "report_net_worth"),
+    (utils, "value_investments", "value_investments"),
+    (utils, "project_client", "report_projection"),
+    (utils, "render_projection", "report_projection_format"),
+)
+
+_lock = threading.Lock()
+# Funções originais substituídas pela instrumentação
+_originals: List[Tuple[Any, str, Callable]] = []
+
+
+def _timed(function: Callable, operation: str, target: MetricsRegistry) -> Callable:
+    """
+    Retorna uma versão medida de uma função (ou de um gerador, medido a cada linha).
+    """
+    if isgeneratorfunction(function):
+        @wraps(function)
+        def generator(*args, **kwargs):
+            iterator = function(*args, **kwargs)
+            advance, counter = iterator.__next__, perf_counter
+            elapsed = 0.0
+            try:
+                while True:
+                    start = counter()
+                    try:
+                        item = advance()
+                    except StopIteration:
+                        elapsed += counter() - start
+                        return
+                    elapsed += counter() - start
+                    yield item
+            finally:
+                iterator.close()
+                target.observe(operation, elapsed)
+
+        return generator
+
+    @wraps(function)
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            target.observe(operation, perf_counter() - start)
+
+    return timed
+
+
+def enable(target: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+    """
+    Ativa a instrumentação, substituindo os pontos instrumentados por versões medidas.
+
+    Args:
+        target (MetricsRegistry, optional): Registro das métricas. Padrão é metrics.registry.
+
+    Returns:
+        MetricsRegistry: O registro em uso.
+
+    Raises:
+        RuntimeError: Se a instrumentação já estiver ativa.
+    """
+    target = target if target is not None else registry
+    with _lock:
+        if _originals:
+            raise RuntimeError("A instrumentação já está ativa.")
+        for owner, attribute, operation in INSTRUMENTED:
+            function = owner.__dict__[attribute]
+            _originals.append((owner, attribute, function))
+            setattr(owner, attribute, _timed(function, operation, target))
+    return target
+
+
+def disable() -> None:
+    """
+    Desativa a instrumentação, restaurando os métodos e funções originais.
+
+    As estatísticas já registradas são mantidas.
+    """
+    with _lock:
+        while _originals:
+            owner, attribute, function = _originals.pop()
+            setattr(owner, attribute, function)
+
+
+def is_enabled() -> bool:
+    """
+    Indica se a instrumentação está ativa.
+
+    Returns:
+        bool: True se a instrumentação estiver ativa.
+    """
+    return bool(_originals)
+
+
+@contextmanager
+def instrumented(target: Optional[MetricsRegistry] = None) -> Iterator[MetricsRegistry]:
+    """
+    Ativa a instrumentação dentro de um bloco with.
+
+    Exemplo:
+        with instrumented() as metrics:
+            generate_report(client)
+        print(metrics.export_prometheus())
+
+    Args:
+        target (MetricsRegistry, optional): Registro das métricas. Padrão é metrics.registry.
+
+    Returns:
+        Iterator[MetricsRegistry]: O registro em uso.
+    """
+    target = enable(target)
+    try:
+        yield target
+    finally:
+        disable()
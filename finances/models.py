@@ -1,11 +1,83 @@
-from datetime import datetime
-from typing import List, Optional
+import heapq
+import itertools
+import threading
+from bisect import bisect_left, bisect_right
+from contextlib import ExitStack, nullcontext
+from datetime import datetime, timedelta
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from . import clock
+from .daycount import DEFAULT_CONVENTION, AccrualSchedule, ContributionSchedule, DayCount, add_months, get_convention
+from .indexes import BalanceIndex, CategoryIndex, DateIndex, TextIndex, tokenize
+from .ledger import ColumnarLedger, ListLedger, to_micros
+from .valuation import InvestmentBatch
+
+# Formato da representação textual de uma transação (descrição, valor, categoria)
+TRANSACTION_FORMAT = "Transação: {} R$ {:.2f} ({})"
+
+# Usado no lugar de um lock quando a conta ou o cliente não é concorrente.
+_NO_LOCK = nullcontext()
+
+# Maior bloco de transações materializado de uma vez por Account.iter_transactions
+SCAN_CHUNK = 4096
+
+
+def _check_fields(amount, category, description, date, source) -> None:
+    """
+    Valida os valores de uma transação, incluindo a conversão da data usada pelos ledgers.
+
+    Args:
+        amount (float): Valor da transação.
+        category (str): Categoria da transação.
+        description (str): Descrição da transação.
+        date (datetime): Data da transação, sem fuso horário (como em to_micros).
+        source (object): Linha ou atributos de origem, usados na mensagem de erro.
+
+    Raises:
+        TypeError: Se algum valor for inválido.
+    """
+    if isinstance(amount, bool) or not isinstance(amount, (int, float)):
+        raise TypeError(f"Valor inválido: {amount!r}")
+    if not isinstance(category, str) or not isinstance(description, str):
+        raise TypeError(f"Categoria ou descrição inválida: {source!r}")
+    if not isinstance(date, datetime) or date.tzinfo is not None:
+        raise TypeError(f"Data inválida: {date!r}")
+
+
+class _StagedRows:
+    """
+    Linhas de Account.add_transactions já validadas, em colunas.
+
+    Atributos:
+        amounts (List[float]): Valores.
+        categories (List[str]): Categorias.
+        descriptions (List[str]): Descrições.
+        dates (List[datetime]): Datas.
+        transactions (List[Tuple[int, Transaction]]): Linhas que eram objetos Transaction
+            (ainda sem conta), com seus índices; são guardadas no ledger no lugar de cópias.
+    """
+
+    __slots__ = ("amounts", "categories", "descriptions", "dates", "transactions")
+
+    def __init__(self) -> None:
+        self.amounts: List[float] = []
+        self.categories: List[str] = []
+        self.descriptions: List[str] = []
+        self.dates: List[datetime] = []
+        self.transactions: List[Tuple[int, "Transaction"]] = []
+
+    def __len__(self) -> int:
+        return len(self.amounts)
 
 
 class Transaction:
     """
     Representa uma transação financeira.
 
+    As transações usam __slots__: não há um __dict__ por objeto, e apenas os
+    atributos declarados podem ser definidos.
+
     Atributos:
         amount (float): Valor da transação.
         date (datetime): Data da transação.
@@ -13,7 +85,16 @@ class Transaction:
         description (str): Descrição da transação.
     """
 
-    def __init__(self, amount: float, category: str, description: str = "") -> None:
+    FIELDS: Tuple[str, ...] = ("amount", "date", "category", "description")
+    __slots__ = FIELDS + ("_account", "_position")
+
+    def __init__(
+        self,
+        amount: float,
+        category: str,
+        description: str = "",
+        date: Optional[datetime] = None
+    ) -> None:
         """
         Inicializa uma transação.
 
@@ -21,11 +102,14 @@ class Transaction:
             amount (float): Valor da transação.
             category (str): Categoria da transação.
             description (str, optional): Descrição da transação. Padrão é "".
+            date (datetime, optional): Data da transação. Padrão é o momento atual.
         """
         self.amount: float = amount
-        self.date: datetime = datetime.now()
+        self.date: datetime = date if date is not None else clock.now()
         self.category: str = category
         self.description: str = description
+        self._account: Optional["Account"] = None
+        self._position: int = -1
 
     def __str__(self) -> str:
         """
@@ -34,18 +118,170 @@ class Transaction:
         Returns:
             str: Descrição formatada da transação.
         """
-        return f"Transação: {self.description} R$ {self.amount:.2f} ({self.category})"
+        return TRANSACTION_FORMAT.format(self.description, self.amount, self.category)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}({self.amount!r}, {self.category!r}, {self.description!r}, date={self.date!r})"
+        )
 
     def update(self, **attributes) -> None:
         """
         Atualiza um ou mais atributos da transação.
 
         Args:
-            attributes: Atributos a serem atualizados, passados como argumentos nomeados.
+            attributes: Atributos a serem atualizados (amount, date, category ou
+                description), passados como argumentos nomeados.
+
+        Todos os valores são validados antes de qualquer alteração, e a transação,
+        o ledger, o saldo e os índices da conta são alterados em um único passo: se a
+        gravação no ledger falhar, a transação e o saldo voltam aos valores anteriores.
+
+        Raises:
+            AttributeError: Se algum nome não for um atributo da transação; nesse caso,
+                nenhum atributo é alterado.
+            TypeError: Se algum valor for inválido; nesse caso, nenhum atributo é alterado.
         """
-        for key, value in attributes.items():
-            if hasattr(self, key):
+        unknown = [key for key in attributes if key not in self.FIELDS]
+        if unknown:
+            raise AttributeError(f"Atributos inválidos para {type(self).__name__}: {', '.join(unknown)}")
+        _check_fields(
+            *(attributes.get(key, getattr(self, key)) for key in ("amount", "category", "description", "date")),
+            source=attributes
+        )
+        account = self._account
+        with account._lock if account is not None else _NO_LOCK:
+            if account is not None:
+                # Outra view da mesma posição (ledgers colunares) pode ter alterado a transação
+                stored = account.transactions[self._position]
+                if stored is not self:
+                    for key in self.FIELDS:
+                        setattr(self, key, getattr(stored, key))
+            previous = {key: getattr(self, key) for key in attributes}
+            for key, value in attributes.items():
                 setattr(self, key, value)
+            if account is not None:
+                try:
+                    account._transaction_updated(self, previous)
+                except BaseException:
+                    for key, value in previous.items():
+                        setattr(self, key, value)
+                    raise
+
+    def freeze(self) -> "FrozenTransaction":
+        """
+        Retorna uma cópia imutável da transação.
+
+        Returns:
+            FrozenTransaction: A cópia imutável.
+        """
+        return FrozenTransaction(self.amount, self.category, self.description, self.date)
+
+
+class FrozenTransaction(Transaction):
+    """
+    Transação imutável, que pode ser comparada e usada como chave de dicionários.
+
+    Transações imutáveis não pertencem a contas; Account.add_transactions aceita
+    uma delas como linha e adiciona uma cópia alterável.
+    """
+
+    __slots__ = ()
+
+    def __init__(
+        self,
+        amount: float,
+        category: str,
+        description: str = "",
+        date: Optional[datetime] = None
+    ) -> None:
+        """
+        Inicializa uma transação imutável.
+
+        Args:
+            amount (float): Valor da transação.
+            category (str): Categoria da transação.
+            description (str, optional): Descrição da transação. Padrão é "".
+            date (datetime, optional): Data da transação. Padrão é o momento atual.
+        """
+        set_field = object.__setattr__
+        set_field(self, "amount", amount)
+        set_field(self, "date", date if date is not None else clock.now())
+        set_field(self, "category", category)
+        set_field(self, "description", description)
+        set_field(self, "_account", None)
+        set_field(self, "_position", -1)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"{type(self).__name__} é imutável.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} é imutável.")
+
+    def __reduce__(self):
+        # Recria a transação pelo construtor, já que __setattr__ não pode ser usado
+        return type(self), (self.amount, self.category, self.description, self.date)
+
+    def _fields(self) -> Tuple:
+        return (self.amount, self.date, self.category, self.description)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FrozenTransaction):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __hash__(self) -> int:
+        return hash(self._fields())
+
+    def update(self, **attributes) -> None:
+        """
+        Transações imutáveis não podem ser alteradas.
+
+        Raises:
+            AttributeError: Sempre.
+        """
+        raise AttributeError(f"{type(self).__name__} é imutável.")
+
+    def freeze(self) -> "FrozenTransaction":
+        """
+        Retorna a própria transação, que já é imutável.
+
+        Returns:
+            FrozenTransaction: A própria transação.
+        """
+        return self
+
+
+class TransactionPage:
+    """
+    Uma página de transações (ver Account.get_transactions_page).
+
+    Atributos:
+        transactions (List[Transaction]): Transações da página.
+        cursor (int | None): Cursor da próxima página, ou None se esta for a última.
+    """
+
+    __slots__ = ("transactions", "cursor")
+
+    def __init__(self, transactions: List[Transaction], cursor: Optional[int]) -> None:
+        """
+        Inicializa uma página.
+
+        Args:
+            transactions (List[Transaction]): Transações da página.
+            cursor (int | None): Cursor da próxima página, ou None se esta for a última.
+        """
+        self.transactions: List[Transaction] = transactions
+        self.cursor: Optional[int] = cursor
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return iter(self.transactions)
+
+    def __repr__(self) -> str:
+        return f"TransactionPage({len(self.transactions)} transações, cursor={self.cursor!r})"
 
 
 class Account:
@@ -55,21 +291,67 @@ class Account:
     Atributos:
         name (str): Nome da conta.
         balance (float): Saldo da conta.
-        transactions (List[Transaction]): Lista de transações na conta.
+        transactions (ListLedger | ColumnarLedger): Transações na conta.
     """
 
-    def __init__(self, name: str) -> None:
+    def __init__(
+        self,
+        name: str,
+        ledger: Optional[Union[ListLedger, ColumnarLedger]] = None,
+        concurrent: bool = False
+    ) -> None:
         """
         Inicializa uma conta.
 
         Args:
             name (str): Nome da conta.
+            ledger (ListLedger | ColumnarLedger, optional): Armazenamento das transações.
+                Padrão é uma lista de objetos Transaction (ListLedger).
+            concurrent (bool, optional): Se a conta pode ser alterada por várias threads.
+                Nesse caso, as alterações são serializadas por um lock próprio da conta.
+                Padrão é False.
         """
         self.name: str = name
-        self.balance: float = 0.0
-        self.transactions: List[Transaction] = []
+        self._lock = threading.RLock() if concurrent else _NO_LOCK
+        self._client: Optional["Client"] = None
+        self._balance: float = 0.0
+        self.transactions: Union[ListLedger, ColumnarLedger] = ledger if ledger is not None else ListLedger()
+        self.transactions.account = self
+        self._date_index: Optional[DateIndex] = None
+        self._category_index: Optional[CategoryIndex] = None
+        self._balance_index: Optional[BalanceIndex] = None
+        self._text_index: Optional[TextIndex] = None
 
-    def add_transaction(self, amount: float, category: str, description: str = "") -> Transaction:
+    @property
+    def balance(self) -> float:
+        """
+        float: Saldo da conta. Alterações são comunicadas ao cliente dono da conta.
+        """
+        return self._balance
+
+    @balance.setter
+    def balance(self, value: float) -> None:
+        with self._lock:
+            self._set_balance(value)
+            if self._client is not None and self._client._listeners:
+                self._client._emit("balance", self)
+
+    def _set_balance(self, value: float) -> None:
+        """
+        Altera o saldo sem gerar um evento "balance" (usado quando o saldo muda por
+        causa de transações, que já geram seus próprios eventos).
+        """
+        self._balance = value
+        if self._client is not None:
+            self._client._accounts_version += 1
+
+    def add_transaction(
+        self,
+        amount: float,
+        category: str,
+        description: str = "",
+        date: Optional[datetime] = None
+    ) -> Transaction:
         """
         Adiciona uma transação à conta e atualiza o saldo.
 
@@ -77,15 +359,400 @@ class Account:
             amount (float): Valor da transação.
             category (str): Categoria da transação.
             description (str, optional): Descrição da transação. Padrão é "".
+            date (datetime, optional): Data da transação. Padrão é o momento atual.
 
         Returns:
             Transaction: A transação criada.
+
+        Raises:
+            TypeError: Se algum valor for inválido; nesse caso, a conta não é alterada.
         """
-        transaction = Transaction(amount, category, description)
-        self.transactions.append(transaction)
-        self.balance += amount
+        transaction = Transaction(amount, category, description, date)
+        _check_fields(amount, category, description, transaction.date, transaction)
+        timestamp = to_micros(transaction.date)
+        with self._lock:
+            transaction._account = self
+            transaction._position = len(self.transactions)
+            self.transactions.append(transaction)
+            self._set_balance(self._balance + amount)
+            if self._date_index is not None:
+                self._date_index.insert(timestamp, transaction._position)
+            if self._category_index is not None:
+                self._category_index.add(category, amount, transaction._position)
+            if self._balance_index is not None:
+                self._balance_index.insert(timestamp, transaction._position, amount)
+            if self._text_index is not None:
+                self._text_index.add(transaction.description, transaction._position)
+            if self._client is not None and self._client._listeners:
+                self._client._emit("add", self, [transaction])
         return transaction
 
+    def add_transactions(self, rows: Iterable[Union[Transaction, Sequence]]) -> Sequence[Transaction]:
+        """
+        Adiciona várias transações à conta de uma só vez.
+
+        Todas as linhas são validadas antes de qualquer alteração: se uma delas for
+        inválida, nenhuma transação é adicionada. Saldo, ledger e índices são
+        atualizados em uma única passada, diretamente a partir das colunas das linhas:
+        ledgers colunares não criam um objeto Transaction por linha.
+
+        Args:
+            rows (Iterable[Transaction | Sequence]): Transações ainda não associadas a uma
+                conta, ou sequências (valor, categoria[, descrição[, data]]).
+
+        Returns:
+            Sequence[Transaction]: As transações adicionadas (em ledgers que não guardam
+                objetos Transaction, criadas apenas quando acessadas).
+
+        Raises:
+            TypeError: Se uma linha não tiver o formato esperado.
+            ValueError: Se uma linha tiver um valor inválido.
+        """
+        staged = self._stage(rows)
+        with self._lock:
+            return self._commit(staged)
+
+    @staticmethod
+    def _stage(rows: Iterable[Union[Transaction, Sequence]]) -> _StagedRows:
+        """
+        Valida as linhas de add_transactions e as separa em colunas.
+
+        Args:
+            rows (Iterable[Transaction | Sequence]): Transações ou sequências (valor, categoria[, descrição[, data]]).
+
+        Returns:
+            _StagedRows: As linhas validadas.
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        staged = _StagedRows()
+        # Caminho rápido: tuplas (valor, categoria, descrição, data) com os tipos exatos,
+        # transpostas e verificadas coluna a coluna
+        if rows and set(map(type, rows)) == {tuple} and set(map(len, rows)) == {4}:
+            amounts, categories, descriptions, dates = map(list, zip(*rows))
+            if (
+                set(map(type, amounts)) <= {float, int} and set(map(type, categories)) == {str}
+                and set(map(type, descriptions)) == {str} and set(map(type, dates)) == {datetime}
+                and set(map(attrgetter("tzinfo"), dates)) == {None}
+            ):
+                staged.amounts, staged.categories, staged.descriptions, staged.dates = amounts, categories, descriptions, dates
+                return staged
+        amounts, categories, descriptions, dates = staged.amounts, staged.categories, staged.descriptions, staged.dates
+        for row in rows:
+            if isinstance(row, Transaction):
+                if not isinstance(row, FrozenTransaction):
+                    if row._account is not None:
+                        raise ValueError("A transação já pertence a uma conta.")
+                    staged.transactions.append((len(amounts), row))
+                amount, category, description, date = row.amount, row.category, row.description, row.date
+            else:
+                size = len(row)
+                if size == 4:
+                    amount, category, description, date = row
+                elif size == 2:
+                    (amount, category), description, date = row, "", None
+                elif size == 3:
+                    (amount, category, description), date = row, None
+                else:
+                    raise TypeError(f"Linha inválida: {row!r}")
+                if date is None:
+                    date = clock.now()
+            # Verificação rápida dos tipos exatos; os demais casos passam por _check_fields
+            if not (
+                type(amount) is float and type(category) is str and type(description) is str
+                and type(date) is datetime and date.tzinfo is None
+            ):
+                _check_fields(amount, category, description, date, row)
+            amounts.append(amount)
+            categories.append(category)
+            descriptions.append(description)
+            dates.append(date)
+        return staged
+
+    def _commit(self, staged: _StagedRows) -> Sequence[Transaction]:
+        """
+        Grava linhas já validadas no ledger, no saldo e nos índices.
+
+        Deve ser chamado com o lock da conta adquirido.
+
+        Args:
+            staged (_StagedRows): Linhas validadas por _stage.
+
+        Returns:
+            Sequence[Transaction]: As transações adicionadas.
+        """
+        first = len(self.transactions)
+        transactions = self.transactions.extend_rows(staged)
+        if not staged:
+            return transactions
+        self._set_balance(self._balance + sum(staged.amounts))
+        positions = range(first, first + len(staged))
+        if self._date_index is not None or self._balance_index is not None:
+            timestamps = [to_micros(date) for date in staged.dates]
+            if self._date_index is not None:
+                self._date_index.extend(timestamps, positions)
+            if self._balance_index is not None:
+                self._balance_index.extend(timestamps, positions, staged.amounts)
+        if self._category_index is not None:
+            add = self._category_index.add
+            for category, amount, position in zip(staged.categories, staged.amounts, positions):
+                add(category, amount, position)
+        if self._text_index is not None:
+            add = self._text_index.add
+            for description, position in zip(staged.descriptions, positions):
+                add(description, position)
+        if self._client is not None and self._client._listeners:
+            self._client._emit("add", self, transactions)
+        return transactions
+
+    def _transaction_updated(self, transaction: Transaction, previous: dict) -> None:
+        """
+        Grava no ledger e nos índices as alterações feitas em uma transação da conta.
+
+        Alterações no valor da transação também são refletidas no saldo. Se a gravação
+        no ledger falhar, o saldo é restaurado e nenhum índice é alterado (os valores já
+        foram validados, e os índices, em memória, não falham). Deve ser chamado com o
+        lock da conta adquirido.
+
+        Args:
+            transaction (Transaction): Transação alterada via Transaction.update.
+            previous (dict): Valores anteriores dos atributos alterados.
+        """
+        position = transaction._position
+        old_amount = previous.get("amount", transaction.amount)
+        old_category = previous.get("category", transaction.category)
+        # O saldo é atualizado antes da gravação no ledger, que pode gravá-lo junto com a transação
+        old_balance = self._balance
+        if old_amount != transaction.amount:
+            self._set_balance(old_balance + transaction.amount - old_amount)
+        try:
+            self.transactions.store(position, transaction)
+        except BaseException:
+            if self._balance != old_balance:
+                self._set_balance(old_balance)
+            raise
+        if self._date_index is not None and "date" in previous and previous["date"] != transaction.date:
+            self._date_index.remove(to_micros(previous["date"]), position)
+            self._date_index.insert(to_micros(transaction.date), position)
+        if self._balance_index is not None:
+            old_date = previous.get("date", transaction.date)
+            if old_date != transaction.date:
+                self._balance_index.remove(to_micros(old_date), position)
+                self._balance_index.insert(to_micros(transaction.date), position, transaction.amount)
+            elif old_amount != transaction.amount:
+                self._balance_index.adjust(to_micros(old_date), position, transaction.amount - old_amount)
+        if self._category_index is not None:
+            if old_category != transaction.category:
+                self._category_index.remove(old_category, old_amount, position)
+                self._category_index.add(transaction.category, transaction.amount, position)
+            elif old_amount != transaction.amount:
+                self._category_index.adjust(transaction.category, transaction.amount - old_amount)
+        if self._text_index is not None and previous.get("description", transaction.description) != transaction.description:
+            self._text_index.remove(previous["description"], position)
+            self._text_index.add(transaction.description, position)
+        if self._client is not None and self._client._listeners:
+            self._client._emit("update", self, transaction, previous)
+
+    def _get_date_index(self) -> DateIndex:
+        """
+        Retorna o índice por data da conta, construindo-o na primeira consulta.
+
+        Returns:
+            DateIndex: O índice por data.
+        """
+        if self._date_index is None:
+            with self._lock:
+                if self._date_index is None:
+                    self._date_index = DateIndex.build(self.transactions.date_micros())
+        return self._date_index
+
+    def _get_balance_index(self) -> BalanceIndex:
+        """
+        Retorna o índice de saldos da conta, construindo-o na primeira consulta.
+
+        Returns:
+            BalanceIndex: O índice de saldos.
+        """
+        if self._balance_index is None:
+            with self._lock:
+                if self._balance_index is None:
+                    amounts = [amount for _, amount in self.transactions.category_amounts()]
+                    self._balance_index = BalanceIndex.build(self.transactions.date_micros(), amounts)
+        return self._balance_index
+
+    def _get_category_index(self) -> CategoryIndex:
+        """
+        Retorna o índice por categoria da conta, construindo-o na primeira consulta.
+
+        Returns:
+            CategoryIndex: O índice por categoria.
+        """
+        if self.transactions.indexed:
+            return self.transactions.category_index()
+        if self._category_index is None:
+            with self._lock:
+                if self._category_index is None:
+                    self._category_index = CategoryIndex.build(self.transactions.category_amounts())
+        return self._category_index
+
+    def _get_text_index(self) -> TextIndex:
+        """
+        Retorna o índice das descrições da conta, construindo-o na primeira consulta.
+
+        Returns:
+            TextIndex: O índice das descrições.
+        """
+        if self._text_index is None:
+            with self._lock:
+                if self._text_index is None:
+                    self._text_index = TextIndex.build(self.transactions.description_texts())
+        return self._text_index
+
+    def get_category_total(self, category: str) -> float:
+        """
+        Retorna a soma dos valores das transações de uma categoria.
+
+        Args:
+            category (str): Categoria desejada.
+
+        Returns:
+            float: Total da categoria (0.0 se não houver transações).
+        """
+        index = self._get_category_index()
+        with self._lock:
+            return index.totals.get(category, 0.0)
+
+    def get_category_count(self, category: str) -> int:
+        """
+        Retorna a quantidade de transações de uma categoria.
+
+        Args:
+            category (str): Categoria desejada.
+
+        Returns:
+            int: Quantidade de transações da categoria.
+        """
+        index = self._get_category_index()
+        with self._lock:
+            return index.counts.get(category, 0)
+
+    def get_category_totals(self) -> Dict[str, float]:
+        """
+        Retorna o total de cada categoria da conta.
+
+        Returns:
+            Dict[str, float]: Soma dos valores por categoria.
+        """
+        index = self._get_category_index()
+        with self._lock:
+            return dict(index.totals)
+
+    def balance_at(self, date: datetime) -> float:
+        """
+        Retorna o saldo da conta ao final de uma data.
+
+        O saldo histórico é o saldo atual menos as transações posteriores à data, de
+        modo que um saldo inicial sem transações (por exemplo, definido diretamente
+        em balance) também é considerado. A consulta usa o índice de saldos (somas
+        acumuladas por data, construído na primeira consulta e mantido a cada
+        alteração) e custa O(log n).
+
+        Args:
+            date (datetime): Data da consulta (transações nessa data são incluídas).
+
+        Returns:
+            float: O saldo na data.
+        """
+        index = self._get_balance_index()
+        with self._lock:
+            return self.balance - index.total() + index.total_until(to_micros(date))
+
+    def balance_series(
+        self,
+        start: datetime,
+        end: datetime,
+        step: Union[timedelta, int] = timedelta(days=1)
+    ) -> Iterator[Tuple[datetime, float]]:
+        """
+        Percorre os saldos da conta em datas igualmente espaçadas entre start e end.
+
+        Os saldos são calculados sob demanda, em blocos, avançando pelo índice de
+        saldos sem recomeçar a busca a cada data.
+
+        Args:
+            start (datetime): Primeira data.
+            end (datetime): Data final (incluída se cair em um passo).
+            step (timedelta | int, optional): Intervalo entre as datas, ou um número de
+                meses de calendário (por exemplo, 1 para saldos mensais). Padrão é um dia.
+
+        Returns:
+            Iterator[Tuple[datetime, float]]: Pares (data, saldo), em ordem crescente.
+
+        Raises:
+            ValueError: Se o intervalo não for positivo.
+        """
+        if (step <= timedelta(0)) if isinstance(step, timedelta) else step < 1:
+            raise ValueError("O intervalo entre as datas deve ser positivo.")
+        index = self._get_balance_index()
+        count = 0
+        while True:
+            if isinstance(step, timedelta):
+                dates = [start + step * k for k in range(count, count + 1024)]
+            else:
+                dates = [add_months(start, step * k) for k in range(count, count + 1024)]
+            dates = [date for date in dates if date <= end]
+            if not dates:
+                return
+            with self._lock:
+                offset = self.balance - index.total()
+                balances = [offset + total for total in index.totals_until(map(to_micros, dates))]
+            yield from zip(dates, balances)
+            count += len(dates)
+
+    def _select_positions(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        category: Optional[str],
+        copy: bool = False
+    ) -> Tuple[Sequence[int], Optional[str], bool]:
+        """
+        Seleciona, com os índices, as posições das transações de uma consulta.
+
+        Filtros por data e por categoria usam índices, com custo O(log n + k). Deve ser
+        chamado com o lock da conta adquirido.
+
+        Args:
+            start_date (datetime, optional): Data inicial para filtro.
+            end_date (datetime, optional): Data final para filtro.
+            category (str, optional): Categoria para filtrar.
+            copy (bool, optional): Se as posições de um índice são copiadas (para uso
+                fora do lock). Padrão é False.
+
+        Returns:
+            Tuple[Sequence[int], str | None, bool]: As posições, em ordem crescente; a
+            categoria que ainda deve ser filtrada (ou None); e se as datas ainda devem
+            ser conferidas.
+        """
+        category_positions = self._get_category_index().positions.get(category, ()) if category else None
+        if start_date is None and end_date is None:
+            if category_positions is None:
+                return range(len(self.transactions)), None, False
+            return list(category_positions) if copy else category_positions, None, False
+        index = self._get_date_index()
+        lo, hi = index.span(
+            to_micros(start_date) if start_date is not None else None,
+            to_micros(end_date) if end_date is not None else None
+        )
+        if index.ordered:
+            # Ledger em ordem cronológica: as posições do período são lo, ..., hi - 1
+            if category_positions is None:
+                return range(lo, hi), None, False
+            first = bisect_left(category_positions, lo)
+            return category_positions[first:bisect_left(category_positions, hi, first)], None, False
+        if category_positions is not None and len(category_positions) < hi - lo:
+            return list(category_positions) if copy else category_positions, None, True
+        return sorted(index.positions[lo:hi]), category, False
+
     def get_transactions(
         self,
         start_date: Optional[datetime] = None,
@@ -95,6 +762,18 @@ class Account:
         """
         Retorna uma lista de transações filtradas por data e/ou categoria.
 
+        Filtros por data e por categoria usam índices (construídos na primeira
+        consulta e mantidos a cada alteração), com custo O(log n + k). Ledgers com
+        índices próprios (como SQLiteLedger) resolvem a consulta diretamente. As
+        transações são retornadas na ordem em que foram adicionadas, sempre em uma
+        nova lista. Para percorrer ou paginar históricos longos sem montar a lista
+        inteira, use iter_transactions ou get_transactions_page.
+
+        No modo concorrente, a consulta não é livre de locks: a busca nos índices é
+        feita com o lock da conta adquirido (por um tempo O(log n + k), concorrendo
+        com as inclusões na conta), e apenas a materialização das transações
+        acontece fora dele.
+
         Args:
             start_date (datetime, optional): Data inicial para filtro. Padrão é None.
             end_date (datetime, optional): Data final para filtro. Padrão é None.
@@ -103,28 +782,229 @@ class Account:
         Returns:
             List[Transaction]: Lista de transações filtradas.
         """
-        filtered = self.transactions
-        if start_date:
-            filtered = [t for t in filtered if t.date >= start_date]
-        if end_date:
-            filtered = [t for t in filtered if t.date <= end_date]
-        if category:
-            filtered = [t for t in filtered if t.category == category]
-        return filtered
+        if self.transactions.indexed:
+            return self.transactions.filter(start_date, end_date, category)
+        concurrent = self._lock is not _NO_LOCK
+        if not concurrent and start_date is None and end_date is None and not category:
+            return self.transactions.filter()
+        with self._lock:
+            positions, category, check_dates = self._select_positions(start_date, end_date, category, concurrent)
+        # As posições já selecionadas não mudam com novas inclusões, então as
+        # transações são materializadas fora do lock.
+        transactions = self.transactions.take(positions, category)
+        if check_dates:
+            return [
+                t for t in transactions
+                if (start_date is None or t.date >= start_date) and (end_date is None or t.date <= end_date)
+            ]
+        return transactions
+
+    def iter_transactions(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        after: Optional[int] = None
+    ) -> Iterator[Transaction]:
+        """
+        Percorre sob demanda as transações filtradas por data e/ou categoria.
+
+        As transações seguem a ordem de get_transactions (a ordem em que foram
+        adicionadas), mas são materializadas aos poucos, à medida que são consumidas:
+        ler as primeiras transações de um histórico longo custa O(log n + limit).
+        Transações adicionadas depois do início da iteração não são incluídas.
+
+        Args:
+            start_date (datetime, optional): Data inicial para filtro. Padrão é None.
+            end_date (datetime, optional): Data final para filtro. Padrão é None.
+            category (str, optional): Categoria para filtrar. Padrão é None.
+            offset (int, optional): Quantidade de transações filtradas a pular. Padrão é 0.
+            limit (int, optional): Máximo de transações. Padrão é None (todas).
+            after (int, optional): Cursor: percorre apenas as transações adicionadas depois
+                da transação com esta posição (ver get_transactions_page). Padrão é None.
+
+        Returns:
+            Iterator[Transaction]: Transações filtradas.
+
+        Raises:
+            ValueError: Se offset ou limit forem negativos.
+        """
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("offset e limit não podem ser negativos.")
+        if self.transactions.indexed:
+            transactions = self.transactions.scan(start_date, end_date, category, after if after is not None else -1)
+            return itertools.islice(transactions, offset, offset + limit if limit is not None else None)
+        return itertools.islice(self._scan(start_date, end_date, category, offset, after), limit)
+
+    def _scan(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        category: Optional[str],
+        offset: int,
+        after: Optional[int]
+    ) -> Iterator[Transaction]:
+        """
+        Percorre as transações de iter_transactions em ledgers sem índices próprios.
+
+        As posições são selecionadas e copiadas com o lock adquirido; as transações são
+        materializadas fora do lock, em blocos crescentes (SCAN_CHUNK no máximo).
+        """
+        with self._lock:
+            positions, category, check_dates = self._select_positions(start_date, end_date, category)
+            # Fatiar copia as posições dos índices, que podem mudar durante a iteração
+            positions = positions[bisect_right(positions, after) if after is not None else 0:]
+        if not category and not check_dates:
+            positions, offset = positions[offset:], 0
+        take = self.transactions.take
+        i, size = 0, 64
+        while i < len(positions):
+            transactions = take(positions[i:i + size], category)
+            i, size = i + size, min(2 * size, SCAN_CHUNK)
+            if check_dates:
+                transactions = [
+                    t for t in transactions
+                    if (start_date is None or t.date >= start_date) and (end_date is None or t.date <= end_date)
+                ]
+            if offset:
+                skipped = min(offset, len(transactions))
+                transactions, offset = transactions[skipped:], offset - skipped
+            yield from transactions
+
+    def get_transactions_page(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[int] = None
+    ) -> "TransactionPage":
+        """
+        Retorna uma página de transações filtradas por data e/ou categoria.
+
+        A primeira página é obtida sem cursor; as seguintes, com o cursor da página
+        anterior. O cursor continua válido mesmo que novas transações sejam
+        adicionadas entre as consultas (elas aparecem nas páginas seguintes).
+
+        Exemplo:
+            page = account.get_transactions_page(category="Food", limit=20)
+            while page.cursor is not None:
+                page = account.get_transactions_page(category="Food", limit=20, cursor=page.cursor)
+
+        Args:
+            start_date (datetime, optional): Data inicial para filtro. Padrão é None.
+            end_date (datetime, optional): Data final para filtro. Padrão é None.
+            category (str, optional): Categoria para filtrar. Padrão é None.
+            limit (int, optional): Máximo de transações na página. Padrão é 50.
+            cursor (int, optional): Cursor da página anterior. Padrão é None (primeira página).
+
+        Returns:
+            TransactionPage: A página, com o cursor da próxima (None na última).
+
+        Raises:
+            ValueError: Se limit não for positivo.
+        """
+        if limit <= 0:
+            raise ValueError("O tamanho da página deve ser positivo.")
+        transactions = list(self.iter_transactions(start_date, end_date, category, limit=limit + 1, after=cursor))
+        more = len(transactions) > limit
+        del transactions[limit:]
+        return TransactionPage(transactions, transactions[-1]._position if more else None)
+
+    def search(
+        self,
+        text: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None
+    ) -> List[Transaction]:
+        """
+        Busca as transações cujas descrições contêm todas as palavras de um texto.
+
+        As palavras são comparadas sem diferenciar maiúsculas de minúsculas nem acentos
+        ("supermercado" encontra "Supermercado São João"). A busca usa um índice
+        invertido das descrições (construído na primeira busca e mantido a cada
+        alteração) e custa O(k log n), em que k é o número de transações com a palavra
+        menos frequente.
+
+        Args:
+            text (str): Palavras a buscar.
+            start_date (datetime, optional): Data inicial para filtro. Padrão é None.
+            end_date (datetime, optional): Data final para filtro. Padrão é None.
+            category (str, optional): Categoria para filtrar. Padrão é None.
+
+        Returns:
+            List[Transaction]: Transações encontradas, ordenadas por data.
+
+        Raises:
+            ValueError: Se o texto não tiver nenhuma palavra.
+        """
+        tokens = tokenize(text)
+        if not tokens:
+            raise ValueError("A busca precisa de ao menos uma palavra.")
+        with self._lock:
+            within = None
+            if category and not self.transactions.indexed:
+                within = self._get_category_index().positions.get(category, ())
+                category = None
+            positions = self._get_text_index().lookup(tokens, within)
+            if positions and (start_date is not None or end_date is not None) and not self.transactions.indexed:
+                # Período com menos transações que as encontradas: filtra pelas posições do período
+                index = self._get_date_index()
+                lo, hi = index.span(
+                    to_micros(start_date) if start_date is not None else None,
+                    to_micros(end_date) if end_date is not None else None
+                )
+                if hi - lo < len(positions):
+                    in_range = set(index.positions[lo:hi])
+                    positions = [p for p in positions if p in in_range]
+        transactions = [
+            t for t in self.transactions.take(positions, category)
+            if (start_date is None or t.date >= start_date) and (end_date is None or t.date <= end_date)
+        ]
+        transactions.sort(key=attrgetter("date"))
+        return transactions
 
 
 class Investment:
     """
     Representa um investimento financeiro.
 
+    Os investimentos usam __slots__: não há um __dict__ por objeto.
+
+    Por padrão, o investimento rende por meses de 30 dias completos desde a compra.
+    Com outra convenção de contagem de dias (ver daycount) ou com aportes
+    periódicos, o valor vem de um cronograma de rendimento (AccrualSchedule),
+    calculado uma única vez e refeito apenas quando o investimento muda.
+
     Atributos:
         type (str): Tipo do investimento.
         initial_amount (float): Valor inicial investido.
         date_purchased (datetime): Data da compra do investimento.
         rate_of_return (float): Taxa mensal de retorno (em decimal).
+        day_count (DayCount): Convenção de contagem de dias.
+        contributions (Tuple[ContributionSchedule, ...]): Aportes periódicos.
     """
 
-    def __init__(self, type: str, amount: float, rate_of_return: float) -> None:
+    FIELDS: Tuple[str, ...] = (
+        "type", "initial_amount", "date_purchased", "rate_of_return", "day_count", "contributions"
+    )
+    __slots__ = (
+        "type", "_initial_amount", "_date_purchased", "_rate_of_return", "_day_count", "_contributions",
+        "_client", "_valuation", "_schedule"
+    )
+
+    def __init__(
+        self,
+        type: str,
+        amount: float,
+        rate_of_return: float,
+        *,
+        day_count: Union[str, DayCount] = DEFAULT_CONVENTION,
+        contributions: Sequence[ContributionSchedule] = ()
+    ) -> None:
         """
         Inicializa um investimento.
 
@@ -132,21 +1012,189 @@ class Investment:
             type (str): Tipo do investimento.
             amount (float): Valor inicial investido.
             rate_of_return (float): Taxa de retorno mensal (em decimal).
+            day_count (str | DayCount, optional): Convenção de contagem de dias ("30d",
+                "30/360", "actual/365" ou "business/252"). Padrão é "30d".
+            contributions (Sequence[ContributionSchedule], optional): Aportes periódicos. Padrão é nenhum.
+
+        Raises:
+            ValueError: Se a convenção for desconhecida.
         """
+        self._client: Optional["Client"] = None
+        self._valuation: Optional[Tuple[float, datetime, datetime]] = None
+        self._schedule: Optional[AccrualSchedule] = None
         self.type: str = type
         self.initial_amount: float = amount
-        self.date_purchased: datetime = datetime.now()
+        self.date_purchased: datetime = clock.now()
         self.rate_of_return: float = rate_of_return
+        self.day_count: DayCount = day_count
+        self.contributions: Tuple[ContributionSchedule, ...] = contributions
+
+    def _changed(self, field: str) -> None:
+        """
+        Descarta a avaliação e o cronograma em cache e avisa o cliente dono do investimento.
+
+        Args:
+            field (str): Atributo alterado.
+        """
+        self._valuation = None
+        self._schedule = None
+        client = self._client
+        if client is not None:
+            client._investments_version += 1
+            if client._listeners:
+                client._emit("investment_update", self, field)
+
+    def _set(self, field: str, value) -> None:
+        """
+        Altera um atributo e avisa o cliente dono do investimento (ver _changed).
+
+        Com um cliente concorrente, a alteração e o aviso são feitos com o lock do
+        cliente adquirido, para que uma compactação do journal não os separe.
+
+        Args:
+            field (str): Atributo alterado.
+            value: Novo valor, já convertido.
+        """
+        client = self._client
+        with client._lock if client is not None else _NO_LOCK:
+            setattr(self, "_" + field, value)
+            self._changed(field)
+
+    @property
+    def initial_amount(self) -> float:
+        """
+        float: Valor inicial investido.
+        """
+        return self._initial_amount
+
+    @initial_amount.setter
+    def initial_amount(self, value: float) -> None:
+        self._set("initial_amount", value)
+
+    @property
+    def date_purchased(self) -> datetime:
+        """
+        datetime: Data da compra do investimento.
+        """
+        return self._date_purchased
+
+    @date_purchased.setter
+    def date_purchased(self, value: datetime) -> None:
+        self._set("date_purchased", value)
+
+    @property
+    def rate_of_return(self) -> float:
+        """
+        float: Taxa mensal de retorno (em decimal).
+        """
+        return self._rate_of_return
+
+    @rate_of_return.setter
+    def rate_of_return(self, value: float) -> None:
+        self._set("rate_of_return", value)
+
+    @property
+    def day_count(self) -> DayCount:
+        """
+        DayCount: Convenção de contagem de dias (pode ser definida pelo nome).
+        """
+        return self._day_count
+
+    @day_count.setter
+    def day_count(self, value: Union[str, DayCount]) -> None:
+        self._set("day_count", get_convention(value))
+
+    @property
+    def contributions(self) -> Tuple[ContributionSchedule, ...]:
+        """
+        Tuple[ContributionSchedule, ...]: Aportes periódicos.
+        """
+        return self._contributions
+
+    @contributions.setter
+    def contributions(self, value: Sequence[ContributionSchedule]) -> None:
+        self._set("contributions", tuple(value))
+
+    def _accrual(self) -> Optional[AccrualSchedule]:
+        """
+        Retorna o cronograma de rendimento, ou None se o investimento usa a
+        convenção padrão sem aportes (avaliada diretamente, em lote).
+        """
+        if self._day_count is DEFAULT_CONVENTION and not self._contributions:
+            return None
+        schedule = self._schedule
+        if schedule is None:
+            schedule = self._schedule = AccrualSchedule(
+                self._day_count, self._rate_of_return, self._initial_amount, self._date_purchased, self._contributions
+            )
+        return schedule
+
+    def _cached_value_at(self, now: datetime) -> Optional[Tuple[float, datetime, datetime]]:
+        """
+        Retorna a avaliação em cache se ela for válida na data informada.
+
+        O valor só muda quando um novo mês (de 30 dias) se completa, por isso a
+        avaliação vale para todo o período [início, fim) do mês em que foi feita
+        (com um cronograma, até a próxima mudança de valor).
+
+        Args:
+            now (datetime): Data da avaliação.
+
+        Returns:
+            Tuple[float, datetime, datetime] | None: Valor, início e fim do período de validade.
+        """
+        valuation = self._valuation
+        if valuation is not None and valuation[1] <= now < valuation[2]:
+            return valuation
+        return None
 
-    def calculate_value(self) -> float:
+    def _cache_value(self, months_elapsed: int, value: float) -> Tuple[float, datetime, datetime]:
         """
-        Calcula o valor atual do investimento com base no tempo decorrido.
+        Guarda em cache o valor calculado para um número de meses desde a compra.
+
+        Args:
+            months_elapsed (int): Meses completos desde a compra.
+            value (float): Valor do investimento.
+
+        Returns:
+            Tuple[float, datetime, datetime]: Valor, início e fim do período de validade.
+        """
+        start = self.date_purchased + timedelta(days=30 * months_elapsed)
+        self._valuation = (value, start, start + timedelta(days=30))
+        return self._valuation
+
+    def _value_at(self, now: datetime) -> Tuple[float, datetime, datetime]:
+        """
+        Retorna o valor do investimento em uma data e o período em que ele é válido.
+
+        Args:
+            now (datetime): Data da avaliação.
+
+        Returns:
+            Tuple[float, datetime, datetime]: Valor, início e fim do período de validade.
+        """
+        valuation = self._cached_value_at(now)
+        if valuation is None:
+            schedule = self._accrual()
+            if schedule is not None:
+                valuation = self._valuation = schedule.valuation(now)
+                return valuation
+            months_elapsed = (now - self.date_purchased).days // 30
+            value = self.initial_amount * ((1 + self.rate_of_return) ** months_elapsed)
+            valuation = self._cache_value(months_elapsed, value)
+        return valuation
+
+    def calculate_value(self, as_of: Optional[datetime] = None) -> float:
+        """
+        Calcula o valor do investimento com base no tempo decorrido.
+
+        Args:
+            as_of (datetime, optional): Data da avaliação. Padrão é o momento atual (clock.now()).
 
         Returns:
-            float: Valor atual do investimento.
+            float: Valor do investimento na data.
         """
-        months_elapsed = (datetime.now() - self.date_purchased).days // 30
-        return self.initial_amount * ((1 + self.rate_of_return) ** months_elapsed)
+        return self._value_at(as_of if as_of is not None else clock.now())[0]
 
     def sell(self, account: Account) -> None:
         """
@@ -157,6 +1205,178 @@ class Investment:
         """
         value = self.calculate_value()
         account.add_transaction(value, "Investment Sale", f"Venda do investimento {self.type}")
+        if self._client is not None and self._client._listeners:
+            self._client._emit("sell", self, account)
+
+    def freeze(self) -> "FrozenInvestment":
+        """
+        Retorna uma cópia imutável do investimento.
+
+        Returns:
+            FrozenInvestment: A cópia imutável.
+        """
+        return FrozenInvestment(
+            self.type, self.initial_amount, self.rate_of_return, self.date_purchased,
+            day_count=self.day_count, contributions=self.contributions
+        )
+
+
+class FrozenInvestment(Investment):
+    """
+    Investimento imutável: tipo, valor inicial, taxa, data de compra, convenção e
+    aportes não podem ser alterados.
+
+    Pode ser adicionado a um cliente e vendido normalmente; apenas a avaliação em
+    cache (interna) é atualizada.
+    """
+
+    __slots__ = ()
+
+    def __init__(
+        self,
+        type: str,
+        amount: float,
+        rate_of_return: float,
+        date_purchased: Optional[datetime] = None,
+        *,
+        day_count: Union[str, DayCount] = DEFAULT_CONVENTION,
+        contributions: Sequence[ContributionSchedule] = ()
+    ) -> None:
+        """
+        Inicializa um investimento imutável.
+
+        Args:
+            type (str): Tipo do investimento.
+            amount (float): Valor inicial investido.
+            rate_of_return (float): Taxa de retorno mensal (em decimal).
+            date_purchased (datetime, optional): Data da compra. Padrão é o momento atual.
+            day_count (str | DayCount, optional): Convenção de contagem de dias. Padrão é "30d".
+            contributions (Sequence[ContributionSchedule], optional): Aportes periódicos. Padrão é nenhum.
+
+        Raises:
+            ValueError: Se a convenção for desconhecida.
+        """
+        self._client = None
+        self._valuation = None
+        self._schedule = None
+        self._initial_amount = amount
+        self._rate_of_return = rate_of_return
+        self._date_purchased = date_purchased if date_purchased is not None else clock.now()
+        self._day_count = get_convention(day_count)
+        self._contributions = tuple(contributions)
+        object.__setattr__(self, "type", type)
+
+    def __setattr__(self, name: str, value) -> None:
+        if name in Investment.FIELDS:
+            raise AttributeError(f"{type(self).__name__} é imutável.")
+        object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        # Recria o investimento pelo construtor; a avaliação em cache e o cliente não são copiados
+        return (
+            type(self), (self.type, self.initial_amount, self.rate_of_return, self.date_purchased),
+            {"_day_count": self.day_count, "_contributions": self.contributions}
+        )
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def freeze(self) -> "FrozenInvestment":
+        """
+        Retorna o próprio investimento, que já é imutável.
+
+        Returns:
+            FrozenInvestment: O próprio investimento.
+        """
+        return self
+
+
+class _Members(list):
+    """
+    Lista de contas ou de investimentos de um cliente.
+
+    Cada alteração da lista muda a versão correspondente do cliente (ver
+    Client.get_net_worth), e os objetos incluídos passam a avisar o cliente quando
+    mudam. Os eventos de subscribe continuam sendo gerados apenas por add_account e
+    add_investment.
+    """
+
+    __slots__ = ("_client", "_version")
+
+    def __init__(self, client: "Client", version: str, items: Iterable = ()) -> None:
+        """
+        Inicializa a lista.
+
+        Args:
+            client (Client): Cliente dono da lista.
+            version (str): Atributo do cliente com a versão alterada pela lista.
+            items (Iterable, optional): Objetos iniciais. Padrão é nenhum.
+        """
+        items = self._link(client, items)
+        super().__init__(items)
+        self._client = client
+        self._version = version
+        self._changed()
+
+    def __reduce__(self):
+        return type(self), (self._client, self._version, list(self))
+
+    @staticmethod
+    def _link(client: "Client", items: Iterable) -> list:
+        items = list(items)
+        for item in items:
+            item._client = client
+        return items
+
+    def _changed(self) -> None:
+        client = self._client
+        setattr(client, self._version, getattr(client, self._version, 0) + 1)
+
+    def append(self, item) -> None:
+        super().append(*self._link(self._client, (item,)))
+        self._changed()
+
+    def extend(self, items: Iterable) -> None:
+        super().extend(self._link(self._client, items))
+        self._changed()
+
+    def insert(self, index: int, item) -> None:
+        super().insert(index, *self._link(self._client, (item,)))
+        self._changed()
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            super().__setitem__(index, self._link(self._client, value))
+        else:
+            super().__setitem__(index, *self._link(self._client, (value,)))
+        self._changed()
+
+    def __iadd__(self, items: Iterable) -> "_Members":
+        self.extend(items)
+        return self
+
+    def __imul__(self, count: int) -> "_Members":
+        super().__imul__(count)
+        self._changed()
+        return self
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._changed()
+
+    def pop(self, index: int = -1):
+        item = super().pop(index)
+        self._changed()
+        return item
+
+    def remove(self, item) -> None:
+        super().remove(item)
+        self._changed()
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
 
 
 class Client:
@@ -167,33 +1387,193 @@ class Client:
         name (str): Nome do cliente.
         accounts (List[Account]): Contas do cliente.
         investments (List[Investment]): Investimentos do cliente.
+        concurrent (bool): Se o cliente e suas contas podem ser alterados por várias threads.
     """
 
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, concurrent: bool = False) -> None:
         """
         Inicializa um cliente.
 
         Args:
             name (str): Nome do cliente.
+            concurrent (bool, optional): Se o cliente e suas contas podem ser alterados por
+                várias threads. Cada conta recebe um lock próprio, de modo que threads
+                que alteram contas diferentes não disputam o mesmo lock; consultas de
+                patrimônio não usam locks. Padrão é False.
         """
+        # Versões mudam a cada alteração de saldo ou de investimento; os totais em
+        # cache guardam a versão com que foram calculados (ver get_net_worth).
+        self._accounts_version: int = 0
+        self._accounts_total: Tuple[int, int, float] = (-1, 0, 0.0)
+        self._investments_version: int = 0
+        self._investments_total: Tuple[int, int, datetime, datetime, float] = (-1, 0, datetime.max, datetime.min, 0.0)
+        self._listeners: List[Callable[..., None]] = []
         self.name: str = name
         self.accounts: List[Account] = []
         self.investments: List[Investment] = []
+        self.concurrent: bool = concurrent
+        self._lock = threading.RLock() if concurrent else _NO_LOCK
+
+    @property
+    def accounts(self) -> List[Account]:
+        """
+        List[Account]: Contas do cliente. Contas incluídas diretamente na lista (ou em
+        uma lista atribuída) também passam a avisar o cliente quando mudam.
+        """
+        return self._accounts
+
+    @accounts.setter
+    def accounts(self, value: Iterable[Account]) -> None:
+        self._accounts = _Members(self, "_accounts_version", value)
+
+    @property
+    def investments(self) -> List[Investment]:
+        """
+        List[Investment]: Investimentos do cliente. Investimentos incluídos diretamente
+        na lista (ou em uma lista atribuída) também passam a avisar o cliente quando mudam.
+        """
+        return self._investments
+
+    @investments.setter
+    def investments(self, value: Iterable[Investment]) -> None:
+        self._investments = _Members(self, "_investments_version", value)
+
+    def subscribe(self, listener: Callable[..., None]) -> None:
+        """
+        Registra uma função chamada a cada alteração no cliente.
+
+        A função recebe o nome do evento seguido de seus argumentos:
+        - "account", conta: conta criada com add_account.
+        - "investment", investimento: investimento adicionado com add_investment.
+        - "add", conta, transações: transações adicionadas a uma conta.
+        - "update", conta, transação, valores anteriores: transação alterada com update.
+        - "sell", investimento, conta: investimento vendido (após o evento "add" da venda).
+        - "balance", conta: saldo definido diretamente (alterações por transações geram
+          apenas os eventos "add" e "update").
+        - "investment_update", investimento, atributo: atributo de um investimento alterado.
+
+        Args:
+            listener (Callable[..., None]): Função a ser chamada.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[..., None]) -> None:
+        """
+        Remove uma função registrada com subscribe.
+
+        Args:
+            listener (Callable[..., None]): Função a ser removida.
+        """
+        self._listeners.remove(listener)
+
+    def _emit(self, event: str, *args) -> None:
+        """
+        Avisa as funções registradas sobre uma alteração.
+        """
+        for listener in self._listeners:
+            listener(event, *args)
 
-    def add_account(self, account_name: str) -> Account:
+    def add_account(
+        self,
+        account_name: str,
+        ledger: Optional[Union[ListLedger, ColumnarLedger]] = None
+    ) -> Account:
         """
         Cria uma nova conta para o cliente.
 
         Args:
             account_name (str): Nome da conta.
+            ledger (ListLedger | ColumnarLedger, optional): Armazenamento das transações.
+                Padrão é None (lista de objetos Transaction).
 
         Returns:
             Account: A nova conta criada.
         """
-        account = Account(account_name)
-        self.accounts.append(account)
+        account = Account(account_name, ledger, self.concurrent)
+        account._client = self
+        with self._lock:
+            self.accounts.append(account)
+            if self._listeners:
+                self._emit("account", account)
         return account
 
+    def get_account(self, account_name: str) -> Optional[Account]:
+        """
+        Retorna a conta do cliente com o nome informado.
+
+        Args:
+            account_name (str): Nome da conta.
+
+        Returns:
+            Account | None: A conta encontrada, ou None.
+        """
+        for account in self.accounts:
+            if account.name == account_name:
+                return account
+        return None
+
+    def add_transactions(
+        self,
+        batches: Dict[str, Iterable[Union[Transaction, Sequence]]]
+    ) -> Dict[str, Sequence[Transaction]]:
+        """
+        Adiciona transações a várias contas do cliente de uma só vez.
+
+        Todas as linhas de todas as contas são validadas antes de qualquer alteração:
+        se uma delas for inválida, nenhuma conta é modificada. Contas inexistentes
+        são criadas.
+
+        Args:
+            batches (Dict[str, Iterable[Transaction | Sequence]]): Linhas a adicionar, por nome
+                de conta, no formato aceito por Account.add_transactions.
+
+        Returns:
+            Dict[str, Sequence[Transaction]]: As transações adicionadas, por nome de conta.
+
+        Raises:
+            TypeError: Se uma linha não tiver o formato esperado.
+            ValueError: Se uma linha tiver um valor inválido.
+        """
+        staged = {name: Account._stage(rows) for name, rows in batches.items()}
+        with self._lock:
+            accounts = [self.get_account(name) or self.add_account(name) for name in staged]
+        with ExitStack() as locks:
+            # Locks adquiridos sempre na mesma ordem, para evitar deadlocks entre lotes
+            for account in sorted(accounts, key=id):
+                locks.enter_context(account._lock)
+            return {name: account._commit(rows) for account, (name, rows) in zip(accounts, staged.items())}
+
+    def search(
+        self,
+        text: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Transaction]:
+        """
+        Busca, em todas as contas do cliente, as transações cujas descrições contêm
+        todas as palavras de um texto (ver Account.search).
+
+        Os resultados de cada conta, já ordenados por data, são intercalados em uma
+        única lista ordenada por data; transações da mesma data seguem a ordem das contas.
+
+        Args:
+            text (str): Palavras a buscar.
+            start_date (datetime, optional): Data inicial para filtro. Padrão é None.
+            end_date (datetime, optional): Data final para filtro. Padrão é None.
+            category (str, optional): Categoria para filtrar. Padrão é None.
+            limit (int, optional): Máximo de transações retornadas. Padrão é None (todas).
+
+        Returns:
+            List[Transaction]: Transações encontradas, ordenadas por data.
+
+        Raises:
+            ValueError: Se o texto não tiver nenhuma palavra.
+        """
+        results = [account.search(text, start_date, end_date, category) for account in list(self.accounts)]
+        return list(itertools.islice(heapq.merge(*results, key=attrgetter("date")), limit))
+
     def add_investment(self, investment: Investment) -> None:
         """
         Adiciona um investimento para o cliente.
@@ -201,15 +1581,64 @@ class Client:
         Args:
             investment (Investment): Investimento a ser adicionado.
         """
-        self.investments.append(investment)
+        investment._client = self
+        with self._lock:
+            self.investments.append(investment)
+            if self._listeners:
+                self._emit("investment", investment)
 
-    def get_net_worth(self) -> float:
+    def get_net_worth(self, as_of: Optional[datetime] = None) -> float:
         """
         Calcula o patrimônio líquido do cliente (contas + investimentos).
 
+        Os totais de contas e de investimentos ficam em cache. Contas e investimentos
+        avisam o cliente quando mudam, e o total dos investimentos também é refeito
+        quando algum deles completa um novo mês desde a compra. Nesse caso, apenas os
+        investimentos com avaliação vencida são recalculados, em lote (InvestmentBatch).
+
+        A consulta não usa locks: cada total em cache guarda a versão com que foi
+        calculado, e um total calculado enquanto outra thread alterava o cliente não
+        é reaproveitado na consulta seguinte.
+
+        Args:
+            as_of (datetime, optional): Data da avaliação dos investimentos. Padrão é o
+                momento atual (clock.now()).
+
         Returns:
             float: O patrimônio líquido total.
         """
-        accounts_total = sum(account.balance for account in self.accounts)
-        investments_total = sum(investment.calculate_value() for investment in self.investments)
+        accounts_version = self._accounts_version
+        version, seen, accounts_total = self._accounts_total
+        if version != accounts_version or seen != len(self.accounts):
+            accounts = list(self.accounts)
+            accounts_total = sum(account.balance for account in accounts)
+            self._accounts_total = (accounts_version, len(accounts), accounts_total)
+        now = as_of if as_of is not None else clock.now()
+        investments_version = self._investments_version
+        version, seen, valid_from, valid_until, investments_total = self._investments_total
+        if version != investments_version or seen != len(self.investments) or not valid_from <= now < valid_until:
+            investments = list(self.investments)
+            valuations = [investment._cached_value_at(now) for investment in investments]
+            stale = [i for i, valuation in enumerate(valuations) if valuation is None]
+            # Investimentos com cronograma são avaliados por busca binária no cronograma
+            for i in stale:
+                if investments[i]._accrual() is not None:
+                    valuations[i] = investments[i]._value_at(now)
+            batched = [i for i in stale if valuations[i] is None]
+            if batched:
+                batch = InvestmentBatch([investments[i] for i in batched])
+                for i, months, value in zip(batched, batch.months_at(now), batch.values_at(now)):
+                    valuations[i] = investments[i]._cache_value(months, value)
+            investments_total = 0.0
+            valid_from, valid_until = datetime.min, datetime.max
+            for value, start, end in valuations:
+                investments_total += value
+                valid_from, valid_until = max(valid_from, start), min(valid_until, end)
+            if self._investments_version == investments_version:
+                self._investments_total = (investments_version, len(investments), valid_from, valid_until, investments_total)
+            else:
+                # Um investimento mudou durante o cálculo: as avaliações feitas agora podem
+                # ter usado os valores anteriores e são descartadas.
+                for i in stale:
+                    investments[i]._valuation = None
         return accounts_total + investments_total
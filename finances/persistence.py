@@ -0,0 +1,502 @@
+"""
+Persistência de clientes em um formato binário compacto.
+
+Formato do arquivo (little-endian):
+- Cabeçalho: identificador "NGFS", versão, nome do cliente e posição das seções.
+- Tabela de strings: nomes, tipos, categorias e descrições, cada string distinta
+  guardada uma única vez e referenciada por identificador.
+- Contas: nome, saldo, quantidade de transações e posição das colunas.
+- Colunas de transações de cada conta, com largura fixa por transação: valor
+  (float64), data (int64, microssegundos), categoria (uint32) e descrição (uint32).
+- Investimentos: tipo, valor inicial, taxa de retorno, data de compra, convenção
+  de contagem de dias e quantidade de aportes periódicos.
+- Aportes periódicos dos investimentos, na ordem dos investimentos: valor,
+  intervalo em meses, data inicial, quantidade e data final (opcionais).
+
+Ao carregar com load_client, o arquivo é mapeado em memória: as colunas das
+transações são usadas diretamente a partir do mapeamento (MappedLedger), e o
+sistema operacional só lê do disco as páginas efetivamente acessadas.
+
+Arquivos da versão 1 (investimentos sem convenção nem aportes) continuam sendo lidos.
+"""
+
+import io
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .daycount import CONVENTIONS, ContributionSchedule
+from .ledger import ColumnarLedger, StringTable, to_micros, from_micros
+from .models import Client, Investment
+
+MAGIC = b"NGFS"
+VERSION = 2
+
+HEADER = struct.Struct("<4sHHIIIIQQQ")
+ACCOUNT = struct.Struct("<IdQQ")
+INVESTMENT = struct.Struct("<IddqII")
+CONTRIBUTION = struct.Struct("<dIqqq")
+# Investimentos da versão 1: tipo, valor inicial, taxa e data de compra
+INVESTMENT_V1 = struct.Struct("<Iddq")
+
+# Representa uma data ou quantidade ausente (None) nos aportes
+MISSING = -1 << 63
+
+# (formato no array, bytes por transação) de cada coluna, na ordem do arquivo
+COLUMNS = (("amounts", "d", 8), ("timestamps", "q", 8), ("categories", "I", 4), ("descriptions", "I", 4))
+RECORD_SIZE = sum(size for _, _, size in COLUMNS)
+
+
+def _little_endian(values: array) -> bytes:
+    """
+    Retorna os bytes de um array em ordem little-endian.
+    """
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _padding(offset: int) -> bytes:
+    """
+    Retorna os bytes nulos necessários para alinhar uma posição a 8 bytes.
+    """
+    return b"\0" * (-offset % 8)
+
+
+class MappedStringTable(StringTable):
+    """
+    Tabela de strings lida de um arquivo mapeado em memória.
+
+    As strings do arquivo são decodificadas apenas quando acessadas; novas strings
+    ficam em memória, com identificadores após os do arquivo.
+    """
+
+    def __init__(self, buffer: memoryview, offset: int, count: int) -> None:
+        """
+        Inicializa a tabela a partir da seção de strings do arquivo.
+
+        Args:
+            buffer (memoryview): Conteúdo do arquivo.
+            offset (int): Posição da seção de strings.
+            count (int): Quantidade de strings no arquivo.
+
+        Raises:
+            ValueError: Se as strings ultrapassarem o fim do buffer.
+        """
+        super().__init__()
+        self._buffer = buffer
+        self._offsets = buffer[offset:offset + 8 * (count + 1)].cast("Q")
+        self._blob = offset + 8 * (count + 1)
+        if self._blob + self._offsets[count] > len(buffer):
+            raise ValueError("Arquivo inválido: seção de strings truncada.")
+        self._count = count
+        self._decoded: Dict[int, str] = {}
+        self._ids_loaded = False
+
+    def _decode(self, string_id: int) -> str:
+        value = self._decoded.get(string_id)
+        if value is None:
+            start, end = self._offsets[string_id], self._offsets[string_id + 1]
+            value = self._decoded[string_id] = str(self._buffer[self._blob + start:self._blob + end], "utf-8")
+        return value
+
+    def _load_ids(self) -> None:
+        """
+        Monta o dicionário string -> identificador das strings do arquivo.
+        """
+        if not self._ids_loaded:
+            for string_id in range(self._count):
+                self._ids.setdefault(self._decode(string_id), string_id)
+            self._ids_loaded = True
+
+    def intern(self, value: str) -> int:
+        self._load_ids()
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._count + len(self._strings)
+            self._strings.append(value)
+            self._ids[value] = string_id
+        return string_id
+
+    def lookup(self, value: str) -> Optional[int]:
+        self._load_ids()
+        return self._ids.get(value)
+
+    def __getitem__(self, string_id: int) -> str:
+        if string_id < self._count:
+            return self._decode(string_id)
+        return self._strings[string_id - self._count]
+
+    def __len__(self) -> int:
+        return self._count + len(self._strings)
+
+
+class MappedColumn:
+    """
+    Coluna de um MappedLedger: valores do arquivo seguidos de valores adicionados em memória.
+
+    Os valores do arquivo podem ser alterados (a alteração não é gravada no arquivo).
+    """
+
+    def __init__(self, base: memoryview, typecode: str) -> None:
+        """
+        Inicializa a coluna.
+
+        Args:
+            base (memoryview): Valores lidos do arquivo.
+            typecode (str): Tipo dos valores, no formato do módulo array.
+        """
+        self.base = base
+        self.tail = array(typecode)
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self.tail)
+
+    def __getitem__(self, index: int):
+        size = len(self.base)
+        return self.base[index] if index < size else self.tail[index - size]
+
+    def __setitem__(self, index: int, value) -> None:
+        size = len(self.base)
+        if index < size:
+            self.base[index] = value
+        else:
+            self.tail[index - size] = value
+
+    def __iter__(self) -> Iterator:
+        yield from self.base
+        yield from self.tail
+
+    def append(self, value) -> None:
+        self.tail.append(value)
+
+    def extend(self, values: Iterable) -> None:
+        self.tail.extend(values)
+
+
+class MappedLedger(ColumnarLedger):
+    """
+    Ledger colunar cujas transações são lidas de um arquivo mapeado em memória.
+
+    Novas transações são mantidas em memória, após as do arquivo. Alterações são
+    aplicadas apenas à cópia em memória; use save_client para gravá-las.
+    """
+
+    def __init__(self, buffer: memoryview, offset: int, count: int, strings: MappedStringTable) -> None:
+        """
+        Inicializa o ledger a partir das colunas de uma conta no arquivo.
+
+        Args:
+            buffer (memoryview): Conteúdo do arquivo.
+            offset (int): Posição das colunas da conta.
+            count (int): Quantidade de transações da conta.
+            strings (MappedStringTable): Tabela de strings do arquivo.
+        """
+        super().__init__(strings)
+        for name, typecode, size in COLUMNS:
+            setattr(self, name, MappedColumn(buffer[offset:offset + size * count].cast(typecode), typecode))
+            offset += size * count
+
+
+def _columns(ledger, strings: StringTable) -> List[array]:
+    """
+    Retorna as colunas de um ledger, com identificadores da tabela de strings do arquivo.
+    """
+    if isinstance(ledger, ColumnarLedger):
+        remap = [strings.intern(ledger.strings[i]) for i in range(len(ledger.strings))]
+        return [
+            array("d", ledger.amounts),
+            array("q", ledger.timestamps),
+            array("I", (remap[i] for i in ledger.categories)),
+            array("I", (remap[i] for i in ledger.descriptions)),
+        ]
+    return [
+        array("d", (t.amount for t in ledger)),
+        array("q", (to_micros(t.date) for t in ledger)),
+        array("I", (strings.intern(t.category) for t in ledger)),
+        array("I", (strings.intern(t.description) for t in ledger)),
+    ]
+
+
+def _investment_records(investments: List[Investment], strings: StringTable) -> Tuple[List[bytes], List[bytes]]:
+    """
+    Codifica os investimentos e seus aportes periódicos.
+
+    Raises:
+        ValueError: Se algum investimento usar uma convenção que não seja uma das predefinidas.
+    """
+    records, contributions = [], []
+    for investment in investments:
+        convention = investment.day_count
+        if CONVENTIONS.get(convention.name) is not convention:
+            raise ValueError(f"A convenção {convention.name!r} do investimento {investment.type!r} não pode ser gravada.")
+        records.append(INVESTMENT.pack(
+            strings.intern(investment.type),
+            investment.initial_amount,
+            investment.rate_of_return,
+            to_micros(investment.date_purchased),
+            strings.intern(convention.name),
+            len(investment.contributions)
+        ))
+        contributions.extend(
+            CONTRIBUTION.pack(
+                schedule.amount,
+                schedule.every_months,
+                to_micros(schedule.start) if schedule.start is not None else MISSING,
+                schedule.count if schedule.count is not None else MISSING,
+                to_micros(schedule.end) if schedule.end is not None else MISSING
+            )
+            for schedule in investment.contributions
+        )
+    return records, contributions
+
+
+def _read_contribution(buffer: memoryview, offset: int) -> ContributionSchedule:
+    """
+    Decodifica um aporte periódico gravado por _investment_records.
+    """
+    amount, every_months, start, count, end = CONTRIBUTION.unpack_from(buffer, offset)
+    return ContributionSchedule(
+        amount,
+        every_months,
+        start=from_micros(start) if start != MISSING else None,
+        count=count if count != MISSING else None,
+        end=from_micros(end) if end != MISSING else None
+    )
+
+
+def write_client(client: Client, stream: BinaryIO) -> None:
+    """
+    Grava um cliente no formato binário em um arquivo aberto para escrita binária.
+
+    Args:
+        client (Client): O cliente a ser gravado.
+        stream (BinaryIO): Arquivo de destino.
+
+    Raises:
+        ValueError: Se algum investimento usar uma convenção de contagem de dias que
+            não seja uma das predefinidas.
+    """
+    strings = StringTable()
+    name_id = strings.intern(client.name)
+    accounts = [(strings.intern(account.name), account, _columns(account.transactions, strings)) for account in client.accounts]
+    investments, contributions = _investment_records(client.investments, strings)
+
+    encoded = [strings[i].encode("utf-8") for i in range(len(strings))]
+    offsets = array("Q", [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    string_section = _little_endian(offsets) + b"".join(encoded)
+
+    strings_offset = HEADER.size
+    accounts_offset = strings_offset + len(string_section)
+    accounts_offset += -accounts_offset % 8
+    investments_offset = accounts_offset + ACCOUNT.size * len(accounts)
+    investments_offset += -investments_offset % 8
+    contributions_offset = investments_offset + INVESTMENT.size * len(investments)
+    contributions_offset += -contributions_offset % 8
+    columns_offset = contributions_offset + CONTRIBUTION.size * len(contributions)
+    columns_offset += -columns_offset % 8
+
+    stream.write(HEADER.pack(
+        MAGIC, VERSION, 0, name_id, len(strings), len(accounts), len(investments),
+        strings_offset, accounts_offset, investments_offset
+    ))
+    stream.write(string_section)
+    stream.write(_padding(strings_offset + len(string_section)))
+    position = columns_offset
+    for account_name_id, account, columns in accounts:
+        count = len(columns[0])
+        stream.write(ACCOUNT.pack(account_name_id, account.balance, count, position))
+        position += RECORD_SIZE * count
+        position += -position % 8
+    stream.write(_padding(accounts_offset + ACCOUNT.size * len(accounts)))
+    stream.write(b"".join(investments))
+    stream.write(_padding(investments_offset + INVESTMENT.size * len(investments)))
+    stream.write(b"".join(contributions))
+    stream.write(_padding(contributions_offset + CONTRIBUTION.size * len(contributions)))
+    position = columns_offset
+    for _, _, columns in accounts:
+        for column in columns:
+            data = _little_endian(column)
+            stream.write(data)
+            position += len(data)
+        stream.write(_padding(position))
+        position += -position % 8
+
+
+def _fsync_directory(directory: str) -> None:
+    """
+    Sincroniza as entradas de um diretório (renomeações e criações de arquivos).
+    """
+    if hasattr(os, "O_DIRECTORY"):
+        descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+
+def save_client(client: Client, path: str) -> None:
+    """
+    Grava um cliente no formato binário.
+
+    O arquivo é gravado em um arquivo temporário no mesmo diretório, sincronizado
+    com o disco e só então colocado no lugar do destino (os.replace). Assim, um
+    cliente carregado com load_client (que continua lendo o arquivo mapeado) pode
+    ser gravado de volta no mesmo caminho, e uma falha durante a gravação não
+    corrompe o arquivo anterior.
+
+    Args:
+        client (Client): O cliente a ser gravado.
+        path (str): Caminho do arquivo de destino.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(descriptor, "wb") as stream:
+            write_client(client, stream)
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    _fsync_directory(directory)
+
+
+def dumps_client(client: Client) -> bytes:
+    """
+    Serializa um cliente no formato binário.
+
+    Args:
+        client (Client): O cliente a ser serializado.
+
+    Returns:
+        bytes: O conteúdo do arquivo binário.
+    """
+    stream = io.BytesIO()
+    write_client(client, stream)
+    return stream.getvalue()
+
+
+def _check_section(buffer: memoryview, offset: int, size: int, name: str) -> None:
+    """
+    Verifica se uma seção do arquivo está alinhada a 8 bytes e cabe no buffer.
+
+    Raises:
+        ValueError: Se a seção estiver desalinhada ou ultrapassar o fim do buffer
+            (por exemplo, em um arquivo truncado).
+    """
+    if offset % 8 or offset + size > len(buffer):
+        raise ValueError(f"Arquivo inválido: seção {name} truncada ou fora de posição.")
+
+
+def read_client(buffer: Union[memoryview, bytearray, mmap.mmap]) -> Client:
+    """
+    Reconstrói um cliente a partir do conteúdo de um arquivo binário.
+
+    As transações não são copiadas: as contas usam MappedLedger sobre o próprio buffer.
+
+    Args:
+        buffer (memoryview | bytearray | mmap): Conteúdo do arquivo (gravável, para
+            permitir alterações em memória).
+
+    Returns:
+        Client: O cliente reconstruído.
+
+    Raises:
+        ValueError: Se o conteúdo não estiver no formato esperado.
+    """
+    if sys.byteorder != "little":
+        raise ValueError("O carregamento do formato binário requer uma plataforma little-endian.")
+    buffer = memoryview(buffer)
+    if len(buffer) < HEADER.size:
+        raise ValueError("Arquivo inválido: cabeçalho incompleto.")
+    (
+        magic, version, _, name_id, string_count, account_count, investment_count,
+        strings_offset, accounts_offset, investments_offset
+    ) = HEADER.unpack_from(buffer)
+    if magic != MAGIC or version not in (1, VERSION):
+        raise ValueError("Arquivo inválido ou de versão não suportada.")
+
+    _check_section(buffer, strings_offset, 8 * (string_count + 1), "de strings")
+    strings = MappedStringTable(buffer, strings_offset, string_count)
+
+    def string(string_id: int) -> str:
+        if string_id >= string_count:
+            raise ValueError(f"Arquivo inválido: string {string_id} inexistente.")
+        return strings[string_id]
+
+    client = Client(string(name_id))
+    _check_section(buffer, accounts_offset, ACCOUNT.size * account_count, "de contas")
+    for i in range(account_count):
+        account_name_id, balance, count, offset = ACCOUNT.unpack_from(buffer, accounts_offset + i * ACCOUNT.size)
+        _check_section(buffer, offset, RECORD_SIZE * count, "de transações")
+        account = client.add_account(string(account_name_id), MappedLedger(buffer, offset, count, strings))
+        account.balance = balance
+    if version == 1:
+        _check_section(buffer, investments_offset, INVESTMENT_V1.size * investment_count, "de investimentos")
+        for i in range(investment_count):
+            type_id, amount, rate, purchased = INVESTMENT_V1.unpack_from(buffer, investments_offset + i * INVESTMENT_V1.size)
+            investment = Investment(string(type_id), amount, rate)
+            investment.date_purchased = from_micros(purchased)
+            client.add_investment(investment)
+        return client
+    _check_section(buffer, investments_offset, INVESTMENT.size * investment_count, "de investimentos")
+    contribution_offset = investments_offset + INVESTMENT.size * investment_count
+    contribution_offset += -contribution_offset % 8
+    for i in range(investment_count):
+        type_id, amount, rate, purchased, convention_id, contribution_count = INVESTMENT.unpack_from(
+            buffer, investments_offset + i * INVESTMENT.size
+        )
+        if contribution_offset + CONTRIBUTION.size * contribution_count > len(buffer):
+            raise ValueError("Arquivo inválido: seção de aportes truncada.")
+        contributions = []
+        for _ in range(contribution_count):
+            contributions.append(_read_contribution(buffer, contribution_offset))
+            contribution_offset += CONTRIBUTION.size
+        investment = Investment(string(type_id), amount, rate, day_count=string(convention_id), contributions=contributions)
+        investment.date_purchased = from_micros(purchased)
+        client.add_investment(investment)
+    return client
+
+
+def loads_client(data: bytes) -> Client:
+    """
+    Reconstrói um cliente serializado com dumps_client.
+
+    Args:
+        data (bytes): O conteúdo do arquivo binário.
+
+    Returns:
+        Client: O cliente reconstruído.
+    """
+    return read_client(bytearray(data))
+
+
+def load_client(path: str, use_mmap: bool = True) -> Client:
+    """
+    Carrega um cliente gravado com save_client.
+
+    Com use_mmap, o arquivo é mapeado em memória (em modo cópia na escrita, então
+    alterações não afetam o arquivo) e só as páginas acessadas são lidas do disco.
+
+    Args:
+        path (str): Caminho do arquivo.
+        use_mmap (bool, optional): Se deve mapear o arquivo em memória. Padrão é True.
+
+    Returns:
+        Client: O cliente carregado.
+    """
+    with open(path, "rb") as file:
+        if not use_mmap:
+            return read_client(bytearray(file.read()))
+        if file.seek(0, io.SEEK_END) == 0:
+            raise ValueError("Arquivo inválido: cabeçalho incompleto.")
+        return read_client(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY))
@@ -0,0 +1,201 @@
+"""
+Projeções de patrimônio em séries temporais.
+
+Uma projeção calcula, em uma única chamada, os valores das contas e dos
+investimentos de um cliente em várias datas futuras. Cada investimento é
+avaliado como em Investment.calculate_value, pelos meses (de 30 dias)
+completos desde a sua compra; os fatores de crescimento de cada data são
+obtidos a partir dos da data anterior (produto acumulado), em vez de
+recalcular a potência a cada passo.
+"""
+
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+from . import clock, models
+from .daycount import add_months
+from .ledger import to_micros
+from .valuation import MICROS_PER_DAY, np
+
+
+def months_between(start: datetime, end: datetime) -> int:
+    """
+    Calcula a diferença em meses de calendário entre duas datas.
+
+    Args:
+        start (datetime): Data inicial.
+        end (datetime): Data final.
+
+    Returns:
+        int: Número de meses entre as datas (desconsiderando os dias).
+    """
+    return (end.year - start.year) * 12 + (end.month - start.month)
+
+
+def monthly_dates(months: int, start: Optional[datetime] = None) -> List[datetime]:
+    """
+    Gera datas mensais a partir de uma data inicial.
+
+    Args:
+        months (int): Quantidade de datas (a primeira é um mês após o início).
+        start (datetime, optional): Data inicial. Padrão é o momento atual.
+
+    Returns:
+        List[datetime]: Datas no mesmo dia de cada mês seguinte (limitado ao fim do mês).
+    """
+    start = start if start is not None else clock.now()
+    return [add_months(start, step) for step in range(1, months + 1)]
+
+
+class Projection:
+    """
+    Série temporal projetada para as contas e investimentos de um cliente.
+
+    Atributos:
+        client_name (str): Nome do cliente.
+        start (datetime): Data de referência da projeção.
+        dates (List[datetime]): Datas projetadas, em ordem crescente.
+        months (List[int]): Meses entre a data de referência e cada data projetada.
+        account_names (List[str]): Nomes das contas.
+        account_balances (List[float]): Saldos das contas (mantidos constantes).
+        investment_types (List[str]): Tipos dos investimentos.
+        investment_rates (List[float]): Taxas mensais de retorno dos investimentos.
+        investment_values (List[List[float]]): Valores projetados de cada investimento, por data.
+        net_worth (List[float]): Patrimônio líquido projetado em cada data.
+    """
+
+    def __init__(
+        self,
+        client_name: str,
+        start: datetime,
+        dates: List[datetime],
+        months: List[int],
+        account_names: List[str],
+        account_balances: List[float],
+        investment_types: List[str],
+        investment_rates: List[float],
+        investment_values: List[List[float]]
+    ) -> None:
+        """
+        Inicializa uma projeção já calculada.
+
+        Args:
+            client_name (str): Nome do cliente.
+            start (datetime): Data de referência da projeção.
+            dates (List[datetime]): Datas projetadas.
+            months (List[int]): Meses até cada data projetada.
+            account_names (List[str]): Nomes das contas.
+            account_balances (List[float]): Saldos das contas.
+            investment_types (List[str]): Tipos dos investimentos.
+            investment_rates (List[float]): Taxas mensais de retorno dos investimentos.
+            investment_values (List[List[float]]): Valores de cada investimento, por data.
+        """
+        self.client_name: str = client_name
+        self.start: datetime = start
+        self.dates: List[datetime] = dates
+        self.months: List[int] = months
+        self.account_names: List[str] = account_names
+        self.account_balances: List[float] = account_balances
+        self.investment_types: List[str] = investment_types
+        self.investment_rates: List[float] = investment_rates
+        self.investment_values: List[List[float]] = investment_values
+        accounts_total = sum(account_balances)
+        self.net_worth: List[float] = [
+            accounts_total + sum(values[step] for values in investment_values)
+            for step in range(len(dates))
+        ]
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+
+def _growth_curves(rates: Sequence[float], months: Sequence[Sequence[int]]) -> List[List[float]]:
+    """
+    Calcula (1 + taxa) ** meses para cada taxa e sua sequência crescente de meses.
+
+    O primeiro fator de cada taxa é uma potência; os seguintes são obtidos
+    multiplicando o anterior pelo crescimento do intervalo entre as datas. Sem o
+    NumPy, investimentos com a mesma taxa e os mesmos meses compartilham a mesma
+    curva.
+    """
+    if not rates or not months[0]:
+        return [[] for _ in rates]
+    if np is not None:
+        bases = 1 + np.array(rates, dtype=np.float64)[:, None]
+        steps = np.diff(np.array(months, dtype=np.float64), axis=1, prepend=0.0)
+        return np.cumprod(np.power(bases, steps), axis=1).tolist()
+    curves = []
+    by_key = {}
+    for rate, elapsed in zip(rates, months):
+        key = (rate, tuple(elapsed))
+        curve = by_key.get(key)
+        if curve is None:
+            factor = 1.0
+            previous = 0
+            curve = by_key[key] = []
+            for month in elapsed:
+                factor *= (1 + rate) ** (month - previous)
+                previous = month
+                curve.append(factor)
+        curves.append(list(curve))
+    return curves
+
+
+def project_client(
+    client: "models.Client",
+    dates: Sequence[datetime],
+    start: Optional[datetime] = None
+) -> Projection:
+    """
+    Projeta os valores das contas e investimentos de um cliente em várias datas.
+
+    Cada investimento é avaliado em cada data como em Investment.calculate_value:
+    os da convenção padrão rendem a partir do valor inicial pelos meses (de 30
+    dias) completos desde a data de compra, e os com cronograma de rendimento
+    (outra convenção de contagem de dias ou aportes) pelo cronograma. Os saldos
+    das contas são mantidos constantes.
+
+    Args:
+        client (Client): O cliente a ser projetado.
+        dates (Sequence[datetime]): Datas da projeção, em ordem crescente.
+        start (datetime, optional): Data de referência, usada para os meses de
+            cada data em Projection.months. Padrão é o momento atual.
+
+    Returns:
+        Projection: A série temporal projetada.
+
+    Raises:
+        ValueError: Se as datas não estiverem em ordem crescente.
+    """
+    start = start if start is not None else clock.now()
+    dates = list(dates)
+    if any(a > b for a, b in zip(dates, dates[1:])):
+        raise ValueError("As datas da projeção devem estar em ordem crescente.")
+    months = [months_between(start, date) for date in dates]
+    investments = list(client.investments)
+    rates = [investment.rate_of_return for investment in investments]
+    schedules = [investment._accrual() for investment in investments]
+    now = [to_micros(date) for date in dates]
+    direct = [i for i, schedule in enumerate(schedules) if schedule is None]
+    elapsed = []
+    for i in direct:
+        purchased = to_micros(investments[i].date_purchased)
+        elapsed.append([(micros - purchased) // MICROS_PER_DAY // 30 for micros in now])
+    curves = _growth_curves([rates[i] for i in direct], elapsed)
+    investment_values = [
+        schedule.values_over(dates) if schedule is not None else None
+        for schedule in schedules
+    ]
+    for i, curve in zip(direct, curves):
+        investment_values[i] = [investments[i].initial_amount * factor for factor in curve]
+    return Projection(
+        client.name,
+        start,
+        dates,
+        months,
+        [account.name for account in client.accounts],
+        [account.balance for account in client.accounts],
+        [investment.type for investment in investments],
+        rates,
+        investment_values
+    )
@@ -0,0 +1,246 @@
+"""
+Camada de consultas assíncrona (asyncio) sobre clientes.
+
+Consultas idênticas feitas ao mesmo tempo são agrupadas em um único cálculo, cujo
+resultado é entregue a todos os solicitantes. Consultas pesadas (relatórios e
+listagens de transações) rodam em um executor, sem bloquear o laço de eventos, e
+a quantidade de cálculos simultâneos e pendentes é limitada.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from .batch import render_client_report
+from .models import Account, Client, Transaction, TransactionPage
+
+
+class QueryService:
+    """
+    Serviço de consultas assíncronas sobre um conjunto de clientes.
+
+    Atributos:
+        clients (Dict[str, Client]): Clientes atendidos, por nome.
+        max_concurrency (int): Máximo de cálculos executados ao mesmo tempo.
+        max_pending (int): Máximo de cálculos distintos em andamento ou aguardando;
+            acima disso, novas consultas são recusadas.
+        coalesce (bool): Se consultas idênticas simultâneas compartilham um único cálculo.
+    """
+
+    def __init__(
+        self,
+        clients: Dict[str, Client],
+        max_concurrency: int = 4,
+        max_pending: int = 1000,
+        executor: Optional[Executor] = None,
+        coalesce: bool = True
+    ) -> None:
+        """
+        Inicializa o serviço.
+
+        Para consultar clientes alterados por outras threads enquanto o serviço roda,
+        use clientes concorrentes (Client(..., concurrent=True)).
+
+        Args:
+            clients (Dict[str, Client]): Clientes atendidos, por nome.
+            max_concurrency (int, optional): Máximo de cálculos simultâneos. Padrão é 4.
+            max_pending (int, optional): Máximo de cálculos distintos pendentes. Padrão é 1000.
+            executor (Executor, optional): Executor das consultas pesadas. Padrão é um
+                ThreadPoolExecutor com max_concurrency threads, encerrado por close().
+            coalesce (bool, optional): Se consultas idênticas são agrupadas. Padrão é True.
+        """
+        self.clients: Dict[str, Client] = clients
+        self.max_concurrency: int = max_concurrency
+        self.max_pending: int = max_pending
+        self.coalesce: bool = coalesce
+        self._own_executor = executor is None
+        self._executor: Executor = executor or ThreadPoolExecutor(max_concurrency, thread_name_prefix="finances-query")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._pending = 0
+
+    def _client(self, client_name: str) -> Client:
+        """
+        Retorna o cliente com o nome informado.
+
+        Raises:
+            KeyError: Se o cliente não existir.
+        """
+        return self.clients[client_name]
+
+    def _account(self, client_name: str, account_name: str) -> Account:
+        """
+        Retorna a conta de um cliente.
+
+        Raises:
+            KeyError: Se o cliente ou a conta não existirem.
+        """
+        account = self._client(client_name).get_account(account_name)
+        if account is None:
+            raise KeyError(account_name)
+        return account
+
+    async def _run(self, key: Hashable, function: Callable[[], Any], blocking: bool) -> Any:
+        """
+        Executa um cálculo, agrupando-o com um cálculo idêntico em andamento.
+
+        O cálculo roda em uma tarefa própria: cancelar uma das consultas agrupadas
+        não interrompe o cálculo das demais.
+
+        Args:
+            key (Hashable): Identificação da consulta.
+            function (Callable[[], Any]): Cálculo a ser executado.
+            blocking (bool): Se o cálculo deve rodar no executor.
+
+        Returns:
+            Any: O resultado do cálculo.
+
+        Raises:
+            RuntimeError: Se o limite de cálculos pendentes tiver sido atingido.
+        """
+        task = self._inflight.get(key) if self.coalesce else None
+        if task is None:
+            if self._pending >= self.max_pending:
+                raise RuntimeError("Limite de consultas pendentes atingido; tente novamente.")
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._pending += 1
+            task = asyncio.ensure_future(self._compute(function, blocking))
+            task.add_done_callback(partial(self._finished, key))
+            if self.coalesce:
+                self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _compute(self, function: Callable[[], Any], blocking: bool) -> Any:
+        """
+        Executa um cálculo respeitando o limite de cálculos simultâneos.
+        """
+        async with self._semaphore:
+            if blocking:
+                # O contexto (incluindo o relógio em uso, ver clock.use_clock) segue para o executor
+                context = contextvars.copy_context()
+                return await asyncio.get_running_loop().run_in_executor(self._executor, context.run, function)
+            return function()
+
+    def _finished(self, key: Hashable, task: asyncio.Future) -> None:
+        """
+        Remove um cálculo concluído da lista de cálculos em andamento.
+        """
+        self._pending -= 1
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Evita o aviso de exceção não recuperada quando todas as consultas foram canceladas
+            task.exception()
+
+    async def get_net_worth(self, client_name: str) -> float:
+        """
+        Retorna o patrimônio líquido de um cliente.
+
+        Args:
+            client_name (str): Nome do cliente.
+
+        Returns:
+            float: O patrimônio líquido.
+
+        Raises:
+            KeyError: Se o cliente não existir.
+        """
+        client = self._client(client_name)
+        return await self._run(("net_worth", client_name), client.get_net_worth, blocking=False)
+
+    async def get_transactions(
+        self,
+        client_name: str,
+        account_name: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None
+    ) -> List[Transaction]:
+        """
+        Retorna as transações de uma conta, filtradas como em Account.get_transactions.
+
+        A mesma lista é entregue a todas as consultas agrupadas; ela não deve ser alterada.
+
+        Args:
+            client_name (str): Nome do cliente.
+            account_name (str): Nome da conta.
+            start_date (datetime, optional): Data inicial para filtro. Padrão é None.
+            end_date (datetime, optional): Data final para filtro. Padrão é None.
+            category (str, optional): Categoria para filtrar. Padrão é None.
+
+        Returns:
+            List[Transaction]: Lista de transações filtradas.
+
+        Raises:
+            KeyError: Se o cliente ou a conta não existirem.
+        """
+        account = self._account(client_name, account_name)
+        key = ("transactions", client_name, account_name, start_date, end_date, category)
+        function = partial(account.get_transactions, start_date, end_date, category)
+        return await self._run(key, function, blocking=True)
+
+    async def get_transactions_page(
+        self,
+        client_name: str,
+        account_name: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[int] = None
+    ) -> TransactionPage:
+        """
+        Retorna uma página das transações de uma conta, como em Account.get_transactions_page.
+
+        Apenas as transações da página são materializadas. A mesma página é entregue a
+        todas as consultas agrupadas; ela não deve ser alterada.
+
+        Args:
+            client_name (str): Nome do cliente.
+            account_name (str): Nome da conta.
+            start_date (datetime, optional): Data inicial para filtro. Padrão é None.
+            end_date (datetime, optional): Data final para filtro. Padrão é None.
+            category (str, optional): Categoria para filtrar. Padrão é None.
+            limit (int, optional): Máximo de transações na página. Padrão é 50.
+            cursor (int, optional): Cursor da página anterior. Padrão é None (primeira página).
+
+        Returns:
+            TransactionPage: A página, com o cursor da próxima (None na última).
+
+        Raises:
+            KeyError: Se o cliente ou a conta não existirem.
+            ValueError: Se limit não for positivo.
+        """
+        account = self._account(client_name, account_name)
+        key = ("page", client_name, account_name, start_date, end_date, category, limit, cursor)
+        function = partial(account.get_transactions_page, start_date, end_date, category, limit, cursor)
+        return await self._run(key, function, blocking=True)
+
+    async def generate_report(self, client_name: str, transaction_limit: Optional[int] = None) -> str:
+        """
+        Gera o relatório financeiro de um cliente.
+
+        Args:
+            client_name (str): Nome do cliente.
+            transaction_limit (int, optional): Máximo de transações listadas por conta. Padrão é None.
+
+        Returns:
+            str: O relatório formatado.
+
+        Raises:
+            KeyError: Se o cliente não existir.
+        """
+        client = self._client(client_name)
+        function = partial(render_client_report, client, None, transaction_limit)
+        return await self._run(("report", client_name, transaction_limit), function, blocking=True)
+
+    def close(self) -> None:
+        """
+        Encerra o executor criado pelo serviço.
+        """
+        if self._own_executor:
+            self._executor.shutdown(wait=True)
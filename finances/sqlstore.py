@@ -0,0 +1,666 @@
+"""
+Armazenamento de clientes, contas, investimentos e transações em SQLite.
+
+O esquema segue as relações do pacote (relations.txt):
+- Client -> Account (1:N) e Client -> Investment (1:N): tabelas accounts e
+  investments com chave estrangeira para clients.
+- Account -> Transaction (1:N): tabela transactions com chave estrangeira para
+  accounts, indexada por (conta, data) e (conta, categoria).
+- Investment -> Account (1:1): coluna sale_account_id em investments.
+
+Contas carregadas de um SQLiteStore usam SQLiteLedger: as transações ficam no
+banco, os filtros de get_transactions viram consultas SQL indexadas, as escritas
+são agrupadas em lotes e um cache LRU mantém em memória as transações mais usadas.
+"""
+
+import queue
+import sqlite3
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice, repeat
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .indexes import CategoryIndex
+from .ledger import LedgerRange, from_micros, to_micros
+from .models import Account, Client, Investment, Transaction, _StagedRows
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clients (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS accounts (
+    id INTEGER PRIMARY KEY,
+    client_id INTEGER NOT NULL REFERENCES clients(id),
+    name TEXT NOT NULL,
+    balance REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS investments (
+    id INTEGER PRIMARY KEY,
+    client_id INTEGER NOT NULL REFERENCES clients(id),
+    type TEXT NOT NULL,
+    initial_amount REAL NOT NULL,
+    rate_of_return REAL NOT NULL,
+    date_purchased INTEGER NOT NULL,
+    sale_account_id INTEGER REFERENCES accounts(id)
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    account_id INTEGER NOT NULL REFERENCES accounts(id),
+    position INTEGER NOT NULL,
+    amount REAL NOT NULL,
+    date INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL,
+    PRIMARY KEY (account_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS transactions_by_date ON transactions (account_id, date);
+CREATE INDEX IF NOT EXISTS transactions_by_category ON transactions (account_id, category, position);
+CREATE INDEX IF NOT EXISTS accounts_by_client ON accounts (client_id);
+CREATE INDEX IF NOT EXISTS investments_by_client ON investments (client_id);
+"""
+
+# Linhas lidas por consulta ao percorrer as transações (a conexão é devolvida entre blocos)
+SELECT_CHUNK = 1_000
+
+
+def _check_investments(client: Client) -> None:
+    """
+    Verifica se os investimentos do cliente podem ser gravados (convenção padrão e sem aportes).
+
+    Raises:
+        ValueError: Se algum investimento tiver um cronograma de rendimento.
+    """
+    for investment in client.investments:
+        if investment._accrual() is not None:
+            raise ValueError(
+                f"O investimento {investment.type!r} usa a convenção {investment.day_count.name!r} ou aportes "
+                "periódicos, que não podem ser gravados no banco."
+            )
+
+
+class ConnectionPool:
+    """
+    Conjunto de conexões SQLite reutilizadas entre threads.
+
+    Atributos:
+        database (str): Caminho (ou URI) do banco.
+        size (int): Quantidade máxima de conexões.
+    """
+
+    def __init__(self, database: str, size: int = 4) -> None:
+        """
+        Inicializa o pool.
+
+        Args:
+            database (str): Caminho do banco, ou ":memory:" para um banco em memória
+                compartilhado entre as conexões do pool.
+            size (int, optional): Quantidade máxima de conexões. Padrão é 4.
+        """
+        if database == ":memory:":
+            database = f"file:ngfinances-{id(self)}?mode=memory&cache=shared"
+        self.database: str = database
+        self.size: int = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        # Mantém o banco em memória vivo enquanto o pool existir
+        self._keeper = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.database, uri=self.database.startswith("file:"), check_same_thread=False)
+        connection.execute("PRAGMA foreign_keys = ON")
+        if not self.database.startswith("file:"):
+            connection.execute("PRAGMA journal_mode = WAL")
+        return connection
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Empresta uma conexão do pool durante um bloco with.
+
+        Returns:
+            Iterator[sqlite3.Connection]: A conexão emprestada.
+        """
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            connection = self._connect() if create else self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        """
+        Fecha as conexões ociosas do pool.
+        """
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        self._keeper.close()
+
+
+class SQLiteLedger:
+    """
+    Ledger cujas transações ficam em uma tabela SQLite.
+
+    Inserções são acumuladas e gravadas em lotes (antes de qualquer leitura ou ao
+    atingir batch_size). Consultas por data e categoria usam os índices do banco.
+    As transações lidas ficam em um cache LRU de até cache_size objetos.
+
+    Atributos:
+        account (Account): Conta dona do ledger.
+        indexed (bool): Sempre True: o ledger resolve as consultas da conta.
+        sqlite_store (SQLiteStore): Banco onde as transações estão.
+        account_id (int): Identificador da conta no banco.
+        cache_size (int): Máximo de transações mantidas em memória.
+        batch_size (int): Quantidade de inserções acumuladas antes da gravação.
+    """
+
+    indexed: bool = True
+
+    def __init__(self, store: "SQLiteStore", account_id: int, cache_size: int = 10_000, batch_size: int = 1_000) -> None:
+        """
+        Inicializa o ledger de uma conta do banco.
+
+        Args:
+            store (SQLiteStore): Banco onde as transações estão.
+            account_id (int): Identificador da conta no banco.
+            cache_size (int, optional): Máximo de transações em cache. Padrão é 10.000.
+            batch_size (int, optional): Inserções acumuladas por lote. Padrão é 1.000.
+        """
+        self.account: Optional[Account] = None
+        self.sqlite_store: "SQLiteStore" = store
+        self.account_id: int = account_id
+        self.cache_size: int = cache_size
+        self.batch_size: int = batch_size
+        self._cache: "OrderedDict[int, Transaction]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pending: List[tuple] = []
+        store._ledgers.add(self)
+        with store.pool.connection() as connection:
+            self._stored = connection.execute(
+                "SELECT COUNT(*) FROM transactions WHERE account_id = ?", (account_id,)
+            ).fetchone()[0]
+            self._saved_balance = connection.execute(
+                "SELECT balance FROM accounts WHERE id = ?", (account_id,)
+            ).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._stored + len(self._pending)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    # Escrita
+
+    def _row(self, position: int, transaction: Transaction) -> tuple:
+        return (
+            self.account_id, position, transaction.amount, to_micros(transaction.date),
+            transaction.category, transaction.description
+        )
+
+    def _remember(self, position: int, transaction: Transaction) -> None:
+        """
+        Coloca uma transação no cache LRU.
+        """
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[position] = transaction
+            self._cache.move_to_end(position)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def append(self, transaction: Transaction) -> None:
+        """
+        Adiciona uma transação ao final do ledger (gravada no próximo lote).
+
+        Um lote completo é gravado antes da nova transação: nesse momento a conta já
+        aplicou ao saldo todas as transações do lote, e saldo e linhas são gravados juntos.
+
+        Args:
+            transaction (Transaction): Transação a ser armazenada.
+        """
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        position = len(self)
+        self._pending.append(self._row(position, transaction))
+        self._remember(position, transaction)
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        """
+        Adiciona várias transações ao final do ledger (gravadas no próximo lote).
+
+        Args:
+            transactions (Iterable[Transaction]): Transações a serem armazenadas.
+        """
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        for transaction in transactions:
+            position = len(self)
+            self._pending.append(self._row(position, transaction))
+            self._remember(position, transaction)
+
+    def extend_rows(self, rows: "_StagedRows") -> LedgerRange:
+        """
+        Adiciona ao final do ledger linhas já validadas por Account.add_transactions
+        (gravadas no próximo lote), sem criar objetos Transaction.
+
+        Args:
+            rows (_StagedRows): Linhas validadas, em colunas.
+
+        Returns:
+            LedgerRange: As transações adicionadas, lidas apenas quando acessadas.
+        """
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        first = len(self)
+        self._pending.extend(zip(
+            repeat(self.account_id), range(first, first + len(rows)), rows.amounts,
+            map(to_micros, rows.dates), rows.categories, rows.descriptions
+        ))
+        for index, transaction in rows.transactions:
+            transaction._account = self.account
+            transaction._position = first + index
+            self._remember(first + index, transaction)
+        return LedgerRange(self, first, len(self))
+
+    def flush(self) -> None:
+        """
+        Grava no banco as inserções pendentes e o saldo da conta, em uma única transação.
+        """
+        balance = self.account.balance if self.account is not None else self._saved_balance
+        if not self._pending and balance == self._saved_balance:
+            return
+        with self.sqlite_store.write() as connection:
+            if self._pending:
+                connection.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?)", self._pending)
+            if balance != self._saved_balance:
+                connection.execute("UPDATE accounts SET balance = ? WHERE id = ?", (balance, self.account_id))
+        self._stored += len(self._pending)
+        self._pending.clear()
+        self._saved_balance = balance
+
+    def store(self, position: int, transaction: Transaction) -> None:
+        """
+        Grava uma transação alterada na posição indicada.
+
+        A linha e o saldo atual da conta (já atualizado com a alteração) são gravados
+        em uma única transação do banco.
+
+        Args:
+            position (int): Posição da transação no ledger.
+            transaction (Transaction): Transação com os novos valores.
+        """
+        balance = self.account.balance if self.account is not None else self._saved_balance
+        with self.sqlite_store.write() as connection:
+            if self._pending:
+                connection.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?)", self._pending)
+            connection.execute(
+                "UPDATE transactions SET amount = ?, date = ?, category = ?, description = ? "
+                "WHERE account_id = ? AND position = ?",
+                self._row(position, transaction)[2:] + (self.account_id, position)
+            )
+            if balance != self._saved_balance:
+                connection.execute("UPDATE accounts SET balance = ? WHERE id = ?", (balance, self.account_id))
+        self._stored += len(self._pending)
+        self._pending.clear()
+        self._saved_balance = balance
+        self._remember(position, transaction)
+
+    # Leitura
+
+    def _select(self, where: str = "", parameters: Sequence = (), after: int = -1) -> Iterator[Transaction]:
+        """
+        Percorre as transações que atendem a uma condição SQL, em ordem de posição.
+
+        As linhas são lidas em blocos de SELECT_CHUNK (a partir da última posição lida),
+        e a conexão é devolvida ao pool antes de cada bloco ser percorrido.
+        """
+        self.flush()
+        while True:
+            with self.sqlite_store.pool.connection() as connection:
+                rows = connection.execute(
+                    "SELECT position, amount, date, category, description FROM transactions "
+                    f"WHERE account_id = ? AND position > ? {where} ORDER BY position LIMIT ?",
+                    (self.account_id, after, *parameters, SELECT_CHUNK)
+                ).fetchall()
+            for row in rows:
+                yield self._transaction(row)
+            if len(rows) < SELECT_CHUNK:
+                return
+            after = rows[-1][0]
+
+    def _transaction(self, row: tuple) -> Transaction:
+        """
+        Retorna a transação de uma linha do banco, reaproveitando o cache.
+        """
+        position = row[0]
+        transaction = self._cache.get(position)
+        if transaction is None:
+            transaction = Transaction(row[1], row[3], row[4], date=from_micros(row[2]))
+            transaction._account = self.account
+            transaction._position = position
+        self._remember(position, transaction)
+        return transaction
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ledger index out of range")
+        cached = self._cache.get(index)
+        if cached is not None:
+            self._remember(index, cached)
+            return cached
+        return next(self._select("AND position = ?", (index,)))
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return self._select()
+
+    def describe(self, limit: Optional[int] = None) -> Iterator[str]:
+        """
+        Percorre as representações textuais das transações, na ordem do ledger.
+
+        Args:
+            limit (int, optional): Máximo de transações. Padrão é None (todas).
+
+        Returns:
+            Iterator[str]: O texto de cada transação (str(transação)).
+        """
+        return map(str, islice(self, limit))
+
+    def date_micros(self) -> List[int]:
+        """
+        Retorna as datas das transações em microssegundos, na ordem do ledger.
+
+        Returns:
+            List[int]: Datas das transações.
+        """
+        self.flush()
+        with self.sqlite_store.pool.connection() as connection:
+            return [row[0] for row in connection.execute(
+                "SELECT date FROM transactions WHERE account_id = ? ORDER BY position", (self.account_id,)
+            )]
+
+    def category_amounts(self) -> Iterator[Tuple[str, float]]:
+        """
+        Percorre as categorias e valores das transações, na ordem do ledger.
+
+        Returns:
+            Iterator[Tuple[str, float]]: Pares (categoria, valor).
+        """
+        return ((t.category, t.amount) for t in self)
+
+    def description_texts(self) -> Iterator[str]:
+        """
+        Percorre as descrições das transações, na ordem do ledger.
+
+        Returns:
+            Iterator[str]: Descrição de cada transação.
+        """
+        self.flush()
+        with self.sqlite_store.pool.connection() as connection:
+            rows = connection.execute(
+                "SELECT description FROM transactions WHERE account_id = ? ORDER BY position", (self.account_id,)
+            ).fetchall()
+        return (row[0] for row in rows)
+
+    def category_index(self) -> CategoryIndex:
+        """
+        Calcula os totais e contagens por categoria com uma consulta agregada.
+
+        Returns:
+            CategoryIndex: Índice com totais e contagens (sem as posições).
+        """
+        self.flush()
+        index = CategoryIndex()
+        with self.sqlite_store.pool.connection() as connection:
+            for category, total, count in connection.execute(
+                "SELECT category, SUM(amount), COUNT(*) FROM transactions WHERE account_id = ? GROUP BY category",
+                (self.account_id,)
+            ):
+                index.totals[category] = total
+                index.counts[category] = count
+        return index
+
+    def take(self, positions: Iterable[int], category: Optional[str] = None) -> List[Transaction]:
+        """
+        Retorna as transações nas posições indicadas, opcionalmente filtradas por categoria.
+
+        Args:
+            positions (Iterable[int]): Posições das transações no ledger.
+            category (str, optional): Categoria para filtrar. Padrão é None.
+
+        Returns:
+            List[Transaction]: Lista de transações.
+        """
+        transactions = [self[position] for position in positions]
+        if category:
+            return [t for t in transactions if t.category == category]
+        return transactions
+
+    def filter(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None
+    ) -> List[Transaction]:
+        """
+        Retorna as transações filtradas por data e/ou categoria com uma consulta indexada.
+
+        Args:
+            start_date (datetime, optional): Data inicial para filtro. Padrão é None.
+            end_date (datetime, optional): Data final para filtro. Padrão é None.
+            category (str, optional): Categoria para filtrar. Padrão é None.
+
+        Returns:
+            List[Transaction]: Lista de transações filtradas.
+        """
+        return list(self.scan(start_date, end_date, category))
+
+    def scan(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None,
+        after: int = -1
+    ) -> Iterator[Transaction]:
+        """
+        Percorre sob demanda as transações filtradas por data e/ou categoria, com uma
+        consulta indexada lida aos poucos.
+
+        Args:
+            start_date (datetime, optional): Data inicial para filtro. Padrão é None.
+            end_date (datetime, optional): Data final para filtro. Padrão é None.
+            category (str, optional): Categoria para filtrar. Padrão é None.
+            after (int, optional): Percorre apenas as posições maiores que esta. Padrão é -1 (todas).
+
+        Returns:
+            Iterator[Transaction]: Transações filtradas, em ordem de posição.
+        """
+        conditions, parameters = [], []
+        if start_date is not None:
+            conditions.append("AND date >= ?")
+            parameters.append(to_micros(start_date))
+        if end_date is not None:
+            conditions.append("AND date <= ?")
+            parameters.append(to_micros(end_date))
+        if category:
+            conditions.append("AND category = ?")
+            parameters.append(category)
+        return self._select(" ".join(conditions), parameters, after)
+
+
+class SQLiteStore:
+    """
+    Banco SQLite com clientes, contas, investimentos e transações.
+
+    Atributos:
+        pool (ConnectionPool): Conexões usadas nas leituras.
+        cache_size (int): Tamanho do cache dos ledgers criados pelo banco.
+        batch_size (int): Tamanho dos lotes de escrita dos ledgers criados pelo banco.
+    """
+
+    def __init__(self, database: str = ":memory:", pool_size: int = 4, cache_size: int = 10_000, batch_size: int = 1_000) -> None:
+        """
+        Abre (ou cria) o banco.
+
+        Args:
+            database (str, optional): Caminho do arquivo. Padrão é ":memory:".
+            pool_size (int, optional): Conexões de leitura. Padrão é 4.
+            cache_size (int, optional): Transações em cache por conta. Padrão é 10.000.
+            batch_size (int, optional): Inserções por lote de escrita. Padrão é 1.000.
+        """
+        self.pool: ConnectionPool = ConnectionPool(database, pool_size)
+        self.cache_size: int = cache_size
+        self.batch_size: int = batch_size
+        self._write_lock = threading.Lock()
+        # Ledgers criados pelo banco, gravados em close()
+        self._ledgers: "weakref.WeakSet[SQLiteLedger]" = weakref.WeakSet()
+        with self.write() as connection:
+            connection.executescript(SCHEMA)
+
+    def __enter__(self) -> "SQLiteStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Executa um bloco de escrita em uma transação do banco, com uma escrita por vez.
+
+        Returns:
+            Iterator[sqlite3.Connection]: A conexão usada na escrita.
+        """
+        with self._write_lock, self.pool.connection() as connection:
+            with connection:
+                yield connection
+
+    def create_account(self, client_id: int, name: str) -> Account:
+        """
+        Cria uma conta vazia no banco.
+
+        Args:
+            client_id (int): Identificador do cliente dono da conta.
+            name (str): Nome da conta.
+
+        Returns:
+            Account: A conta, com um SQLiteLedger.
+        """
+        with self.write() as connection:
+            account_id = connection.execute(
+                "INSERT INTO accounts (client_id, name) VALUES (?, ?)", (client_id, name)
+            ).lastrowid
+        return Account(name, SQLiteLedger(self, account_id, self.cache_size, self.batch_size))
+
+    def save_client(self, client: Client) -> int:
+        """
+        Grava um cliente em memória no banco.
+
+        Args:
+            client (Client): O cliente a ser gravado.
+
+        Returns:
+            int: O identificador do cliente no banco.
+
+        Raises:
+            ValueError: Se algum investimento usar outra convenção de contagem de dias
+                ou aportes periódicos (não suportados pelo banco).
+        """
+        _check_investments(client)
+        with self.write() as connection:
+            client_id = connection.execute("INSERT INTO clients (name) VALUES (?)", (client.name,)).lastrowid
+            for account in client.accounts:
+                account_id = connection.execute(
+                    "INSERT INTO accounts (client_id, name, balance) VALUES (?, ?, ?)",
+                    (client_id, account.name, account.balance)
+                ).lastrowid
+                connection.executemany(
+                    "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        (account_id, position, t.amount, to_micros(t.date), t.category, t.description)
+                        for position, t in enumerate(account.transactions)
+                    )
+                )
+            connection.executemany(
+                "INSERT INTO investments (client_id, type, initial_amount, rate_of_return, date_purchased) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (client_id, i.type, i.initial_amount, i.rate_of_return, to_micros(i.date_purchased))
+                    for i in client.investments
+                )
+            )
+        return client_id
+
+    def load_client(self, client_id: int) -> Client:
+        """
+        Carrega um cliente do banco. As transações continuam no banco (SQLiteLedger).
+
+        Args:
+            client_id (int): Identificador do cliente.
+
+        Returns:
+            Client: O cliente carregado.
+
+        Raises:
+            KeyError: Se o cliente não existir.
+        """
+        with self.pool.connection() as connection:
+            row = connection.execute("SELECT name FROM clients WHERE id = ?", (client_id,)).fetchone()
+            if row is None:
+                raise KeyError(client_id)
+            accounts = connection.execute(
+                "SELECT id, name, balance FROM accounts WHERE client_id = ? ORDER BY id", (client_id,)
+            ).fetchall()
+            investments = connection.execute(
+                "SELECT type, initial_amount, rate_of_return, date_purchased FROM investments "
+                "WHERE client_id = ? ORDER BY id", (client_id,)
+            ).fetchall()
+        client = Client(row[0])
+        for account_id, name, balance in accounts:
+            account = client.add_account(name, SQLiteLedger(self, account_id, self.cache_size, self.batch_size))
+            account.balance = balance
+        for type, amount, rate, purchased in investments:
+            investment = Investment(type, amount, rate)
+            investment.date_purchased = from_micros(purchased)
+            client.add_investment(investment)
+        return client
+
+    def client_ids(self) -> Dict[int, str]:
+        """
+        Retorna os clientes gravados no banco.
+
+        Returns:
+            Dict[int, str]: Nome de cada cliente, por identificador.
+        """
+        with self.pool.connection() as connection:
+            return dict(connection.execute("SELECT id, name FROM clients ORDER BY id"))
+
+    def flush(self) -> None:
+        """
+        Grava as inserções pendentes e os saldos de todos os ledgers abertos do banco.
+        """
+        for ledger in list(self._ledgers):
+            ledger.flush()
+
+    def close(self) -> None:
+        """
+        Grava as alterações pendentes dos ledgers e fecha as conexões do banco.
+        """
+        self.flush()
+        self.pool.close()
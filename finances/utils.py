@@ -1,91 +1,210 @@
 from datetime import datetime, timedelta
-from typing import List
+from typing import IO, Iterator, List, Optional
+from . import clock
 from .models import Client, Transaction, Account, Investment
+from .projection import Projection, project_client
+from .valuation import value_investments
 
 
-def generate_report(client: Client) -> str:
+def _account_lines(client: Client, transaction_limit: Optional[int] = None) -> Iterator[str]:
     """
-    Gera um relatório financeiro detalhado para o cliente.
+    Gera as linhas da seção de contas do relatório financeiro.
 
     Args:
-        client (Client): O cliente para o qual o relatório será gerado.
+        client (Client): O cliente do relatório.
+        transaction_limit (int, optional): Máximo de transações listadas por conta. Padrão é None (todas).
 
     Returns:
-        str: Um relatório formatado contendo informações sobre contas, transações e investimentos do cliente.
+        Iterator[str]: Linhas da seção.
     """
-    report_lines = [f"Relatório Financeiro de {client.name}", "-" * 40]
-    
-    # Contas
-    report_lines.append("\nContas:")
+    yield "\nContas:"
     for account in client.accounts:
-        report_lines.append(f" - {account.name}: Saldo R$ {account.balance:.2f}")
+        yield f" - {account.name}: Saldo R$ {account.balance:.2f}"
         if account.transactions:
-            report_lines.append("   Transações:")
-            for transaction in account.transactions:
-                report_lines.append(f"     {transaction}")
+            yield "   Transações:"
+            for text in account.transactions.describe(transaction_limit):
+                yield f"     {text}"
+            if transaction_limit is not None and len(account.transactions) > transaction_limit:
+                yield f"     ... ({len(account.transactions) - transaction_limit} transações omitidas)"
+
 
-    # Investimentos
-    report_lines.append("\nInvestimentos:")
+def _investment_lines(client: Client, as_of: datetime) -> Iterator[str]:
+    """
+    Gera as linhas da seção de investimentos do relatório financeiro.
+
+    Args:
+        client (Client): O cliente do relatório.
+        as_of (datetime): Data da avaliação dos investimentos.
+
+    Returns:
+        Iterator[str]: Linhas da seção.
+    """
+    yield "\nInvestimentos:"
     if client.investments:
-        for investment in client.investments:
-            current_value = investment.calculate_value()
-            report_lines.append(
+        current_values = value_investments(client, as_of)
+        for investment, current_value in zip(client.investments, current_values):
+            yield (
                 f" - {investment.type}: Valor Atual R$ {current_value:.2f} (Taxa de Retorno: {investment.rate_of_return * 100:.2f}%)"
             )
     else:
-        report_lines.append(" - Nenhum investimento registrado.")
+        yield " - Nenhum investimento registrado."
 
-    # Patrimônio líquido
-    net_worth = client.get_net_worth()
-    report_lines.append("\nPatrimônio Líquido:")
-    report_lines.append(f"R$ {net_worth:.2f}")
-    
-    return "\n".join(report_lines)
 
+def _net_worth_lines(client: Client, as_of: datetime) -> Iterator[str]:
+    """
+    Gera as linhas da seção de patrimônio líquido do relatório financeiro.
+
+    Args:
+        client (Client): O cliente do relatório.
+        as_of (datetime): Data da avaliação dos investimentos.
 
-def future_value_report(client: Client, date: datetime) -> str:
+    Returns:
+        Iterator[str]: Linhas da seção.
     """
-    Gera um relatório de projeção de valores futuros para o cliente, incluindo investimentos e saldo das contas.
+    net_worth = client.get_net_worth(as_of)
+    yield "\nPatrimônio Líquido:"
+    yield f"R$ {net_worth:.2f}"
+
+
+def iter_report_lines(
+    client: Client,
+    transaction_limit: Optional[int] = None,
+    as_of: Optional[datetime] = None
+) -> Iterator[str]:
+    """
+    Gera, sob demanda, as linhas do relatório financeiro do cliente.
+
+    As transações são percorridas à medida que as linhas são consumidas, então a
+    memória usada não depende do tamanho do histórico. A data da avaliação é obtida
+    uma única vez, e todas as seções do relatório usam a mesma data.
 
     Args:
         client (Client): O cliente para o qual o relatório será gerado.
-        date (datetime): A data futura para calcular as projeções.
+        transaction_limit (int, optional): Máximo de transações listadas por conta. Padrão é None (todas).
+        as_of (datetime, optional): Data da avaliação. Padrão é o momento atual (clock.now()).
+
+    Returns:
+        Iterator[str]: Linhas do relatório, sem quebras de linha finais.
+    """
+    as_of = as_of if as_of is not None else clock.now()
+    yield f"Relatório Financeiro de {client.name}"
+    yield "-" * 40
+    yield from _account_lines(client, transaction_limit)
+    yield from _investment_lines(client, as_of)
+    yield from _net_worth_lines(client, as_of)
+
+
+def write_report(
+    client: Client,
+    stream: IO[str],
+    transaction_limit: Optional[int] = None,
+    page_size: Optional[int] = None,
+    page_separator: str = "\f",
+    buffer_lines: int = 1000,
+    as_of: Optional[datetime] = None
+) -> int:
+    """
+    Escreve o relatório financeiro do cliente em um arquivo, sem montá-lo inteiro em memória.
+
+    Sem paginação nem limite de transações, o texto escrito é idêntico ao de generate_report.
+
+    Args:
+        client (Client): O cliente para o qual o relatório será gerado.
+        stream (IO[str]): Arquivo (ou objeto semelhante) aberto para escrita de texto.
+        transaction_limit (int, optional): Máximo de transações listadas por conta. Padrão é None (todas).
+        page_size (int, optional): Linhas por página; entre as páginas é escrita uma linha
+            com page_separator. Padrão é None (sem paginação).
+        page_separator (str, optional): Separador de páginas. Padrão é "\\f" (quebra de página).
+        buffer_lines (int, optional): Linhas acumuladas antes de cada escrita. Padrão é 1000.
+        as_of (datetime, optional): Data da avaliação. Padrão é o momento atual (clock.now()).
+
+    Returns:
+        int: Número de linhas do relatório escritas (sem contar os separadores de página).
+    """
+    buffer: List[str] = []
+    count = 0
+    separator = ""
+    for line in iter_report_lines(client, transaction_limit, as_of):
+        if page_size and count and count % page_size == 0:
+            buffer.append(page_separator)
+        buffer.append(line)
+        count += 1
+        if len(buffer) >= buffer_lines:
+            stream.write(separator + "\n".join(buffer))
+            buffer.clear()
+            separator = "\n"
+    if buffer:
+        stream.write(separator + "\n".join(buffer))
+    return count
+
+
+def generate_report(client: Client) -> str:
+    """
+    Gera um relatório financeiro detalhado para o cliente.
+
+    Para históricos grandes, prefira write_report, que escreve o relatório aos poucos.
+
+    Args:
+        client (Client): O cliente para o qual o relatório será gerado.
+
+    Returns:
+        str: Um relatório formatado contendo informações sobre contas, transações e investimentos do cliente.
+    """
+    return "\n".join(iter_report_lines(client))
+
+
+def render_projection(projection: Projection, step: int = -1) -> str:
+    """
+    Gera o texto do relatório de projeção para uma das datas de uma projeção.
+
+    Args:
+        projection (Projection): A projeção calculada por project_client.
+        step (int, optional): Índice da data a ser apresentada. Padrão é a última.
 
     Returns:
         str: Um relatório formatado contendo projeções de valores futuros.
     """
-    report_lines = [f"Projeção Financeira de {client.name} para {date.strftime('%d/%m/%Y')}", "-" * 40]
-    
-    # Cálculo do número de meses entre agora e a data fornecida
-    now = datetime.now()
-    if date <= now:
-        return "A data fornecida deve ser futura."
-    months_to_date = (date.year - now.year) * 12 + (date.month - now.month)
-    
+    date = projection.dates[step]
+    report_lines = [f"Projeção Financeira de {projection.client_name} para {date.strftime('%d/%m/%Y')}", "-" * 40]
+
     # Contas (Saldo atual, sem projeção de mudanças)
     report_lines.append("\nProjeção de Contas:")
-    for account in client.accounts:
-        report_lines.append(f" - {account.name}: Saldo Atual R$ {account.balance:.2f}")
+    for name, balance in zip(projection.account_names, projection.account_balances):
+        report_lines.append(f" - {name}: Saldo Atual R$ {balance:.2f}")
 
     # Investimentos (Projeção com base na taxa de retorno)
     report_lines.append("\nProjeção de Investimentos:")
-    if client.investments:
-        for investment in client.investments:
-            future_value = investment.initial_amount * ((1 + investment.rate_of_return) ** months_to_date)
+    if projection.investment_types:
+        for type, rate, values in zip(
+            projection.investment_types, projection.investment_rates, projection.investment_values
+        ):
             report_lines.append(
-                f" - {investment.type}: Valor Projetado R$ {future_value:.2f} (Taxa de Retorno: {investment.rate_of_return * 100:.2f}%)"
+                f" - {type}: Valor Projetado R$ {values[step]:.2f} (Taxa de Retorno: {rate * 100:.2f}%)"
             )
     else:
         report_lines.append(" - Nenhum investimento registrado.")
 
     # Patrimônio líquido projetado
-    accounts_total = sum(account.balance for account in client.accounts)
-    investments_total = sum(
-        investment.initial_amount * ((1 + investment.rate_of_return) ** months_to_date)
-        for investment in client.investments
-    )
-    projected_net_worth = accounts_total + investments_total
     report_lines.append("\nPatrimônio Líquido Projetado:")
-    report_lines.append(f"R$ {projected_net_worth:.2f}")
+    report_lines.append(f"R$ {projection.net_worth[step]:.2f}")
 
     return "\n".join(report_lines)
+
+
+def future_value_report(client: Client, date: datetime) -> str:
+    """
+    Gera um relatório de projeção de valores futuros para o cliente, incluindo investimentos e saldo das contas.
+
+    Para projetar várias datas de uma vez, use project_client e render_projection.
+
+    Args:
+        client (Client): O cliente para o qual o relatório será gerado.
+        date (datetime): A data futura para calcular as projeções.
+
+    Returns:
+        str: Um relatório formatado contendo projeções de valores futuros.
+    """
+    now = clock.now()
+    if date <= now:
+        return "A data fornecida deve ser futura."
+    return render_projection(project_client(client, [date], start=now))
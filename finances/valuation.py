@@ -0,0 +1,193 @@
+"""
+Avaliação em lote de investimentos.
+
+Os valores de muitos investimentos são calculados de uma só vez a partir de
+colunas (valor inicial, taxa de retorno e data de compra). Quando o NumPy está
+instalado, os cálculos são vetorizados; caso contrário, é usado Python puro.
+Investimentos com cronograma de rendimento (outra convenção de
+contagem de dias ou aportes periódicos) são avaliados pelo próprio cronograma.
+"""
+
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from . import clock, models
+from .daycount import AccrualSchedule, add_months
+from .ledger import to_micros
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+MICROS_PER_DAY = 86_400_000_000
+
+
+class InvestmentBatch:
+    """
+    Conjunto de investimentos organizado em colunas para avaliação em lote.
+
+    Atributos:
+        investments (List[Investment]): Investimentos do lote, na ordem original.
+        amounts: Valores iniciais investidos.
+        rates: Taxas mensais de retorno.
+        purchased: Datas de compra, em microssegundos desde a época.
+        schedules (List[Tuple[int, AccrualSchedule]]): Posição e cronograma dos
+            investimentos avaliados por cronograma.
+    """
+
+    def __init__(self, investments: Iterable["models.Investment"]) -> None:
+        """
+        Inicializa o lote a partir de uma coleção de investimentos.
+
+        Args:
+            investments (Iterable[Investment]): Investimentos a serem avaliados.
+        """
+        self.investments: List["models.Investment"] = list(investments)
+        schedules = [(i, investment._accrual()) for i, investment in enumerate(self.investments)]
+        self.schedules: List[Tuple[int, AccrualSchedule]] = [
+            (i, schedule) for i, schedule in schedules if schedule is not None
+        ]
+        amounts = [investment.initial_amount for investment in self.investments]
+        rates = [investment.rate_of_return for investment in self.investments]
+        purchased = [to_micros(investment.date_purchased) for investment in self.investments]
+        if np is not None:
+            self.amounts = np.array(amounts, dtype=np.float64)
+            self.rates = np.array(rates, dtype=np.float64)
+            self.purchased = np.array(purchased, dtype=np.int64)
+        else:
+            self.amounts, self.rates, self.purchased = amounts, rates, purchased
+
+    def __len__(self) -> int:
+        return len(self.investments)
+
+    def months_at(self, as_of: datetime) -> List[int]:
+        """
+        Calcula os meses (de 30 dias) completos desde a compra de cada investimento.
+
+        Investimentos com cronograma não usam essa contagem.
+
+        Args:
+            as_of (datetime): Data da avaliação.
+
+        Returns:
+            List[int]: Meses completos de cada investimento.
+        """
+        now = to_micros(as_of)
+        if np is not None:
+            return ((now - self.purchased) // MICROS_PER_DAY // 30).tolist()
+        return [(now - purchased) // MICROS_PER_DAY // 30 for purchased in self.purchased]
+
+    def values_at(self, as_of: datetime) -> List[float]:
+        """
+        Calcula o valor de cada investimento em uma data.
+
+        Args:
+            as_of (datetime): Data da avaliação.
+
+        Returns:
+            List[float]: Valor de cada investimento, na ordem do lote.
+        """
+        return self.values_over([as_of])[0]
+
+    def values_over(self, dates: Sequence[datetime]) -> List[List[float]]:
+        """
+        Calcula o valor de cada investimento em várias datas.
+
+        Args:
+            dates (Sequence[datetime]): Datas da avaliação.
+
+        Returns:
+            List[List[float]]: Uma lista de valores por data, na ordem do lote.
+        """
+        if np is not None:
+            now = np.array([to_micros(date) for date in dates], dtype=np.int64)[:, None]
+            months = (now - self.purchased) // MICROS_PER_DAY // 30
+            values = (self.amounts * np.power(1 + self.rates, months.astype(np.float64))).tolist()
+        else:
+            values = []
+            for now in map(to_micros, dates):
+                months = [(now - purchased) // MICROS_PER_DAY // 30 for purchased in self.purchased]
+                values.append([amount * factor for amount, factor in zip(self.amounts, _factors(self.rates, months))])
+        for i, schedule in self.schedules:
+            for row, value in zip(values, schedule.values_over(dates)):
+                row[i] = value
+        return values
+
+    def project(self, months: int) -> List[float]:
+        """
+        Projeta o valor de cada investimento após um número de meses.
+
+        Investimentos com cronograma são avaliados no seu cronograma, na data
+        months meses de calendário após a compra.
+
+        Args:
+            months (int): Número de meses de rendimento.
+
+        Returns:
+            List[float]: Valor projetado de cada investimento, na ordem do lote.
+        """
+        if np is not None:
+            values = (self.amounts * np.power(1 + self.rates, float(months))).tolist()
+        else:
+            values = [amount * factor for amount, factor in zip(self.amounts, _factors(self.rates, [months] * len(self)))]
+        for i, schedule in self.schedules:
+            values[i] = schedule.value_at(add_months(schedule.purchased, months))
+        return values
+
+
+def _factors(rates: Sequence[float], months: Sequence[int]) -> List[float]:
+    """
+    Calcula (1 + taxa) ** meses para cada par (taxa, meses).
+    """
+    return [(1 + rate) ** m for rate, m in zip(rates, months)]
+
+
+def _investments_of(source: Union["models.Client", Iterable["models.Investment"]]) -> Iterable["models.Investment"]:
+    """
+    Retorna os investimentos de um cliente ou a própria coleção de investimentos.
+    """
+    if isinstance(source, models.Client):
+        return source.investments
+    return source
+
+
+def value_investments(
+    source: Union["models.Client", Iterable["models.Investment"]],
+    as_of: Optional[Union[datetime, Sequence[datetime]]] = None
+) -> Union[List[float], List[List[float]]]:
+    """
+    Calcula, em lote, o valor dos investimentos de um cliente ou de uma coleção.
+
+    Args:
+        source (Client | Iterable[Investment]): Cliente ou investimentos a serem avaliados.
+        as_of (datetime | Sequence[datetime], optional): Data (ou datas) da avaliação.
+            Padrão é o momento atual.
+
+    Returns:
+        List[float] | List[List[float]]: Valores de cada investimento na data informada,
+        ou uma lista de valores por data quando várias datas são informadas.
+    """
+    batch = InvestmentBatch(_investments_of(source))
+    if as_of is None:
+        as_of = clock.now()
+    if isinstance(as_of, datetime):
+        return batch.values_at(as_of)
+    return batch.values_over(as_of)
+
+
+def project_investments(
+    source: Union["models.Client", Iterable["models.Investment"]],
+    months: int
+) -> List[float]:
+    """
+    Projeta, em lote, o valor dos investimentos após um número de meses.
+
+    Args:
+        source (Client | Iterable[Investment]): Cliente ou investimentos a serem projetados.
+        months (int): Número de meses de rendimento.
+
+    Returns:
+        List[float]: Valor projetado de cada investimento.
+    """
+    return InvestmentBatch(_investments_of(source)).project(months)
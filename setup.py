@@ -5,6 +5,7 @@ setup(
     atual_version="1.0.13",
     packages=find_packages(),
     install_requires=[],
+    extras_require={"numpy": ["numpy"]},
     description="A personal finance management package.",
     author="Gustavo Lima Felipe",
     license="MIT"
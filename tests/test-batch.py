@@ -0,0 +1,74 @@
+import pytest
+from datetime import datetime, timedelta
+from finances.batch import ReportBatch, generate_reports, render_client_report
+from finances.daycount import ContributionSchedule
+from finances.ledger import ColumnarLedger
+from finances.models import Client, Investment
+from finances.utils import future_value_report, generate_report
+
+
+def make_clients(count):
+    """Cria clientes com contas e investimentos."""
+    clients = []
+    for k in range(count):
+        client = Client(f"Cliente {k}")
+        account = client.add_account("Conta Corrente")
+        for day in range(1, 4):
+            account.add_transaction(100.0 * day + k, "Salary", "Salário", date=datetime(2024, 1, day))
+        client.add_account("Poupança", ColumnarLedger()).add_transaction(50.0, "Transfer", "Aporte", date=datetime(2024, 2, 1))
+        investment = Investment("Ações", 1000.0 + k, 0.01)
+        investment.date_purchased = datetime(2023, 6, 1)
+        client.add_investment(investment)
+        clients.append(client)
+    return clients
+
+
+def test_render_client_report():
+    """Testa que o relatório em lote combina generate_report e future_value_report."""
+    client = make_clients(1)[0]
+    date = datetime.now() + timedelta(days=400)
+    assert render_client_report(client) == generate_report(client)
+    assert render_client_report(client, date) == generate_report(client) + "\n\n" + future_value_report(client, date)
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_generate_reports_in_order(workers):
+    """Testa que os relatórios em lote seguem a ordem dos clientes e são idênticos aos seriais."""
+    clients = make_clients(11)
+    date = datetime.now() + timedelta(days=400)
+    results = list(generate_reports(iter(clients), future_date=date, workers=workers, chunk_size=3))
+    assert [index for index, _ in results] == list(range(11))
+    assert [report for _, report in results] == [render_client_report(client, date) for client in clients]
+
+
+def test_generate_reports_with_scheduled_investment():
+    """Testa o relatório em lote de clientes com convenção de contagem de dias e aportes."""
+    clients = make_clients(3)
+    investment = Investment("Previdência", 500.0, 0.008, day_count="actual/365",
+                            contributions=[ContributionSchedule(100.0, every_months=1)])
+    investment.date_purchased = datetime(2023, 6, 1)
+    clients[1].add_investment(investment)
+    date = datetime.now() + timedelta(days=400)
+    results = list(generate_reports(clients, future_date=date, workers=2, chunk_size=1))
+    assert [report for _, report in results] == [render_client_report(client, date) for client in clients]
+
+
+def test_generate_reports_as_completed():
+    """Testa o modo em que os relatórios são retornados assim que ficam prontos."""
+    clients = make_clients(9)
+    results = dict(generate_reports(clients, workers=2, chunk_size=2, ordered=False))
+    assert results == {index: generate_report(client) for index, client in enumerate(clients)}
+
+
+def test_generate_reports_cancel():
+    """Testa que cancelar o lote interrompe a geração dos relatórios."""
+    batch = generate_reports(make_clients(20), workers=2, chunk_size=1)
+    received = []
+    for index, _ in batch:
+        received.append(index)
+        if index == 2:
+            batch.cancel()
+    assert received == [0, 1, 2]
+    assert batch.cancelled
+    with pytest.raises(ValueError):
+        ReportBatch([], chunk_size=0)
@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime, timedelta
+from finances import clock
+from finances.batch import generate_reports
+from finances.clock import Clock, FrozenClock, frozen_clock, get_clock, set_clock, use_clock
+from finances.models import Client, Investment, Transaction
+from finances.service import QueryService
+from finances.utils import future_value_report, generate_report
+
+
+def make_client():
+    """Cria um cliente com uma conta e um investimento comprados no relógio atual."""
+    client = Client("Maria")
+    client.add_account("Conta Corrente").add_transaction(1000.0, "Salary", "Salário")
+    client.add_investment(Investment("Ações", 1000.0, 0.02))
+    return client
+
+
+def test_frozen_clock_defaults():
+    """Testa que as datas padrão usam o relógio em uso."""
+    moment = datetime(2024, 1, 5, 10, 30)
+    with frozen_clock(moment) as frozen:
+        assert clock.now() == moment
+        assert Transaction(10.0, "Food").date == moment
+        assert Investment("Ações", 100.0, 0.01).date_purchased == moment
+        frozen.advance(timedelta(days=1))
+        assert clock.now() == moment + timedelta(days=1)
+    assert isinstance(get_clock(), Clock) and not isinstance(get_clock(), FrozenClock)
+
+
+def test_use_clock_is_nested_and_restored():
+    """Testa que use_clock restaura o relógio anterior ao sair do bloco."""
+    outer, inner = FrozenClock(datetime(2024, 1, 1)), FrozenClock(datetime(2025, 1, 1))
+    with use_clock(outer):
+        with use_clock(inner):
+            assert clock.now() == datetime(2025, 1, 1)
+        assert clock.now() == datetime(2024, 1, 1)
+
+    previous = set_clock(FrozenClock(datetime(2030, 1, 1)))
+    try:
+        assert clock.now() == datetime(2030, 1, 1)
+    finally:
+        set_clock(previous)
+
+
+def test_valuation_follows_clock():
+    """Testa que avaliações e o patrimônio usam a data do relógio."""
+    with frozen_clock(datetime(2024, 1, 1)) as frozen:
+        client = make_client()
+        investment = client.investments[0]
+        frozen.advance(timedelta(days=90))
+        assert investment.calculate_value() == 1000.0 * 1.02 ** 3
+        assert client.get_net_worth() == 1000.0 + 1000.0 * 1.02 ** 3
+        frozen.advance(timedelta(days=30))
+        assert client.get_net_worth() == 1000.0 + 1000.0 * 1.02 ** 4
+    assert investment.calculate_value(as_of=datetime(2024, 3, 1)) == 1000.0 * 1.02 ** 2
+
+
+def test_reports_are_reproducible_with_frozen_clock():
+    """Testa que relatórios gerados com o relógio parado são idênticos."""
+    with frozen_clock(datetime(2024, 1, 1)):
+        client = make_client()
+    with frozen_clock(datetime(2025, 6, 1)):
+        first = generate_report(client), future_value_report(client, datetime(2030, 1, 1))
+    with frozen_clock(datetime(2025, 6, 1)):
+        second = generate_report(client), future_value_report(client, datetime(2030, 1, 1))
+    assert first == second
+    assert f"R$ {1000.0 * 1.02 ** 17:.2f}" in first[0]
+
+
+def test_batch_and_service_use_captured_clock():
+    """Testa que lotes e o serviço de consultas usam a data capturada."""
+    with frozen_clock(datetime(2024, 1, 1)):
+        client = make_client()
+    with frozen_clock(datetime(2025, 6, 1)):
+        expected = generate_report(client)
+    reports = generate_reports([client], workers=2, as_of=datetime(2025, 6, 1))
+    assert [report for _, report in reports] == [expected]
+
+    query = QueryService({client.name: client})
+
+    async def run():
+        with frozen_clock(datetime(2025, 6, 1)):
+            return await query.generate_report(client.name)
+
+    assert asyncio.run(run()) == expected
+    query.close()
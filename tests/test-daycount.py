@@ -0,0 +1,192 @@
+import io
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from finances import projection, valuation
+from finances.daycount import (
+    AccrualSchedule,
+    Business252,
+    ContributionSchedule,
+    add_months,
+    get_convention,
+)
+from finances.models import Client, FrozenInvestment, Investment
+from finances.persistence import write_client
+from finances.projection import project_client
+from finances.sqlstore import SQLiteStore
+from finances.valuation import project_investments, value_investments
+
+
+def make_investment(day_count="30d", contributions=(), purchased=datetime(2024, 1, 31, 10)):
+    """Cria um investimento comprado em uma data fixa."""
+    investment = Investment("CDB", 1000.0, 0.01, day_count=day_count, contributions=contributions)
+    investment.date_purchased = purchased
+    return investment
+
+
+def brute_force_value(investment, now):
+    """Recalcula o valor somando o rendimento de cada fluxo, sem cronograma."""
+    convention = investment.day_count
+    flows = [(investment.date_purchased, investment.initial_amount)]
+    for schedule in investment.contributions:
+        flows.extend((moment, schedule.amount) for moment in schedule.dates(investment.date_purchased, now))
+    return sum(
+        amount * (1 + investment.rate_of_return) ** convention.periods(moment, now)
+        for moment, amount in flows
+        if moment <= now
+    )
+
+
+def test_thirty_360_months():
+    """Testa a contagem de meses completos na convenção 30/360."""
+    convention = get_convention("30/360")
+    start = datetime(2024, 1, 31, 10)
+    assert convention.periods(start, datetime(2024, 2, 29)) == 0
+    assert convention.periods(start, datetime(2024, 3, 1)) == 1
+    assert convention.step(start, 1) == datetime(2024, 3, 1)
+    assert convention.step(start, 2) == datetime(2024, 3, 30)
+    assert convention.periods(start, convention.step(start, 2)) == 2
+    assert convention.step(datetime(2024, 1, 15, 9), 12) == datetime(2025, 1, 15)
+
+
+def test_business_days():
+    """Testa a contagem de dias úteis, com feriados."""
+    friday, monday = datetime(2024, 5, 3), datetime(2024, 5, 6)
+    convention = get_convention("business/252")
+    assert convention.ordinal(monday) - convention.ordinal(friday) == 1
+    assert convention.ordinal(friday + timedelta(days=1)) == convention.ordinal(friday)
+    assert convention.periods(friday, friday + timedelta(days=14)) == pytest.approx(10 * 12 / 252)
+    with_holiday = Business252([date(2024, 5, 6), date(2024, 5, 4)])
+    assert with_holiday.holidays == (date(2024, 5, 4), date(2024, 5, 6))
+    assert with_holiday.ordinal(monday) == with_holiday.ordinal(friday)
+
+
+def test_unknown_convention():
+    """Testa que uma convenção desconhecida é recusada."""
+    with pytest.raises(ValueError):
+        get_convention("actual/360")
+    with pytest.raises(ValueError):
+        Investment("CDB", 1000.0, 0.01, day_count="actual/360")
+
+
+def test_default_convention_keeps_thirty_day_months():
+    """Testa que o investimento padrão continua rendendo por meses de 30 dias, sem cronograma."""
+    investment = make_investment()
+    assert investment.day_count.name == "30d"
+    assert investment._accrual() is None
+    as_of = investment.date_purchased + timedelta(days=95)
+    assert investment.calculate_value(as_of) == pytest.approx(1000.0 * 1.01 ** 3)
+
+
+def test_actual_365_daily_compounding():
+    """Testa a capitalização diária na convenção actual/365."""
+    investment = make_investment("actual/365")
+    as_of = investment.date_purchased + timedelta(days=100, hours=3)
+    assert investment.calculate_value(as_of) == pytest.approx(1000.0 * 1.01 ** (100 * 12 / 365))
+    value, start, end = investment._valuation
+    assert start <= as_of < end and end - start <= timedelta(days=1)
+    assert investment.calculate_value(as_of + timedelta(days=1)) > value
+
+
+def test_contributions_thirty_360():
+    """Testa aportes mensais limitados pelo número de aportes."""
+    schedule = ContributionSchedule(100.0, count=3)
+    investment = make_investment("30/360", [schedule], purchased=datetime(2024, 1, 15))
+    assert schedule.dates(investment.date_purchased, datetime(2030, 1, 1)) == [
+        datetime(2024, 2, 15), datetime(2024, 3, 15), datetime(2024, 4, 15)
+    ]
+    as_of = datetime(2024, 5, 20)
+    expected = 1000.0 * 1.01 ** 4 + 100.0 * (1.01 ** 3 + 1.01 ** 2 + 1.01)
+    assert investment.calculate_value(as_of) == pytest.approx(expected)
+    assert investment.calculate_value(datetime(2024, 2, 15)) == pytest.approx(1010.0 + 100.0)
+
+
+@pytest.mark.parametrize("day_count", ["30d", "30/360", "actual/365", "business/252"])
+def test_schedule_matches_recomputation(day_count):
+    """Testa que as consultas no cronograma coincidem com o recálculo, inclusive além do horizonte."""
+    contributions = [
+        ContributionSchedule(50.0),
+        ContributionSchedule(500.0, every_months=12, start=datetime(2024, 6, 30), end=datetime(2031, 1, 1)),
+    ]
+    investment = make_investment(day_count, contributions)
+    rng = random.Random(3)
+    moments = [investment.date_purchased + timedelta(minutes=rng.randrange(60 * 24 * 365 * 25)) for _ in range(200)]
+    for moment in moments:
+        investment._valuation = None
+        assert investment.calculate_value(moment) == pytest.approx(brute_force_value(investment, moment), rel=1e-9)
+    assert investment.calculate_value(investment.date_purchased - timedelta(days=1)) == 1000.0
+
+
+def test_schedule_is_rebuilt_after_changes():
+    """Testa que alterar o investimento descarta o cronograma."""
+    investment = make_investment("30/360")
+    as_of = datetime(2024, 6, 1)
+    before = investment.calculate_value(as_of)
+    schedule = investment._accrual()
+    investment.rate_of_return = 0.02
+    assert investment._accrual() is not schedule
+    assert investment.calculate_value(as_of) > before
+    investment.contributions = [ContributionSchedule(100.0, count=1)]
+    assert investment.calculate_value(as_of) == pytest.approx(brute_force_value(investment, as_of))
+    investment.day_count = "30d"
+    investment.contributions = ()
+    assert investment._accrual() is None
+
+
+def test_frozen_investment_keeps_convention():
+    """Testa que a cópia imutável mantém a convenção e os aportes."""
+    investment = make_investment("actual/365", [ContributionSchedule(10.0, count=2)])
+    frozen = investment.freeze()
+    assert isinstance(frozen, FrozenInvestment)
+    assert frozen.day_count is investment.day_count
+    assert frozen.contributions == investment.contributions
+    as_of = datetime(2025, 1, 1)
+    assert frozen.calculate_value(as_of) == pytest.approx(investment.calculate_value(as_of))
+    with pytest.raises(AttributeError):
+        frozen.day_count = "30d"
+
+
+@pytest.mark.parametrize("backend", ["numpy", "python"])
+def test_batch_and_projection_use_schedules(monkeypatch, backend):
+    """Testa que o patrimônio, a avaliação em lote e a projeção usam o cronograma."""
+    if backend == "python":
+        monkeypatch.setattr(valuation, "np", None)
+        monkeypatch.setattr(projection, "np", None)
+    elif valuation.np is None:
+        pytest.skip("NumPy não instalado")
+    client = Client("Maria")
+    plain = make_investment()
+    scheduled = make_investment("actual/365", [ContributionSchedule(100.0)])
+    client.add_investment(plain)
+    client.add_investment(scheduled)
+    as_of = datetime(2025, 3, 10)
+    expected = [plain.calculate_value(as_of), brute_force_value(scheduled, as_of)]
+    assert value_investments(client, as_of) == pytest.approx(expected)
+    assert client.get_net_worth(as_of) == pytest.approx(sum(expected))
+    dates = [as_of, add_months(as_of, 1)]
+    curve = project_client(client, dates, start=as_of).investment_values[1]
+    assert curve == pytest.approx([brute_force_value(scheduled, moment) for moment in dates])
+    projected = project_investments(client, 6)
+    assert projected[1] == pytest.approx(brute_force_value(scheduled, add_months(scheduled.date_purchased, 6)))
+
+
+def test_schedule_without_investment():
+    """Testa um cronograma criado diretamente."""
+    schedule = AccrualSchedule(get_convention("30d"), 0.01, 1000.0, datetime(2024, 1, 1))
+    assert schedule.values_over([datetime(2024, 1, 31), datetime(2024, 3, 1)]) == pytest.approx(
+        [1010.0, 1000.0 * 1.01 ** 2]
+    )
+
+
+def test_persistence_rejects_custom_conventions():
+    """Testa que o formato binário recusa convenções próprias e o SQLite, cronogramas."""
+    client = Client("Maria")
+    client.add_investment(make_investment("30/360", [ContributionSchedule(100.0)]))
+    write_client(client, io.BytesIO())
+    with pytest.raises(ValueError):
+        SQLiteStore().save_client(client)
+    client.add_investment(make_investment(Business252([date(2024, 5, 6)])))
+    with pytest.raises(ValueError):
+        write_client(client, io.BytesIO())
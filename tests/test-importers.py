@@ -0,0 +1,131 @@
+import io
+import pytest
+from datetime import datetime
+from finances.ledger import ColumnarLedger
+from finances.models import Account, Client
+from finances import importers
+from finances.importers import CategoryRules, import_csv, import_ofx, parse_amount, read_ofx
+
+CSV_DATA = """Data;Valor;Descrição;Categoria
+05/01/2024;5.000,00;Salário empresa;
+06/01/2024;-150,25;SUPERMERCADO BOM PRECO;
+06/01/2024;-20,00;Padaria;Food
+06/01/2024;-20,00;Padaria;Food
+"""
+
+OFX_DATA = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20240106120000[-3:BRT]
+<TRNAMT>-150.25
+<NAME>SUPERMERCADO BOM PRECO
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT</TRNTYPE><DTPOSTED>20240105</DTPOSTED><TRNAMT>5000.00</TRNAMT><MEMO>Salário</MEMO></STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+COLUMNS = {"date": "Data", "amount": "Valor", "description": "Descrição", "category": "Categoria"}
+RULES = CategoryRules({"supermercado": "Food", "sal[aá]rio": "Salary"})
+
+
+def test_parse_amount():
+    """Testa a conversão de valores em diferentes formatos."""
+    assert parse_amount("1,234.56") == 1234.56
+    assert parse_amount("-1.234,56", ",") == -1234.56
+    assert parse_amount("R$ 10,00", ",") == 10.0
+
+
+def test_import_csv_rules_and_dedupe():
+    """Testa a importação de CSV com regras de categoria e deduplicação."""
+    account = Account("Conta Corrente", ColumnarLedger())
+    options = dict(columns=COLUMNS, rules=RULES, date_format="%d/%m/%Y", decimal=",", delimiter=";", chunk_size=2)
+    result = import_csv(account, io.StringIO(CSV_DATA), **options)
+    assert (result.rows, result.imported, result.duplicates) == (4, 4, 0)
+    assert account.balance == pytest.approx(5000.0 - 150.25 - 40.0)
+    assert account.get_category_totals() == pytest.approx({"Salary": 5000.0, "Food": -190.25})
+    assert account.transactions[0].date == datetime(2024, 1, 5)
+
+    # Reimportar o mesmo arquivo não duplica transações
+    result = import_csv(account, io.StringIO(CSV_DATA), **options)
+    assert (result.imported, result.duplicates) == (0, 4)
+    assert len(account.transactions) == 4
+
+
+def test_import_csv_into_client_accounts():
+    """Testa a importação de CSV com uma coluna de conta para um cliente."""
+    client = Client("Maria")
+    data = "account,date,amount,description\nCorrente,2024-01-05,100.0,Depósito\nPoupança,2024-01-06,50.0,Depósito\n"
+    result = import_csv(client, io.StringIO(data), columns={"account": "account"})
+    assert result.imported == 2
+    assert client.get_account("Corrente").balance == 100.0
+    assert client.get_account("Poupança").get_transactions()[0].category == "Uncategorized"
+
+    with pytest.raises(ValueError):
+        import_csv(client, io.StringIO("date,amount\n2024-01-01,1.0\n"))
+
+
+def test_read_and_import_ofx():
+    """Testa a leitura e a importação de extratos OFX (SGML e XML)."""
+    rows = list(read_ofx(io.StringIO(OFX_DATA)))
+    assert rows[0] == (None, -150.25, "", "SUPERMERCADO BOM PRECO", datetime(2024, 1, 6, 12, 0, 0))
+    assert rows[1] == (None, 5000.0, "", "Salário", datetime(2024, 1, 5))
+
+    client = Client("João")
+    result = import_ofx(client, io.StringIO(OFX_DATA), rules=RULES, account_name="Conta Corrente")
+    assert result.imported == 2
+    account = client.get_account("Conta Corrente")
+    assert account.get_category_total("Food") == -150.25
+    assert import_ofx(account, io.StringIO(OFX_DATA)).duplicates == 2
+
+
+def test_import_csv_with_bom_and_timezones(tmp_path):
+    """Testa arquivos com marca de ordem de bytes e datas ISO com fuso horário."""
+    path = tmp_path / "extrato.csv"
+    data = "date,amount,description\n2024-01-05T10:00:00-03:00,100.0,Depósito\n2024-01-06 08:00:00,-5.0,Café\n"
+    path.write_bytes(data.encode("utf-8-sig"))
+    account = Account("Conta Corrente")
+    result = import_csv(account, str(path), date_format="%Y-%m-%dT%H:%M:%S")
+    assert result.imported == 2
+    assert [t.date for t in account.transactions] == [datetime(2024, 1, 5, 13, 0), datetime(2024, 1, 6, 8, 0)]
+    assert account.get_transactions(start_date=datetime(2024, 1, 5, 12, 0))[0].description == "Depósito"
+    assert import_csv(account, str(path), date_format="%Y-%m-%dT%H:%M:%S").duplicates == 2
+
+
+def test_dedupe_only_reads_dates_in_the_file():
+    """Testa que a deduplicação consulta a conta apenas nas datas do arquivo."""
+    class CountingLedger(ColumnarLedger):
+        reads = 0
+
+        def take(self, positions, category=None):
+            found = super().take(positions, category)
+            CountingLedger.reads += len(found)
+            return found
+
+        def __iter__(self):
+            raise AssertionError("a deduplicação não deve percorrer todo o histórico")
+
+    account = Account("Conta Corrente", CountingLedger())
+    account.add_transactions([(-1.0, "Food", "Lanche", datetime(2023, 1, 1, minute=m)) for m in range(60)])
+    account.add_transaction(-20.0, "Food", "Padaria", date=datetime(2024, 1, 6))
+    result = import_csv(account, io.StringIO("date,amount,description\n2024-01-06,-20.0,Padaria\n2024-01-06,-20.0,Padaria\n"))
+    assert (result.imported, result.duplicates) == (1, 1)
+    assert CountingLedger.reads == 1
+
+
+def test_dedupe_keeps_a_bounded_number_of_dates(monkeypatch):
+    """Testa que a deduplicação guarda poucas datas e continua correta em extratos fora de ordem."""
+    monkeypatch.setattr(importers, "DEDUPE_DATES", 2)
+    account = Account("Conta Corrente")
+    account.add_transaction(-20.0, "Food", "Padaria", date=datetime(2024, 1, 6))
+    lines = ["date,amount,description"] + [f"2024-02-{day:02d},-{day}.0,Compra" for day in range(1, 11)]
+    # Fora de ordem: 07/01 volta a aparecer depois de descartada, com uma nova cópia de Café
+    lines[3:3] = ["2024-01-06,-20.0,Padaria", "2024-01-07,-5.0,Café"]
+    lines.append("2024-01-07,-5.0,Café")
+    data = "\n".join(lines) + "\n"
+
+    result = import_csv(account, io.StringIO(data), chunk_size=3)
+    assert (result.imported, result.duplicates) == (12, 1)
+    assert len(account.get_transactions(start_date=datetime(2024, 1, 7), end_date=datetime(2024, 1, 7))) == 2
+    result = import_csv(account, io.StringIO(data), chunk_size=3)
+    assert (result.imported, result.duplicates) == (0, 13)
@@ -0,0 +1,131 @@
+import pytest
+from finances.indexes import BalanceIndex, CategoryIndex, DateIndex, TextIndex, tokenize
+
+
+def test_date_index_build_and_span():
+    """Testa a construção do DateIndex e a consulta por período."""
+    index = DateIndex.build([30, 10, 20, 10])
+    assert list(index.timestamps) == [10, 10, 20, 30]
+    assert list(index.positions) == [1, 3, 2, 0]
+
+    lo, hi = index.span(10, 20)
+    assert list(index.positions[lo:hi]) == [1, 3, 2]
+    assert index.span(31, None) == (4, 4)
+    assert index.span(None, 5) == (0, 0)
+
+
+def test_date_index_out_of_order_insert():
+    """Testa inserções fora de ordem no DateIndex."""
+    index = DateIndex()
+    for position, timestamp in enumerate([50, 10, 30, 30, 60]):
+        index.insert(timestamp, position)
+    assert list(index.timestamps) == [10, 30, 30, 50, 60]
+    assert list(index.positions) == [1, 2, 3, 0, 4]
+
+
+def test_date_index_remove():
+    """Testa a remoção de transações do DateIndex."""
+    index = DateIndex.build([10, 20, 20])
+    index.remove(20, 2)
+    assert list(index.positions) == [0, 1]
+    with pytest.raises(KeyError):
+        index.remove(20, 2)
+
+
+def test_category_index_build_and_remove():
+    """Testa a construção e a remoção de transações no CategoryIndex."""
+    index = CategoryIndex.build([("Food", -10.0), ("Salary", 100.0), ("Food", -5.0)])
+    assert list(index.positions["Food"]) == [0, 2]
+    assert index.totals == {"Food": -15.0, "Salary": 100.0}
+    assert index.counts == {"Food": 2, "Salary": 1}
+
+    index.remove("Salary", 100.0, 1)
+    assert "Salary" not in index.totals
+    index.add("Food", -1.0, 1)
+    assert list(index.positions["Food"]) == [0, 1, 2]
+    with pytest.raises(KeyError):
+        index.remove("Travel", 0.0, 0)
+
+
+def test_balance_index_sums():
+    """Testa as somas acumuladas do BalanceIndex após inclusões, ajustes e remoções."""
+    index = BalanceIndex.build([30, 10, 20], [3.0, 1.0, 2.0])
+    assert list(index.amounts) == [1.0, 2.0, 3.0]
+    assert index.total_until(5) == 0.0
+    assert index.total_until(20) == 3.0
+    assert index.total() == 6.0
+
+    index.insert(40, 3, 4.0)
+    index.insert(15, 4, 10.0)
+    assert list(index.totals_until([10, 15, 35, 40])) == [1.0, 11.0, 16.0, 20.0]
+
+    index.adjust(20, 2, 5.0)
+    assert index.total_until(20) == 18.0
+    index.remove(15, 4)
+    assert index.total() == 15.0
+    index.extend([5, 50], [5, 6], [100.0, 1000.0])
+    assert list(index.totals_until([5, 40, 50])) == [100.0, 115.0, 1115.0]
+    with pytest.raises(KeyError):
+        index.adjust(20, 4, 1.0)
+
+
+def test_balance_index_pending_adjustments():
+    """Testa que ajustes pendentes e descartes de somas mantêm os totais corretos."""
+    timestamps = list(range(0, 1000, 10))
+    index = BalanceIndex.build(timestamps, [1.0] * len(timestamps))
+    amounts = [1.0] * len(timestamps)
+    assert index.total() == 100.0
+    for step in range(3 * BalanceIndex.MAX_PENDING):
+        position = (step * 37) % len(timestamps)
+        index.adjust(timestamps[position], position, 2.0)
+        amounts[position] += 2.0
+        if step % 5 == 0:
+            index.insert(timestamps[position] + 1, len(amounts), 0.5)
+            timestamps.append(timestamps[position] + 1)
+            amounts.append(0.5)
+        cutoff = (step * 53) % 1000
+        expected = sum(amount for timestamp, amount in zip(timestamps, amounts) if timestamp <= cutoff)
+        assert index.total_until(cutoff) == pytest.approx(expected)
+    assert index.total() == pytest.approx(sum(amounts))
+
+
+def test_tokenize_normalizes_words():
+    """Testa a separação de palavras sem diferenciar maiúsculas e acentos."""
+    assert tokenize("Supermercado São João, nº 12") == ["supermercado", "sao", "joao", "no", "12"]
+    assert tokenize("  -- ") == []
+
+
+def test_text_index_lookup_add_and_remove():
+    """Testa as buscas, inclusões e remoções no TextIndex."""
+    index = TextIndex.build(["Supermercado Extra", "Uber", "supermercado extra extra", "Padaria"])
+    assert list(index.positions["extra"]) == [0, 2]
+    assert index.lookup(["supermercado"]) == [0, 2]
+    assert index.lookup(["supermercado", "extra"]) == [0, 2]
+    assert index.lookup(["supermercado", "uber"]) == []
+    assert index.lookup(["inexistente"]) == []
+    assert index.lookup(["supermercado"], within=[2, 3]) == [2]
+
+    index.remove("Uber", 1)
+    assert "uber" not in index.positions
+    index.add("Supermercado Dia", 1)
+    assert index.lookup(["supermercado"]) == [0, 1, 2]
+    with pytest.raises(KeyError):
+        index.remove("Padaria", 0)
+
+
+def test_date_index_tracks_chronological_order():
+    """Testa o indicador ordered do DateIndex (posições iguais às do ledger em ordem)."""
+    index = DateIndex.build([10, 20, 20])
+    assert index.ordered
+    index.insert(20, 3)  # mesma data da última: continua em ordem
+    index.extend([30, 40], range(4, 6))
+    assert index.ordered and list(index.positions) == [0, 1, 2, 3, 4, 5]
+    index.remove(40, 5)
+    index.insert(50, 5)
+    assert index.ordered
+    index.insert(5, 6)
+    assert not index.ordered
+    assert not DateIndex.build([20, 10]).ordered
+    balances = BalanceIndex.build([10, 20], [1.0, 2.0])
+    balances.insert(15, 2, 3.0)
+    assert not balances.ordered
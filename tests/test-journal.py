@@ -0,0 +1,162 @@
+import os
+import threading
+import pytest
+from datetime import datetime, timedelta
+from finances import journal as journal_module
+from finances.daycount import ContributionSchedule
+from finances.journal import Journal, recover, replay
+from finances.models import Client, Investment
+
+
+def make_client():
+    """Cria um cliente com uma conta e uma transação."""
+    client = Client("Maria")
+    client.add_account("Conta Corrente").add_transaction(1000.0, "Salary", "Salário", date=datetime(2024, 1, 5))
+    return client
+
+
+def snapshot(client):
+    """Resume o conteúdo de um cliente para comparação."""
+    return (
+        client.name,
+        [
+            (account.name, account.balance, [(t.amount, t.date, t.category, t.description) for t in account.transactions])
+            for account in client.accounts
+        ],
+        [(i.type, i.initial_amount, i.rate_of_return, i.date_purchased) for i in client.investments],
+    )
+
+
+def mutate(client):
+    """Aplica ao cliente alterações de todos os tipos registrados no journal."""
+    checking = client.accounts[0]
+    checking.add_transaction(-200.0, "Food", "Supermercado", date=datetime(2024, 1, 7))
+    savings = client.add_account("Poupança")
+    savings.add_transactions([(300.0, "Transfer", "Transferência", datetime(2024, 1, 8))])
+    checking.transactions[1].update(amount=-250.0, date=datetime(2024, 1, 6))
+    investment = Investment("Ações", 500.0, 0.01)
+    client.add_investment(investment)
+    client.add_transactions({"Cartão": [(-30.0, "Leisure", "Cinema", datetime(2024, 1, 9))]})
+
+
+def test_journal_recover(tmp_path):
+    """Testa que recover reconstrói o cliente a partir do snapshot e do journal."""
+    client = make_client()
+    journal = Journal(str(tmp_path), client)
+    mutate(client)
+    journal.close()
+    assert snapshot(recover(str(tmp_path))) == snapshot(client)
+
+
+def test_journal_sync_mode_is_durable_on_return(tmp_path):
+    """Testa que, no modo síncrono, cada alteração está no arquivo ao retornar."""
+    client = make_client()
+    journal = Journal(str(tmp_path), client, sync=True, commit_interval=1.0)
+    client.accounts[0].add_transaction(-10.0, "Food", "Lanche", date=datetime(2024, 2, 1))
+    assert snapshot(recover(str(tmp_path))) == snapshot(client)
+    journal.close()
+
+
+def test_journal_compaction(tmp_path):
+    """Testa que a compactação inicia uma nova geração e remove a anterior."""
+    client = make_client()
+    journal = Journal(str(tmp_path), client, compact_every=3)
+    for day in range(1, 8):
+        client.accounts[0].add_transaction(-float(day), "Food", "Lanche", date=datetime(2024, 2, day))
+    journal.close()
+    assert journal.generation == 3
+    assert sorted(os.listdir(tmp_path)) == ["journal-00000003.log", "snapshot-00000003.ngfs"]
+    assert snapshot(recover(str(tmp_path))) == snapshot(client)
+
+
+@pytest.mark.parametrize("sync", [False, True])
+def test_concurrent_compaction_does_not_duplicate_changes(tmp_path, sync):
+    """Testa que compactações concorrentes com as alterações não as registram duas vezes."""
+    for run in range(3):
+        directory = str(tmp_path / f"{sync}-{run}")
+        client = Client("Maria", concurrent=True)
+        accounts = [client.add_account(f"Conta {i}") for i in range(8)]
+        journal = Journal(directory, client, sync=sync, compact_every=3)
+
+        def add(account):
+            for day in range(150):
+                account.add_transaction(1.0, "Food", "Lanche", date=datetime(2024, 1, 1) + timedelta(hours=day))
+
+        threads = [threading.Thread(target=add, args=(account,)) for account in accounts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        journal.close()
+        recovered = recover(directory)
+        assert [len(account.transactions) for account in recovered.accounts] == [150] * 8
+        assert [account.balance for account in recovered.accounts] == [150.0] * 8
+
+
+def test_replay_ignores_torn_record(tmp_path):
+    """Testa que um último registro incompleto é ignorado na recuperação."""
+    client = make_client()
+    journal = Journal(str(tmp_path), client)
+    client.accounts[0].add_transaction(-10.0, "Food", "Lanche", date=datetime(2024, 2, 1))
+    journal.close()
+    with open(tmp_path / "journal-00000001.log", "a", encoding="utf-8") as file:
+        file.write('{"e": "add", "a": 0, "t": [[-5.0')
+    assert snapshot(recover(str(tmp_path))) == snapshot(client)
+    assert replay(Client("Vazio"), []) == 0
+
+
+def test_journal_close_detaches(tmp_path):
+    """Testa que alterações após close não são registradas."""
+    client = make_client()
+    journal = Journal(str(tmp_path), client)
+    journal.close()
+    journal.close()
+    client.accounts[0].add_transaction(-10.0, "Food", "Lanche")
+    assert len(recover(str(tmp_path)).accounts[0].transactions) == 1
+
+
+def test_journal_recover_investment_changes_balance_and_sale(tmp_path):
+    """Testa a recuperação de investimentos alterados após serem adicionados, saldos e vendas."""
+    client = make_client()
+    journal = Journal(str(tmp_path), client)
+    investment = Investment("Previdência", 500.0, 0.01, day_count="30/360")
+    client.add_investment(investment)
+    investment.date_purchased -= timedelta(days=400)
+    investment.rate_of_return = 0.02
+    investment.day_count = "actual/365"
+    investment.contributions = [ContributionSchedule(100.0, every_months=2, start=datetime(2024, 3, 1), count=5)]
+    client.add_investment(Investment("Ações", 300.0, 0.01))
+    client.accounts[0].balance = 5000.0
+    client.investments[1].sell(client.accounts[0])
+    journal.close()
+
+    recovered = recover(str(tmp_path))
+    assert snapshot(recovered) == snapshot(client)
+    restored = recovered.investments[0]
+    assert restored.day_count.name == "actual/365"
+    assert [(c.amount, c.every_months, c.start, c.count, c.end) for c in restored.contributions] == [
+        (100.0, 2, datetime(2024, 3, 1), 5, None)
+    ]
+    as_of = datetime(2030, 1, 1)
+    assert restored.calculate_value(as_of) == pytest.approx(investment.calculate_value(as_of))
+
+
+def test_replay_rejects_unknown_record():
+    """Testa que registros de tipo desconhecido não são ignorados."""
+    with pytest.raises(ValueError):
+        replay(Client("Vazio"), ['{"e": "desconhecido"}\n'])
+
+
+def test_journal_keeps_previous_generation_until_snapshot_is_saved(tmp_path, monkeypatch):
+    """Testa que uma falha ao gravar o snapshot não remove a geração anterior."""
+    client = make_client()
+    Journal(str(tmp_path), client).close()
+
+    def fail(client, path):
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(journal_module, "save_client", fail)
+    with pytest.raises(OSError):
+        Journal(str(tmp_path), Client("Outro"))
+    assert sorted(os.listdir(tmp_path)) == ["journal-00000001.log", "snapshot-00000001.ngfs"]
+    assert snapshot(recover(str(tmp_path))) == snapshot(client)
@@ -0,0 +1,127 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from finances.models import Account, Client, Transaction
+from finances.ledger import ColumnarLedger, ListLedger, from_micros, to_micros
+
+
+def test_micros_round_trip():
+    """Testa a conversão de datas para microssegundos e de volta."""
+    date = datetime(2024, 3, 15, 10, 30, 45, 123456)
+    assert from_micros(to_micros(date)) == date
+
+
+def test_account_default_ledger():
+    """Testa que a conta usa ListLedger por padrão."""
+    account = Account("Conta Corrente")
+    assert isinstance(account.transactions, ListLedger)
+    assert account.transactions == []
+
+
+def test_columnar_add_and_get_transactions():
+    """Testa add_transaction e get_transactions com o ledger colunar."""
+    account = Account("Conta Corrente", ColumnarLedger())
+    account.add_transaction(200.0, "Salary", "Salário recebido")
+    account.add_transaction(-50.0, "Food", "Almoço")
+    account.add_transaction(-30.0, "Food", "Jantar")
+
+    assert account.balance == 120.0
+    assert len(account.transactions) == 3
+    assert [t.amount for t in account.get_transactions()] == [200.0, -50.0, -30.0]
+
+    food = account.get_transactions(category="Food")
+    assert [t.description for t in food] == ["Almoço", "Jantar"]
+    assert account.get_transactions(category="Travel") == []
+
+
+def test_columnar_date_filter():
+    """Testa o filtro por data no ledger colunar."""
+    account = Account("Conta Corrente", ColumnarLedger())
+    transaction = account.add_transaction(100.0, "Salary", "Salário")
+    start_date = transaction.date - timedelta(days=1)
+    end_date = transaction.date + timedelta(days=1)
+    assert len(account.get_transactions(start_date=start_date, end_date=end_date)) == 1
+    assert account.get_transactions(start_date=end_date) == []
+    assert account.transactions[0].date == transaction.date
+
+
+def test_columnar_interns_strings():
+    """Testa que categorias repetidas são armazenadas uma única vez."""
+    ledger = ColumnarLedger()
+    account = Account("Conta Corrente", ledger)
+    for _ in range(100):
+        account.add_transaction(-10.0, "Food", "Supermercado")
+    assert len(ledger.strings) == 2
+    assert set(ledger.categories) == {ledger.intern("Food")}
+
+
+def test_columnar_update_writes_back():
+    """Testa que Transaction.update grava as alterações nas colunas."""
+    account = Account("Conta Corrente", ColumnarLedger())
+    transaction = account.add_transaction(100.0, "Food", "Almoço")
+    transaction.update(category="Restaurant", description="Jantar")
+    assert account.transactions[0].category == "Restaurant"
+
+    view = account.transactions[0]
+    view.update(amount=80.0)
+    assert account.transactions[-1].amount == 80.0
+    assert account.transactions[0].description == "Jantar"
+
+
+def test_columnar_views_stay_in_sync():
+    """Testa atualizações feitas por duas views da mesma posição do ledger colunar."""
+    account = Account("Conta Corrente", ColumnarLedger())
+    account.add_transaction(100.0, "Food", "Almoço")
+    first, second = account.transactions[0], account.transactions[0]
+    first.update(category="Travel")
+    second.update(amount=50.0)
+
+    stored = account.transactions[0]
+    assert (stored.amount, stored.category) == (50.0, "Travel")
+    assert (second.amount, second.category) == (50.0, "Travel")
+    assert account.balance == 50.0
+    assert account.get_category_totals() == {"Travel": 50.0}
+    assert account.get_transactions(category="Food") == []
+
+
+def test_columnar_append_keeps_columns_aligned():
+    """Testa que um valor inválido não deixa as colunas com tamanhos diferentes."""
+    ledger = ColumnarLedger()
+    ledger.append(Transaction(100.0, "Food", "Almoço", date=datetime(2024, 1, 1)))
+    bad_rows = [
+        Transaction(-20.0, "Food", "Jantar", date=datetime(2024, 1, 2, tzinfo=timezone.utc)),
+        Transaction("abc", "Food", "Jantar", date=datetime(2024, 1, 2)),
+    ]
+    for row in bad_rows:
+        with pytest.raises((TypeError, ValueError)):
+            ledger.append(row)
+        with pytest.raises((TypeError, ValueError)):
+            ledger.extend([Transaction(-5.0, "Food", "Café", date=datetime(2024, 1, 3)), row])
+    columns = (ledger.amounts, ledger.timestamps, ledger.categories, ledger.descriptions)
+    assert [len(column) for column in columns] == [1, 1, 1, 1]
+
+
+def test_columnar_add_transactions_does_not_create_objects(monkeypatch):
+    """Testa que a inclusão em lote no ledger colunar grava as colunas sem criar transações."""
+    account = Account("Conta Corrente", ColumnarLedger())
+    account.get_transactions(start_date=datetime(2024, 1, 1))  # constrói o índice por data
+    created = []
+    original = Transaction.__init__
+    monkeypatch.setattr(Transaction, "__init__", lambda self, *args, **kwargs: created.append(self) or original(self, *args, **kwargs))
+    added = account.add_transactions([(-float(i), "Food", f"Compra {i}", datetime(2024, 1, 1 + i)) for i in range(10)])
+    assert created == []
+    assert account.balance == -45.0
+    assert len(added) == 10
+    assert added[3].description == "Compra 3" and added[-1].date == datetime(2024, 1, 10)
+    assert [t.amount for t in added[8:]] == [-8.0, -9.0]
+    assert len(account.get_transactions(start_date=datetime(2024, 1, 5))) == 6
+    added[0].update(amount=-100.0)
+    assert account.balance == -145.0
+
+
+def test_client_add_account_with_ledger():
+    """Testa a criação de conta com ledger colunar via Client."""
+    client = Client("João")
+    account = client.add_account("Conta Corrente", ColumnarLedger())
+    account.add_transaction(300.0, "Salary")
+    assert isinstance(account.transactions, ColumnarLedger)
+    assert client.get_net_worth() == 300.0
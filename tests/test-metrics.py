@@ -0,0 +1,121 @@
+import re
+from datetime import datetime
+from finances import metrics, utils
+from finances.clock import frozen_clock
+from finances.metrics import MetricsRegistry, instrumented
+from finances.models import Account, Client, Investment
+from finances.utils import future_value_report, generate_report
+
+
+def make_client():
+    """Cria um cliente com uma conta e um investimento."""
+    client = Client("Maria")
+    account = client.add_account("Conta Corrente")
+    account.add_transaction(1000.0, "Salary", "Salário", datetime(2024, 1, 5))
+    account.add_transaction(-50.0, "Food", "Restaurante", datetime(2024, 1, 6))
+    investment = Investment("Ações", 1000.0, 0.02)
+    investment.date_purchased = datetime(2024, 1, 1)
+    client.add_investment(investment)
+    return client
+
+
+def test_registry_observe_and_snapshot():
+    """Testa a contagem, o total e o máximo registrados por operação."""
+    registry = MetricsRegistry()
+    registry.observe("a", 0.5)
+    registry.observe("a", 1.5)
+    with registry.time("b"):
+        pass
+    snapshot = registry.snapshot()
+    assert snapshot["a"] == {"count": 2, "total": 2.0, "mean": 1.0, "max": 1.5}
+    assert snapshot["b"]["count"] == 1
+    assert registry.get("c") is None
+    registry.reset()
+    assert registry.snapshot() == {}
+
+
+def test_prometheus_export():
+    """Testa o formato de texto do Prometheus."""
+    registry = MetricsRegistry(prefix="app")
+    registry.observe("report", 0.25)
+    registry.observe('strange "name"', 1.0)
+    text = registry.export_prometheus()
+    assert "# TYPE app_operation_seconds summary" in text
+    assert 'app_operation_seconds_count{operation="report"} 1' in text
+    assert 'app_operation_seconds_sum{operation="report"} 0.25' in text
+    assert 'app_operation_seconds_max{operation="report"} 0.25' in text
+    assert 'operation="strange \\"name\\""' in text
+    sample = re.compile(r'^app_operation_seconds(_count|_sum|_max)\{operation="(?:[^"\\]|\\.)*"\} \S+$')
+    assert all(line.startswith("#") or sample.match(line) for line in text.splitlines())
+
+
+def test_instrumentation_counts_hot_paths():
+    """Testa a contagem das chamadas dos métodos instrumentados."""
+    client = make_client()
+    account = client.accounts[0]
+    with instrumented(MetricsRegistry()) as registry:
+        account.add_transaction(-10.0, "Food", "Padaria", datetime(2024, 1, 7))
+        account.get_transactions(category="Food")
+        client.investments[0].calculate_value(datetime(2024, 6, 1))
+        client.get_net_worth(datetime(2024, 6, 1))
+    snapshot = registry.snapshot()
+    assert snapshot["add_transaction"]["count"] == 1
+    assert snapshot["get_transactions"]["count"] == 1
+    assert snapshot["calculate_value"]["count"] == 1
+    assert snapshot["get_net_worth"]["count"] == 1
+    assert all(values["total"] >= 0 for values in snapshot.values())
+
+
+def test_instrumentation_report_sections():
+    """Testa a medição do relatório e de cada uma de suas seções."""
+    client = make_client()
+    with frozen_clock(datetime(2025, 1, 1)):
+        expected = generate_report(client)
+        with instrumented(MetricsRegistry()) as registry:
+            assert generate_report(client) == expected
+            lines = utils.iter_report_lines(client)
+            for _ in range(3):  # cabeçalho e início da seção das contas
+                next(lines)
+            lines.close()  # relatório abandonado: a chamada ainda é registrada
+            future_value_report(client, datetime(2026, 1, 1))
+    snapshot = registry.snapshot()
+    assert snapshot["report"]["count"] == 2
+    assert snapshot["report_accounts"]["count"] == 2
+    assert snapshot["report_investments"]["count"] == 1
+    assert snapshot["report_net_worth"]["count"] == 1
+    assert snapshot["value_investments"]["count"] == 1
+    assert snapshot["report_projection"]["count"] == 1
+    assert snapshot["report_projection_format"]["count"] == 1
+    assert snapshot["report"]["total"] >= snapshot["report_accounts"]["total"]
+
+
+def test_disable_restores_originals():
+    """Testa que desativar a instrumentação restaura os métodos originais."""
+    original = Account.__dict__["add_transaction"]
+    registry = metrics.enable(MetricsRegistry())
+    try:
+        assert metrics.is_enabled()
+        assert Account.__dict__["add_transaction"] is not original
+        try:
+            metrics.enable()
+            assert False, "Esperava RuntimeError"
+        except RuntimeError:
+            pass
+    finally:
+        metrics.disable()
+    assert not metrics.is_enabled()
+    assert Account.__dict__["add_transaction"] is original
+
+    Client("Ana").add_account("Conta").add_transaction(1.0, "Food")
+    assert registry.get("add_transaction") is None
+
+
+def test_instrumented_errors_are_counted():
+    """Testa que chamadas que lançam exceções também são registradas."""
+    account = Account("Conta")
+    with instrumented(MetricsRegistry()) as registry:
+        try:
+            account.add_transaction("inválido", "Food")
+        except Exception:
+            pass
+    assert registry.get("add_transaction").count == 1
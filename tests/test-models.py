@@ -1,6 +1,11 @@
+import copy
+import pickle
+import threading
 import pytest
-from datetime import datetime, timedelta
-from finances.models import Transaction, Account, Investment, Client
+from datetime import datetime, timedelta, timezone
+from finances.daycount import ContributionSchedule
+from finances.ledger import ColumnarLedger
+from finances.models import Transaction, FrozenTransaction, Account, Investment, FrozenInvestment, Client
 
 
 def test_transaction_initialization():
@@ -132,4 +137,480 @@ def test_client_get_net_worth():
     investment.date_purchased -= timedelta(days=90)  # 3 meses atrás
     
     expected_net_worth = account.balance + investment.calculate_value()
-    assert pytest.approx(client.get_net_worth(), rel=1e-2) == expected_net_worth
\ No newline at end of file
+    assert pytest.approx(client.get_net_worth(), rel=1e-2) == expected_net_worth
+
+
+def test_get_transactions_date_index():
+    """Testa o filtro por data com inserções fora de ordem e datas alteradas via update."""
+    account = Account("Conta Corrente")
+    base = datetime(2024, 1, 1)
+    january = account.add_transaction(100.0, "Salary", "Janeiro")
+    march = account.add_transaction(-20.0, "Food", "Março")
+    february = account.add_transaction(-10.0, "Food", "Fevereiro")
+    january.update(date=base)
+    march.update(date=base + timedelta(days=60))
+    february.update(date=base + timedelta(days=31))
+
+    window = account.get_transactions(start_date=base + timedelta(days=30), end_date=base + timedelta(days=45))
+    assert window == [february]
+
+    # Alteração de data depois de o índice já ter sido construído
+    march.update(date=base + timedelta(days=40))
+    window = account.get_transactions(start_date=base + timedelta(days=30), end_date=base + timedelta(days=45))
+    assert window == [march, february]
+
+    assert account.get_transactions(end_date=base + timedelta(days=45), category="Food") == [march, february]
+    assert account.get_transactions(start_date=base + timedelta(days=90)) == []
+
+
+def test_account_category_totals():
+    """Testa os totais e contagens por categoria de Account."""
+    account = Account("Conta Corrente")
+    account.add_transaction(1000.0, "Salary", "Salário")
+    lunch = account.add_transaction(-50.0, "Food", "Almoço")
+    assert account.get_category_total("Food") == -50.0
+
+    account.add_transaction(-30.0, "Food", "Jantar")
+    assert account.get_category_total("Food") == -80.0
+    assert account.get_category_count("Food") == 2
+    assert account.get_category_total("Travel") == 0.0
+    assert account.get_category_totals() == {"Salary": 1000.0, "Food": -80.0}
+
+    lunch.update(amount=-70.0)
+    assert account.get_category_total("Food") == -100.0
+    assert account.balance == 900.0
+
+    lunch.update(category="Restaurant", amount=-60.0)
+    assert account.get_category_total("Food") == -30.0
+    assert account.get_category_count("Food") == 1
+    assert account.get_category_total("Restaurant") == -60.0
+    assert account.get_transactions(category="Restaurant") == [lunch]
+    assert account.balance == 910.0
+
+
+def test_client_net_worth_cache(monkeypatch):
+    """Testa que get_net_worth usa o cache e reflete alterações em contas e investimentos."""
+    client = Client("João")
+    account = client.add_account("Conta Corrente")
+    account.add_transaction(2000.0, "Salary", "Salário recebido")
+    investment = Investment("Ações", 1000.0, 0.02)
+    client.add_investment(investment)
+    investment.date_purchased -= timedelta(days=90)  # 3 meses atrás
+    assert pytest.approx(client.get_net_worth()) == 2000.0 + 1000.0 * 1.02 ** 3
+
+    # Sem alterações, o valor vem do cache, sem reavaliar os investimentos
+    calls = []
+    original = Investment._cache_value
+    monkeypatch.setattr(Investment, "_cache_value", lambda self, *args: calls.append(self) or original(self, *args))
+    client.get_net_worth()
+    assert calls == []
+
+    account.add_transaction(-500.0, "Food", "Supermercado")
+    assert pytest.approx(client.get_net_worth()) == 1500.0 + 1000.0 * 1.02 ** 3
+    assert calls == []
+
+    investment.rate_of_return = 0.01
+    assert pytest.approx(client.get_net_worth()) == 1500.0 + 1000.0 * 1.01 ** 3
+    assert calls == [investment]
+
+    # Investimento com a data alterada para completar mais um mês
+    investment.date_purchased -= timedelta(days=30)
+    assert pytest.approx(client.get_net_worth()) == 1500.0 + 1000.0 * 1.01 ** 4
+
+
+def test_client_net_worth_cache_sees_list_members():
+    """Testa que contas e investimentos incluídos diretamente nas listas invalidam o cache."""
+    client = Client("João")
+    assert client.get_net_worth() == 0.0
+    account = Account("Conta Corrente")
+    client.accounts.append(account)
+    assert client.get_net_worth() == 0.0
+    account.add_transaction(100.0, "Salary", "Salário")
+    assert client.get_net_worth() == 100.0
+
+    investment = Investment("Ações", 1000.0, 0.0)
+    client.investments.append(investment)
+    assert client.get_net_worth() == 1100.0
+    investment.initial_amount = 5000.0
+    assert client.get_net_worth() == 5100.0
+
+    replacement = Account("Poupança")
+    client.accounts[0] = replacement
+    replacement.balance = 30.0
+    assert client.get_net_worth() == 5030.0
+    client.accounts = [account]
+    assert client.get_net_worth() == 5100.0
+    del client.investments[:]
+    assert client.get_net_worth() == 100.0
+
+
+def test_client_pickle_round_trip():
+    """Testa que o cliente pode ser serializado com pickle e mantém o cache consistente."""
+    client = Client("João")
+    client.add_account("Conta Corrente").add_transaction(100.0, "Salary", "Salário")
+    client.add_investment(Investment("Ações", 1000.0, 0.0))
+    assert client.get_net_worth() == 1100.0
+    copy = pickle.loads(pickle.dumps(client))
+    assert copy.get_net_worth() == 1100.0
+    copy.accounts[0].add_transaction(50.0, "Salary", "Bônus")
+    copy.investments[0].initial_amount = 2000.0
+    assert copy.get_net_worth() == 2150.0
+    assert client.get_net_worth() == 1100.0
+
+
+def test_account_add_transactions():
+    """Testa a inclusão de transações em lote, com datas explícitas."""
+    account = Account("Conta Corrente")
+    account.add_transaction(100.0, "Salary", "Salário", date=datetime(2024, 1, 5))
+    account.get_transactions(start_date=datetime(2024, 1, 1))  # constrói o índice por data
+    account.get_category_total("Food")  # constrói o índice por categoria
+
+    added = account.add_transactions([
+        (-20.0, "Food", "Almoço", datetime(2024, 1, 3)),
+        Transaction(-5.0, "Food", "Café", date=datetime(2024, 1, 10)),
+        (50.0, "Transfer"),
+    ])
+    assert len(added) == 3
+    assert account.transactions[1:3] == added[:2]
+    assert account.balance == 125.0
+    assert account.get_category_total("Food") == -25.0
+    january = account.get_transactions(start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 6))
+    assert [t.description for t in january] == ["Salário", "Almoço"]
+
+    added[0].update(amount=-30.0)
+    assert account.balance == 115.0
+
+
+def test_account_add_transactions_is_atomic():
+    """Testa que nenhuma transação é adicionada se uma das linhas for inválida."""
+    account = Account("Conta Corrente")
+    account.add_transaction(100.0, "Salary", "Salário")
+    with pytest.raises(TypeError):
+        account.add_transactions([(-20.0, "Food", "Almoço"), ("abc", "Food", "Inválida")])
+    with pytest.raises(TypeError):
+        account.add_transactions([(-20.0, "Food", "Almoço", "2024-01-01")])
+    assert account.balance == 100.0
+    assert len(account.transactions) == 1
+
+
+@pytest.mark.parametrize("ledger", [None, ColumnarLedger])
+def test_add_transaction_validates_before_changing_the_account(ledger):
+    """Testa que add_transaction rejeita valores inválidos sem alterar a conta."""
+    account = Account("Conta Corrente", ledger() if ledger else None)
+    account.add_transaction(100.0, "Salary", "Salário", date=datetime(2024, 1, 1))
+    account.get_transactions(start_date=datetime(2024, 1, 1))  # constrói o índice por data
+    with pytest.raises(TypeError):
+        account.add_transaction(-20.0, "Food", "Almoço", date=datetime(2024, 1, 2, tzinfo=timezone.utc))
+    with pytest.raises(TypeError):
+        account.add_transaction("abc", "Food", "Almoço")
+    with pytest.raises(TypeError):
+        account.add_transaction(-20.0, None, "Almoço")
+    assert account.balance == 100.0
+    assert len(account.transactions) == 1
+    assert len(account.transactions.date_micros()) == 1
+    assert len(account.get_transactions(start_date=datetime(2024, 1, 1))) == 1
+
+
+def test_client_add_transactions():
+    """Testa a inclusão de transações em lote em várias contas do cliente."""
+    client = Client("João")
+    checking = client.add_account("Conta Corrente")
+    client.add_transactions({
+        "Conta Corrente": [(1000.0, "Salary", "Salário", datetime(2024, 1, 5))],
+        "Poupança": [(200.0, "Transfer", "Depósito", datetime(2024, 1, 6))],
+    })
+    assert checking.balance == 1000.0
+    assert client.get_account("Poupança").balance == 200.0
+    assert client.get_net_worth() == 1200.0
+
+    with pytest.raises(TypeError):
+        client.add_transactions({"Conta Corrente": [(1.0, "Food")], "Nova": [(None, "Food")]})
+    assert checking.balance == 1000.0
+    assert client.get_account("Nova") is None
+
+
+def test_concurrent_account_balance_is_consistent():
+    """Testa que várias threads alterando as mesmas contas mantêm os saldos consistentes."""
+    client = Client("Ana", concurrent=True)
+    shared = client.add_account("Conjunta")
+    workers, per_worker = 8, 2000
+
+    def work(worker):
+        own = client.add_account(f"Conta {worker}")
+        for i in range(per_worker):
+            shared.add_transaction(1.0, "Salary")
+            own.add_transaction(2.0, "Food")
+            if i % 100 == 0:
+                shared.get_transactions(category="Salary")
+                client.get_net_worth()
+        shared.add_transactions([(0.5, "Transfer")] * 10)
+        client.add_transactions({"Conjunta": [(0.5, "Transfer")], f"Conta {worker}": [(1.0, "Food")]})
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(shared.transactions) == workers * (per_worker + 11)
+    assert shared.balance == pytest.approx(workers * (per_worker + 5.5))
+    assert shared.balance == pytest.approx(sum(t.amount for t in shared.transactions))
+    assert [t._position for t in shared.transactions] == list(range(len(shared.transactions)))
+    assert shared.get_category_count("Salary") == workers * per_worker
+    assert len(shared.get_transactions(category="Salary")) == workers * per_worker
+    assert client.get_net_worth() == pytest.approx(sum(account.balance for account in client.accounts))
+
+
+def test_concurrent_transaction_updates():
+    """Testa alterações concorrentes de transações de uma conta concorrente."""
+    account = Account("Conta Corrente", concurrent=True)
+    transactions = account.add_transactions([(1.0, "Food")] * 1000)
+    account.get_category_total("Food")  # constrói o índice por categoria
+
+    def work(offset):
+        for transaction in transactions[offset::4]:
+            transaction.update(amount=transaction.amount + 1.0, category="Leisure")
+
+    threads = [threading.Thread(target=work, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert account.balance == pytest.approx(2000.0)
+    assert account.get_category_totals() == {"Leisure": pytest.approx(2000.0)}
+    assert len(account.get_transactions(category="Leisure")) == 1000
+
+
+def test_transaction_slots_and_update_validation():
+    """Testa que transações não têm __dict__ e que update rejeita atributos desconhecidos."""
+    account = Account("Conta Corrente")
+    transaction = account.add_transaction(100.0, "Food", "Almoço")
+    assert not hasattr(transaction, "__dict__")
+    with pytest.raises(AttributeError):
+        transaction.update(amount=50.0, notes="inválido")
+    with pytest.raises(AttributeError):
+        transaction.update(_position=3)
+    assert transaction.amount == 100.0
+    assert account.balance == 100.0
+
+
+def test_failed_update_changes_nothing():
+    """Testa que uma atualização inválida ou com falha na gravação não altera a transação nem o saldo."""
+    class FailingLedger(ColumnarLedger):
+        def store(self, position, transaction):
+            raise OSError("disco cheio")
+
+    account = Account("Conta Corrente", FailingLedger())
+    transaction = account.add_transaction(100.0, "Food", "Almoço", date=datetime(2024, 1, 5))
+    account.get_transactions(category="Food")  # constrói o índice de categorias
+    with pytest.raises(TypeError):
+        transaction.update(amount=50.0, date="2024-01-06")
+    with pytest.raises(OSError):
+        transaction.update(amount=50.0, category="Travel")
+
+    assert (transaction.amount, transaction.category, transaction.date) == (100.0, "Food", datetime(2024, 1, 5))
+    assert account.balance == 100.0
+    assert account.get_category_totals() == {"Food": 100.0}
+    assert account.transactions[0].amount == 100.0
+
+
+def test_frozen_transaction():
+    """Testa transações imutáveis."""
+    frozen = Transaction(100.0, "Food", "Almoço", date=datetime(2024, 1, 5)).freeze()
+    assert isinstance(frozen, FrozenTransaction)
+    assert frozen == FrozenTransaction(100.0, "Food", "Almoço", date=datetime(2024, 1, 5))
+    assert len({frozen, frozen.freeze()}) == 1
+    with pytest.raises(AttributeError):
+        frozen.amount = 50.0
+    with pytest.raises(AttributeError):
+        frozen.update(amount=50.0)
+
+    account = Account("Conta Corrente")
+    added = account.add_transactions([frozen])[0]
+    assert type(added) is Transaction and added is not frozen
+    added.update(amount=80.0)
+    assert account.balance == 80.0
+    assert frozen.amount == 100.0
+
+
+def test_frozen_investment():
+    """Testa investimentos imutáveis."""
+    investment = Investment("Ações", 1000.0, 0.02)
+    investment.date_purchased = datetime.now() - timedelta(days=60)
+    frozen = investment.freeze()
+    assert isinstance(frozen, FrozenInvestment)
+    assert not hasattr(frozen, "__dict__")
+    with pytest.raises(AttributeError):
+        frozen.rate_of_return = 0.05
+    client = Client("João")
+    client.add_investment(frozen)
+    assert pytest.approx(client.get_net_worth()) == investment.calculate_value()
+
+
+@pytest.mark.parametrize("duplicate", [lambda x: pickle.loads(pickle.dumps(x)), copy.copy, copy.deepcopy])
+def test_frozen_objects_can_be_copied(duplicate):
+    """Testa que transações e investimentos imutáveis podem ser serializados e copiados."""
+    frozen = FrozenTransaction(100.0, "Food", "Almoço", date=datetime(2024, 1, 5))
+    copied = duplicate(frozen)
+    assert type(copied) is FrozenTransaction and copied == frozen
+    with pytest.raises(AttributeError):
+        copied.amount = 50.0
+
+    investment = FrozenInvestment(
+        "Previdência", 1000.0, 0.01, datetime(2024, 1, 10), day_count="actual/365",
+        contributions=[ContributionSchedule(200.0, every_months=1, count=6)]
+    )
+    copied = duplicate(investment)
+    assert type(copied) is FrozenInvestment
+    assert (copied.type, copied.initial_amount, copied.rate_of_return, copied.date_purchased) == (
+        "Previdência", 1000.0, 0.01, datetime(2024, 1, 10)
+    )
+    assert copied.day_count is investment.day_count
+    assert [(c.amount, c.every_months, c.count) for c in copied.contributions] == [(200.0, 1, 6)]
+    assert copied.calculate_value(datetime(2025, 1, 1)) == investment.calculate_value(datetime(2025, 1, 1))
+    with pytest.raises(AttributeError):
+        copied.rate_of_return = 0.05
+
+
+def test_account_balance_history():
+    """Testa balance_at e balance_series, inclusive após alterações de valor e data."""
+    account = Account("Conta Corrente")
+    start = datetime(2024, 1, 1)
+    for day in range(0, 60, 10):
+        account.add_transaction(100.0, "Salary", date=start + timedelta(days=day))
+    assert account.balance_at(start - timedelta(days=1)) == 0.0
+    assert account.balance_at(start + timedelta(days=25)) == 300.0
+
+    account.add_transaction(-50.0, "Food", date=start + timedelta(days=15))
+    assert account.balance_at(start + timedelta(days=15)) == 150.0
+    transaction = account.transactions[1]
+    transaction.update(amount=40.0)
+    assert account.balance_at(start + timedelta(days=25)) == 190.0
+    transaction.update(date=start + timedelta(days=100))
+    assert account.balance_at(start + timedelta(days=25)) == 150.0
+    assert account.balance_at(start + timedelta(days=100)) == account.balance
+
+    series = list(account.balance_series(start, start + timedelta(days=30), timedelta(days=10)))
+    assert series == [
+        (start, 100.0),
+        (start + timedelta(days=10), 100.0),
+        (start + timedelta(days=20), 150.0),
+        (start + timedelta(days=30), 250.0),
+    ]
+    monthly = list(account.balance_series(datetime(2024, 1, 31), datetime(2024, 4, 30), step=1))
+    assert [date for date, _ in monthly] == [
+        datetime(2024, 1, 31), datetime(2024, 2, 29), datetime(2024, 3, 31), datetime(2024, 4, 30)
+    ]
+    assert [balance for _, balance in monthly] == [250.0, 450.0, 450.0, 490.0]
+    with pytest.raises(ValueError):
+        next(account.balance_series(start, start, timedelta(0)))
+
+
+def test_account_balance_history_opening_balance():
+    """Testa que um saldo inicial sem transações entra no saldo histórico."""
+    account = Account("Poupança")
+    account.balance = 1000.0
+    account.add_transactions([(10.0, "Interest", "", datetime(2024, 1, 1)), (20.0, "Interest", "", datetime(2024, 2, 1))])
+    assert account.balance_at(datetime(2023, 12, 31)) == 1000.0
+    assert account.balance_at(datetime(2024, 1, 15)) == 1010.0
+    assert account.balance_at(datetime(2024, 3, 1)) == account.balance == 1030.0
+
+
+def test_client_search():
+    """Testa a busca por descrição em todas as contas, com filtros e ordem por data."""
+    client = Client("Maria")
+    checking = client.add_account("Conta Corrente")
+    card = client.add_account("Cartão")
+    checking.add_transaction(-100.0, "Food", "Supermercado São João", datetime(2024, 3, 1))
+    card.add_transaction(-50.0, "Food", "SUPERMERCADO Extra", datetime(2024, 1, 1))
+    card.add_transaction(-20.0, "Transport", "Uber", datetime(2024, 2, 1))
+    checking.add_transactions([(-30.0, "Leisure", "Supermercado (presentes)", datetime(2024, 2, 15))])
+
+    found = client.search("supermercado")
+    assert [t.amount for t in found] == [-50.0, -30.0, -100.0]
+    assert [t.amount for t in client.search("Supermercado", category="Food")] == [-50.0, -100.0]
+    assert [t.amount for t in client.search("supermercado", start_date=datetime(2024, 2, 1))] == [-30.0, -100.0]
+    assert [t.amount for t in client.search("supermercado", limit=1)] == [-50.0]
+    assert client.search("supermercado uber") == []
+    assert checking.search("sao joao")[0].amount == -100.0
+
+    # O índice acompanha as inclusões e alterações
+    card.transactions[1].update(description="Supermercado Dia")
+    checking.add_transaction(-10.0, "Food", "supermercado", datetime(2024, 1, 15))
+    assert [t.amount for t in client.search("supermercado")] == [-50.0, -10.0, -20.0, -30.0, -100.0]
+    assert client.search("uber") == []
+    with pytest.raises(ValueError):
+        client.search("  ")
+
+
+def test_get_transactions_returns_a_copy():
+    """Testa que get_transactions não expõe o armazenamento interno da conta."""
+    account = Account("Conta Corrente")
+    account.add_transaction(100.0, "Salary", "Salário", datetime(2024, 1, 1))
+    transactions = account.get_transactions()
+    transactions.clear()
+    assert len(account.transactions) == 1
+    assert transactions is not account.transactions
+
+
+@pytest.mark.parametrize("ledger", [None, ColumnarLedger], ids=["list", "columnar"])
+@pytest.mark.parametrize("concurrent", [False, True], ids=["plain", "concurrent"])
+@pytest.mark.parametrize("hours", [lambda i: (i * 37) % 500, lambda i: i // 2], ids=["shuffled", "chronological"])
+def test_iter_transactions_matches_get_transactions(ledger, concurrent, hours):
+    """Testa iter_transactions (offset, limit e cursor) contra get_transactions, com todos os filtros."""
+    account = Account("Conta Corrente", ledger() if ledger else None, concurrent)
+    categories = ["Food", "Transport", "Salary"]
+    account.add_transactions(
+        (-float(i), categories[i % 3], f"Transação {i}", datetime(2024, 1, 1) + timedelta(hours=hours(i)))
+        for i in range(500)
+    )
+    # A primeira consulta por data constrói o índice; as inclusões seguintes o mantêm
+    account.get_transactions(start_date=datetime(2024, 1, 1))
+    account.add_transaction(-1.0, "Food", "Última", datetime(2024, 1, 1) + timedelta(hours=hours(499)))
+    filters = [
+        {},
+        {"category": "Food"},
+        {"start_date": datetime(2024, 1, 5), "end_date": datetime(2024, 1, 12)},
+        {"start_date": datetime(2024, 1, 5), "category": "Transport"},
+        {"end_date": datetime(2024, 1, 2), "category": "Salary"},
+        {"category": "Inexistente"},
+    ]
+    def rows(transactions):
+        return [(t.amount, t.date, t.category, t.description) for t in transactions]
+
+    for query in filters:
+        expected = rows(account.get_transactions(**query))
+        assert rows(account.iter_transactions(**query)) == expected
+        assert rows(account.iter_transactions(**query, offset=7, limit=100)) == expected[7:107]
+        assert rows(account.iter_transactions(**query, offset=len(expected) + 1)) == []
+
+        pages, cursor = [], None
+        while True:
+            page = account.get_transactions_page(**query, limit=30, cursor=cursor)
+            pages.extend(rows(page))
+            assert len(page) <= 30
+            cursor = page.cursor
+            if cursor is None:
+                break
+        assert pages == expected
+
+
+def test_iter_transactions_is_lazy_and_resumable():
+    """Testa que a iteração é sob demanda e que o cursor sobrevive a novas inclusões."""
+    account = Account("Conta Corrente", ColumnarLedger())
+    account.add_transactions((-1.0, "Food", "", datetime(2024, 1, 1) + timedelta(minutes=i)) for i in range(10_000))
+    taken = []
+    original_take = account.transactions.take
+    account.transactions.take = lambda positions, category=None: taken.append(len(positions)) or original_take(positions, category)
+    first = account.get_transactions_page(limit=10)
+    assert len(first) == 10 and sum(taken) < 100
+
+    account.add_transaction(-2.0, "Food", "Nova", datetime(2023, 1, 1))
+    rest = list(account.iter_transactions(after=first.cursor))
+    assert len(rest) == 10_000 - 10 + 1 and rest[-1].description == "Nova"
+
+    with pytest.raises(ValueError):
+        account.get_transactions_page(limit=0)
+    with pytest.raises(ValueError):
+        account.iter_transactions(offset=-1)
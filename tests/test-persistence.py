@@ -0,0 +1,148 @@
+import pytest
+from datetime import datetime, timedelta
+from finances.daycount import ContributionSchedule
+from finances.ledger import ColumnarLedger
+from finances.models import Client, FrozenInvestment, Investment
+from finances.persistence import MappedLedger, dumps_client, load_client, loads_client, save_client
+
+
+def make_client():
+    """Cria um cliente com contas de ambos os ledgers e um investimento."""
+    client = Client("Maria")
+    checking = client.add_account("Conta Corrente")
+    checking.add_transaction(1000.0, "Salary", "Salário recebido", date=datetime(2024, 1, 5))
+    checking.add_transaction(-200.0, "Food", "Supermercado", date=datetime(2024, 1, 7))
+    savings = client.add_account("Poupança", ColumnarLedger())
+    savings.add_transactions([(500.0, "Transfer", "Transferência", datetime(2024, 1, 2, 8, 30, 0, 123))])
+    client.add_account("Vazia")
+    investment = Investment("Ações", 1000.0, 0.02)
+    investment.date_purchased = datetime(2023, 10, 1)
+    client.add_investment(investment)
+    return client
+
+
+def snapshot(client):
+    """Resume o conteúdo de um cliente para comparação."""
+    return (
+        client.name,
+        [
+            (account.name, account.balance, [(t.amount, t.date, t.category, t.description) for t in account.transactions])
+            for account in client.accounts
+        ],
+        [(i.type, i.initial_amount, i.rate_of_return, i.date_purchased) for i in client.investments],
+    )
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_save_and_load_round_trip(tmp_path, use_mmap):
+    """Testa que save_client e load_client preservam o cliente."""
+    client = make_client()
+    path = str(tmp_path / "cliente.ngfs")
+    save_client(client, path)
+    loaded = load_client(path, use_mmap=use_mmap)
+    assert snapshot(loaded) == snapshot(client)
+    assert isinstance(loaded.accounts[0].transactions, MappedLedger)
+    assert loaded.get_net_worth() == pytest.approx(client.get_net_worth())
+
+
+def test_loaded_client_supports_queries_and_changes(tmp_path):
+    """Testa consultas e alterações em um cliente carregado, sem alterar o arquivo."""
+    path = str(tmp_path / "cliente.ngfs")
+    save_client(make_client(), path)
+    loaded = load_client(path)
+    account = loaded.accounts[0]
+
+    assert [t.description for t in account.get_transactions(category="Food")] == ["Supermercado"]
+    assert len(account.get_transactions(start_date=datetime(2024, 1, 6))) == 1
+
+    account.transactions[0].update(amount=1100.0)
+    account.add_transaction(-50.0, "Transport", "Uber", date=datetime(2024, 1, 8))
+    assert account.balance == 850.0
+    assert account.get_category_total("Transport") == -50.0
+    assert [t.amount for t in account.transactions] == [1100.0, -200.0, -50.0]
+
+    # O arquivo original não é alterado; a nova versão pode ser gravada novamente
+    assert load_client(path).accounts[0].balance == 800.0
+    assert snapshot(loads_client(dumps_client(loaded))) == snapshot(loaded)
+
+
+def test_save_loaded_client_to_same_path(tmp_path):
+    """Testa carregar, alterar e gravar de volta no mesmo arquivo ainda mapeado."""
+    path = str(tmp_path / "cliente.ngfs")
+    save_client(make_client(), path)
+    loaded = load_client(path)
+    loaded.accounts[1].add_transaction(-50.0, "Food", "Padaria", datetime(2024, 2, 1))
+    expected = snapshot(loaded)
+    save_client(loaded, path)
+    # O cliente carregado antes continua legível, e o arquivo tem o novo conteúdo
+    assert snapshot(loaded) == expected
+    assert snapshot(load_client(path)) == expected
+    assert [p.name for p in tmp_path.iterdir()] == ["cliente.ngfs"]
+
+
+def test_load_invalid_file(tmp_path):
+    """Testa que arquivos inválidos são rejeitados."""
+    path = tmp_path / "invalido.ngfs"
+    path.write_bytes(b"not a snapshot file at all, definitely not" * 2)
+    with pytest.raises(ValueError):
+        load_client(str(path))
+    with pytest.raises(ValueError):
+        loads_client(b"")
+
+
+def test_load_truncated_file():
+    """Testa que um arquivo truncado em qualquer posição é rejeitado com ValueError."""
+    client = make_client()
+    client.accounts[0].add_transactions(
+        [(-float(i), "Food", f"Compra {i}", datetime(2024, 2, 1) + timedelta(hours=i)) for i in range(100)]
+    )
+    client.add_investment(Investment("Previdência", 500.0, 0.008, contributions=[ContributionSchedule(200.0)]))
+    data = dumps_client(client)
+    for size in range(len(data)):
+        try:
+            loaded = loads_client(data[:size])
+        except ValueError:
+            continue
+        # Apenas o alinhamento final pode faltar sem perda de dados
+        assert snapshot(loaded) == snapshot(client)
+
+
+def test_round_trip_with_scheduled_investments():
+    """Testa que a convenção de contagem de dias e os aportes são gravados e carregados."""
+    client = make_client()
+    scheduled = Investment("Previdência", 500.0, 0.008, day_count="actual/365", contributions=[
+        ContributionSchedule(200.0, every_months=1, end=datetime(2026, 1, 1)),
+        ContributionSchedule(50.0, every_months=3, start=datetime(2024, 2, 10), count=4),
+    ])
+    scheduled.date_purchased = datetime(2024, 1, 10)
+    client.add_investment(scheduled)
+    loaded = loads_client(dumps_client(client))
+
+    investment = loaded.investments[1]
+    assert investment.day_count.name == "actual/365"
+    assert [(c.amount, c.every_months, c.start, c.count, c.end) for c in investment.contributions] == [
+        (200.0, 1, None, None, datetime(2026, 1, 1)),
+        (50.0, 3, datetime(2024, 2, 10), 4, None),
+    ]
+    as_of = datetime(2027, 1, 1)
+    assert investment.calculate_value(as_of) == pytest.approx(scheduled.calculate_value(as_of))
+    assert loaded.investments[0].day_count.name == "30d" and loaded.investments[0].contributions == ()
+
+
+def test_load_version_one_file():
+    """Testa que arquivos da versão 1 do formato continuam sendo carregados."""
+    client = Client("Maria")
+    client.add_account("Conta Corrente").add_transaction(100.0, "Salary", "Salário", date=datetime(2024, 1, 5))
+    data = bytearray(dumps_client(client))
+    data[4:6] = (1).to_bytes(2, "little")
+    assert snapshot(loads_client(bytes(data))) == snapshot(client)
+
+
+def test_investment_schedule_arguments_are_keyword_only():
+    """Testa que convenção e aportes são argumentos nomeados em Investment e FrozenInvestment."""
+    with pytest.raises(TypeError):
+        Investment("CDB", 1000.0, 0.01, "actual/365")
+    with pytest.raises(TypeError):
+        FrozenInvestment("CDB", 1000.0, 0.01, datetime(2024, 1, 1), "actual/365")
+    frozen = Investment("CDB", 1000.0, 0.01, day_count="actual/365").freeze()
+    assert frozen.day_count.name == "actual/365"
@@ -0,0 +1,83 @@
+import pytest
+from datetime import datetime
+from finances import valuation
+from finances.models import Client, Investment
+from finances.projection import monthly_dates, months_between, project_client
+from finances.utils import future_value_report, render_projection
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Executa o teste com NumPy (se instalado) e com a implementação em Python puro."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(valuation, "np", None)
+        monkeypatch.setattr("finances.projection.np", None)
+    return request.param
+
+
+def make_client(purchased=None):
+    """Cria um cliente com uma conta e dois investimentos."""
+    client = Client("João")
+    client.add_account("Conta Corrente").add_transaction(500.0, "Salary", "Salário recebido")
+    client.add_investment(Investment("Ações", 1000.0, 0.02))
+    client.add_investment(Investment("CDB", 2000.0, 0.01))
+    if purchased is not None:
+        for investment in client.investments:
+            investment.date_purchased = purchased
+    return client
+
+
+def test_months_between_and_monthly_dates():
+    """Testa as funções auxiliares de datas da projeção."""
+    start = datetime(2024, 1, 31)
+    assert monthly_dates(3, start) == [datetime(2024, 2, 29), datetime(2024, 3, 31), datetime(2024, 4, 30)]
+    assert months_between(start, datetime(2025, 3, 1)) == 14
+
+
+def test_project_client_curve(backend):
+    """Testa a curva mensal de 10 anos contra o cálculo direto."""
+    start = datetime(2024, 1, 15)
+    client = make_client(purchased=start)
+    dates = monthly_dates(120, start)
+    projection = project_client(client, dates, start=start)
+
+    assert len(projection) == 120
+    assert projection.months == list(range(1, 121))
+    assert projection.account_balances == [500.0]
+    for step in (0, 59, 119):
+        months = (dates[step] - start).days // 30
+        expected = [1000.0 * 1.02 ** months, 2000.0 * 1.01 ** months]
+        assert [values[step] for values in projection.investment_values] == pytest.approx(expected)
+        assert projection.net_worth[step] == pytest.approx(500.0 + sum(expected))
+
+
+def test_project_client_counts_months_since_purchase(backend):
+    """Testa que cada investimento é projetado desde a sua data de compra, como em calculate_value."""
+    client = make_client()
+    client.investments[0].date_purchased = datetime(2023, 11, 20)
+    client.investments[1].date_purchased = datetime(2024, 3, 1)
+    client.add_investment(Investment("Previdência", 500.0, 0.01, day_count="actual/365"))
+    client.investments[2].date_purchased = datetime(2023, 6, 1)
+    start = datetime(2024, 1, 15)
+    dates = monthly_dates(24, start)
+    projection = project_client(client, dates, start=start)
+
+    for investment, values in zip(client.investments, projection.investment_values):
+        assert values == pytest.approx([investment.calculate_value(date) for date in dates])
+
+
+def test_project_client_requires_sorted_dates():
+    """Testa que as datas da projeção devem estar em ordem crescente."""
+    with pytest.raises(ValueError):
+        project_client(make_client(), [datetime(2030, 1, 1), datetime(2029, 1, 1)])
+
+
+def test_render_projection_matches_future_value_report(backend):
+    """Testa que render_projection produz o mesmo texto que future_value_report."""
+    client = make_client()
+    start = datetime.now()
+    dates = monthly_dates(12, start)
+    projection = project_client(client, dates, start=start)
+    assert render_projection(projection, 5) == future_value_report(client, dates[5])
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import pytest
+from datetime import datetime
+from finances import service
+from finances.models import Client
+from finances.service import QueryService
+from finances.utils import generate_report
+
+
+def make_service(**options):
+    """Cria um serviço com um cliente de exemplo."""
+    client = Client("Maria")
+    account = client.add_account("Conta Corrente")
+    account.add_transaction(1000.0, "Salary", "Salário", date=datetime(2024, 1, 5))
+    account.add_transaction(-200.0, "Food", "Supermercado", date=datetime(2024, 1, 7))
+    return QueryService({"Maria": client}, **options)
+
+
+def slow_report(monkeypatch, release):
+    """Substitui a geração de relatórios por uma versão que aguarda um evento e conta as chamadas."""
+    calls = []
+    original = service.render_client_report
+
+    def render(*args):
+        calls.append(args)
+        release.wait(5)
+        return original(*args)
+
+    monkeypatch.setattr(service, "render_client_report", render)
+    return calls
+
+
+def test_service_queries():
+    """Testa as consultas do serviço."""
+    query = make_service()
+
+    async def run():
+        assert await query.get_net_worth("Maria") == 800.0
+        transactions = await query.get_transactions("Maria", "Conta Corrente", category="Food")
+        assert [t.amount for t in transactions] == [-200.0]
+        page = await query.get_transactions_page("Maria", "Conta Corrente", limit=1)
+        assert [t.amount for t in page] == [1000.0]
+        page = await query.get_transactions_page("Maria", "Conta Corrente", limit=1, cursor=page.cursor)
+        assert [t.amount for t in page] == [-200.0] and page.cursor is None
+        assert await query.generate_report("Maria") == generate_report(query.clients["Maria"])
+        with pytest.raises(KeyError):
+            await query.get_net_worth("João")
+        with pytest.raises(KeyError):
+            await query.get_transactions("Maria", "Poupança")
+
+    asyncio.run(run())
+    query.close()
+
+
+@pytest.mark.parametrize("coalesce, expected_calls", [(True, 1), (False, 5)])
+def test_service_coalesces_identical_requests(monkeypatch, coalesce, expected_calls):
+    """Testa que consultas idênticas simultâneas compartilham um único cálculo."""
+    release = threading.Event()
+    calls = slow_report(monkeypatch, release)
+    query = make_service(coalesce=coalesce, max_concurrency=5)
+
+    async def run():
+        requests = [asyncio.ensure_future(query.generate_report("Maria")) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*requests)
+
+    reports = asyncio.run(run())
+    query.close()
+    assert len(calls) == expected_calls
+    assert len(set(reports)) == 1
+
+
+def test_service_backpressure(monkeypatch):
+    """Testa que consultas acima do limite de pendências são recusadas."""
+    release = threading.Event()
+    calls = slow_report(monkeypatch, release)
+    query = make_service(max_concurrency=1, max_pending=2)
+
+    async def run():
+        first = asyncio.ensure_future(query.generate_report("Maria", 1))
+        second = asyncio.ensure_future(query.generate_report("Maria", 2))
+        await asyncio.sleep(0.05)
+        with pytest.raises(RuntimeError):
+            await query.generate_report("Maria", 3)
+        # Consultas idênticas a uma pendente continuam sendo aceitas
+        third = asyncio.ensure_future(query.generate_report("Maria", 1))
+        release.set()
+        await asyncio.gather(first, second, third)
+
+    asyncio.run(run())
+    query.close()
+    assert len(calls) == 2
+
+
+def test_service_cancelled_request_does_not_cancel_others(monkeypatch):
+    """Testa que cancelar uma consulta agrupada não interrompe as demais."""
+    release = threading.Event()
+    slow_report(monkeypatch, release)
+    query = make_service()
+
+    async def run():
+        first = asyncio.ensure_future(query.generate_report("Maria"))
+        second = asyncio.ensure_future(query.generate_report("Maria"))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        release.set()
+        return await second
+
+    assert asyncio.run(run()) == generate_report(query.clients["Maria"])
+    query.close()
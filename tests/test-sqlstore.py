@@ -0,0 +1,135 @@
+import threading
+import pytest
+from datetime import datetime
+from finances.models import Client, Investment
+from finances.sqlstore import SQLiteLedger, SQLiteStore
+
+
+def make_client():
+    """Cria um cliente com transações em datas conhecidas."""
+    client = Client("Maria")
+    account = client.add_account("Conta Corrente")
+    account.add_transactions([
+        (1000.0, "Salary", "Salário", datetime(2024, 1, 5)),
+        (-200.0, "Food", "Supermercado", datetime(2024, 1, 7)),
+        (-50.0, "Food", "Padaria", datetime(2024, 2, 1)),
+    ])
+    investment = Investment("Ações", 1000.0, 0.02)
+    investment.date_purchased = datetime(2023, 10, 1)
+    client.add_investment(investment)
+    return client
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Banco SQLite temporário."""
+    store = SQLiteStore(str(tmp_path / "finances.db"), batch_size=2, cache_size=2)
+    yield store
+    store.close()
+
+
+def test_save_and_load_client(store):
+    """Testa a gravação e o carregamento de um cliente no SQLite."""
+    client = make_client()
+    client_id = store.save_client(client)
+    loaded = store.load_client(client_id)
+    account = loaded.accounts[0]
+
+    assert store.client_ids() == {client_id: "Maria"}
+    assert isinstance(account.transactions, SQLiteLedger)
+    assert account.balance == 750.0
+    assert [(t.amount, t.date, t.category) for t in account.transactions] == [
+        (t.amount, t.date, t.category) for t in client.accounts[0].transactions
+    ]
+    assert loaded.investments[0].date_purchased == datetime(2023, 10, 1)
+    with pytest.raises(KeyError):
+        store.load_client(client_id + 1)
+
+
+def test_queries_are_pushed_down(store):
+    """Testa os filtros de get_transactions e os totais por categoria via SQL."""
+    account = store.load_client(store.save_client(make_client())).accounts[0]
+    assert [t.description for t in account.get_transactions(category="Food")] == ["Supermercado", "Padaria"]
+    january = account.get_transactions(start_date=datetime(2024, 1, 6), end_date=datetime(2024, 1, 31))
+    assert [t.description for t in january] == ["Supermercado"]
+    assert account.get_category_totals() == {"Salary": 1000.0, "Food": -250.0}
+    assert account.get_category_count("Food") == 2
+    assert [t.description for t in account.search("padaria", category="Food")] == ["Padaria"]
+    page = account.get_transactions_page(category="Food", limit=1)
+    assert [t.description for t in page] == ["Supermercado"] and page.cursor is not None
+    page = account.get_transactions_page(category="Food", limit=1, cursor=page.cursor)
+    assert [t.description for t in page] == ["Padaria"] and page.cursor is None
+    assert [t.description for t in account.iter_transactions(offset=1, limit=1)] == ["Supermercado"]
+
+
+def test_batched_writes_and_updates(store):
+    """Testa inserções em lote, atualizações e a persistência do saldo."""
+    client_id = store.save_client(Client("João"))
+    client = store.load_client(client_id)
+    account = client.add_account("Temporária")  # conta apenas em memória
+    stored = store.create_account(client_id, "Conta Corrente")
+    first = stored.add_transaction(100.0, "Salary", "Salário", date=datetime(2024, 1, 1))
+    stored.add_transaction(-10.0, "Food", "Café", date=datetime(2024, 1, 2))
+    stored.add_transaction(-20.0, "Food", "Almoço", date=datetime(2024, 1, 3))
+    assert len(stored.transactions) == 3
+    assert stored.transactions._pending  # terceiro registro ainda no lote
+
+    first.update(amount=150.0)
+    stored.transactions.flush()
+    reloaded = store.load_client(client_id).accounts[0]
+    assert reloaded.balance == 120.0
+    assert [t.amount for t in reloaded.transactions] == [150.0, -10.0, -20.0]
+    assert account.transactions == []
+
+
+def test_concurrent_reads(store):
+    """Testa leituras simultâneas usando o pool de conexões."""
+    account = store.load_client(store.save_client(make_client())).accounts[0]
+    results, errors = [], []
+
+    def read():
+        try:
+            for _ in range(20):
+                results.append(len(account.get_transactions(category="Food")))
+        except Exception as error:  # pragma: no cover - falha do teste
+            errors.append(error)
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert results == [2] * 160
+
+
+def test_close_flushes_pending_rows_and_balance(tmp_path):
+    """Testa que close grava as transações pendentes e o saldo atualizado."""
+    database = str(tmp_path / "finances.db")
+    with SQLiteStore(database, batch_size=2) as store:
+        client_id = store.save_client(Client("João"))
+        account = store.create_account(client_id, "Conta Corrente")
+        for day in range(1, 4):
+            account.add_transaction(-10.0 * day, "Food", "Refeição", date=datetime(2024, 1, day))
+        # O lote completo é gravado com o saldo que já inclui todas as suas transações
+        with store.pool.connection() as connection:
+            stored = connection.execute("SELECT balance FROM accounts WHERE id = ?", (account.transactions.account_id,))
+            assert stored.fetchone()[0] == -30.0
+        account.add_transaction(5.0, "Food", "Estorno", date=datetime(2024, 1, 4))
+
+    store = SQLiteStore(database)
+    reloaded = store.load_client(client_id).accounts[0]
+    assert reloaded.balance == -55.0
+    assert [t.amount for t in reloaded.transactions] == [-10.0, -20.0, -30.0, 5.0]
+    store.close()
+
+
+def test_iteration_does_not_hold_a_connection(tmp_path):
+    """Testa que percorrer as transações não retém uma conexão do pool."""
+    store = SQLiteStore(str(tmp_path / "finances.db"), pool_size=1)
+    account = store.load_client(store.save_client(make_client())).accounts[0]
+    transactions = iter(account.transactions)
+    assert next(transactions).description == "Salário"
+    assert len(account.get_transactions(category="Food")) == 2  # com uma conexão só, travaria
+    assert [t.description for t in transactions] == ["Supermercado", "Padaria"]
+    store.close()
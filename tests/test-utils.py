@@ -1,7 +1,8 @@
+import io
 import pytest
 from datetime import datetime, timedelta
 from finances.models import Client, Account, Investment
-from finances.utils import generate_report, future_value_report
+from finances.utils import generate_report, future_value_report, iter_report_lines, write_report
 
 
 def test_generate_report():
@@ -52,10 +53,9 @@ def test_future_value_report():
     # Geração do relatório de projeção
     report = future_value_report(client, future_date)
 
-    # Cálculos esperados
-    months_to_date = 6  # 6 meses
-    expected_investment1_value = investment1.initial_amount * ((1 + investment1.rate_of_return) ** months_to_date)
-    expected_investment2_value = investment2.initial_amount * ((1 + investment2.rate_of_return) ** months_to_date)
+    # Cálculos esperados: meses (de 30 dias) desde a compra de cada investimento
+    expected_investment1_value = investment1.initial_amount * ((1 + investment1.rate_of_return) ** 9)
+    expected_investment2_value = investment2.initial_amount * ((1 + investment2.rate_of_return) ** 7)
     expected_net_worth = account1.balance + expected_investment1_value + expected_investment2_value
 
     # Verificação de conteúdo do relatório
@@ -78,3 +78,57 @@ def test_future_value_report_invalid_date():
 
     # Verificação de resposta
     assert report == "A data fornecida deve ser futura."
+
+
+def make_report_client():
+    """Cria um cliente com várias transações e um investimento."""
+    client = Client("Maria")
+    account = client.add_account("Conta Corrente")
+    for i in range(25):
+        account.add_transaction(-10.0 - i, "Food", f"Compra {i}")
+    client.add_account("Poupança")
+    client.add_investment(Investment("Ações", 1000.0, 0.02))
+    return client
+
+
+def test_write_report_matches_generate_report():
+    """
+    Testa que write_report escreve exatamente o texto de generate_report.
+    """
+    client = make_report_client()
+    for buffer_lines in (1, 7, 1000):
+        stream = io.StringIO()
+        count = write_report(client, stream, buffer_lines=buffer_lines)
+        assert stream.getvalue() == generate_report(client)
+        assert count == len(list(iter_report_lines(client)))
+
+
+def test_write_report_transaction_limit_and_pages():
+    """
+    Testa o limite de transações por conta e a paginação de write_report.
+    """
+    client = make_report_client()
+    lines = list(iter_report_lines(client, transaction_limit=3))
+    assert "     Transação: Compra 2 R$ -12.00 (Food)" in lines
+    assert "     Transação: Compra 3 R$ -13.00 (Food)" not in lines
+    assert "     ... (22 transações omitidas)" in lines
+
+    stream = io.StringIO()
+    count = write_report(client, stream, transaction_limit=3, page_size=4, buffer_lines=3)
+    pages = stream.getvalue().split("\n\f\n")
+    assert count == len(lines)
+    assert len(pages) == -(-count // 4)
+    assert "\n".join(pages) == "\n".join(lines)
+
+
+def test_write_report_as_of():
+    """
+    Testa que write_report avalia os investimentos na data informada em as_of.
+    """
+    client = make_report_client()
+    as_of = datetime.now() + timedelta(days=365)
+    stream = io.StringIO()
+    write_report(client, stream, as_of=as_of)
+    assert stream.getvalue() == "\n".join(iter_report_lines(client, as_of=as_of))
+    assert f"Patrimônio Líquido:\nR$ {client.get_net_worth(as_of):.2f}" in stream.getvalue()
+    assert stream.getvalue() != generate_report(client)
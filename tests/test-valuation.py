@@ -0,0 +1,57 @@
+import pytest
+from datetime import datetime, timedelta
+from finances import valuation
+from finances.models import Client, Investment
+from finances.valuation import InvestmentBatch, project_investments, value_investments
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Executa o teste com NumPy (se instalado) e com a implementação em Python puro."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(valuation, "np", None)
+    return request.param
+
+
+def make_investments():
+    """Cria investimentos com datas de compra diferentes."""
+    stocks = Investment("Ações", 1000.0, 0.02)
+    bonds = Investment("CDB", 2000.0, 0.01)
+    stocks.date_purchased = datetime(2024, 1, 1)
+    bonds.date_purchased = datetime(2024, 3, 10)
+    return [stocks, bonds]
+
+
+def test_value_investments_matches_calculate_value(backend):
+    """Testa que a avaliação em lote coincide com Investment.calculate_value."""
+    investments = make_investments()
+    values = value_investments(investments)
+    for investment, value in zip(investments, values):
+        assert value == pytest.approx(investment.calculate_value())
+
+
+def test_value_investments_multiple_dates(backend):
+    """Testa a avaliação em lote em várias datas."""
+    investments = make_investments()
+    dates = [datetime(2024, 1, 31), datetime(2024, 4, 30)]
+    values = value_investments(investments, dates)
+    assert values[0] == pytest.approx([1000.0 * 1.02, 2000.0 * 1.01 ** -2])
+    assert values[1] == pytest.approx([1000.0 * 1.02 ** 4, 2000.0 * 1.01])
+
+
+def test_value_investments_client(backend):
+    """Testa a avaliação em lote a partir de um cliente."""
+    client = Client("Maria")
+    for investment in make_investments():
+        client.add_investment(investment)
+    assert value_investments(client, datetime(2024, 1, 31)) == pytest.approx([1020.0, 2000.0 * 1.01 ** -2])
+
+
+def test_investment_batch_months_and_projection(backend):
+    """Testa o cálculo de meses completos e a projeção do InvestmentBatch."""
+    batch = InvestmentBatch(make_investments())
+    assert batch.months_at(datetime(2024, 4, 1)) == [3, 0]
+    assert project_investments(batch.investments, 6) == pytest.approx([1000.0 * 1.02 ** 6, 2000.0 * 1.01 ** 6])
+    assert value_investments([]) == []